@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Push Picasso - Benchmark a renderelés és commit-olás pipeline-jára
+
+Minden eset (prompt x commit út) külön Python folyamatban, eldobható
+ideiglenes git repository-ban fut, így a peak RSS és a subprocess szám
+esetenként külön mérhető. Az eredmény géppel olvasható JSON is lehet.
+
+A --images kapcsolóval a kép import (PNG dekódolás, kicsinyítés,
+kvantálás) mérése fut, NumPy-jal és tisztán Pythonban.
+
+Használat:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --paths batch --json bench.json
+    python benchmarks/bench_pipeline.py --images
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import struct
+import time
+import zlib
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from core import GitHandler, TextRenderer, ShapeRenderer, LayoutManager  # noqa: E402
+from core.image_importer import ImageImporter, numpy  # noqa: E402
+
+# Reprezentatív promptok
+SCENARIOS = {
+    'hello_heart_world': 'Hello "heart" World',
+    'alphabet_full_width': 'ABCDEFGHIJ',
+    'alphabet_a_to_z': 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',  # Túllóg a grid-en, a vágást is méri
+    'shaded_shapes': '"glow" "heart" "glow" "star" "glow"',
+}
+
+# Kép import mérés: név -> soronkénti PNG szűrők (sorban ismételve), 1000x1000 RGB kép
+IMAGE_SCENARIOS = {
+    'png_paeth': (4,),
+    'png_average': (3,),
+    'png_sub': (1,),
+    'png_mixed': (0, 1, 2, 3, 4),
+}
+IMAGE_SIZE = (1000, 1000)
+
+
+def _draw_per_commit(git_handler, layout_manager, elements):
+    """
+    Referencia baseline: commit-onként egy fájl írás, egy `git add` és egy
+    `git commit` folyamat, ahogy az eredeti create_commit dolgozott. A
+    GitHandler már nem tartalmaz ilyen lassú utat, ezért a mérés itt, a
+    benchmark-ban marad meg változatlan viszonyítási pontnak.
+    """
+    canvas = git_handler.new_canvas()
+    with git_handler.drawing_to(canvas):
+        layout_manager._place_inline_elements(elements)
+    repo_path = git_handler.repo_path
+    os.makedirs(os.path.join(repo_path, 'art_data'), exist_ok=True)
+    for date, count in sorted(canvas.to_date_counts(git_handler).items()):
+        timestamp = f"{date.isoformat()}T12:00:00"
+        env = dict(os.environ, GIT_AUTHOR_DATE=timestamp, GIT_COMMITTER_DATE=timestamp)
+        for index in range(1, count + 1):
+            filename = f"art_data/{date.isoformat()}_{index}.txt"
+            with open(os.path.join(repo_path, filename), 'w') as f:
+                f.write(f"Art data for {date} - entry {index}")
+            subprocess.run(['git', 'add', filename], cwd=repo_path, check=True, capture_output=True)
+            subprocess.run(['git', 'commit', '-q', '-m', f"Art commit for {date}"], cwd=repo_path, env=env,
+                           check=True, capture_output=True)
+
+
+def _draw_streaming(git_handler, layout_manager, elements):
+    """Pixelenkénti út: draw_pattern -> create_commit, commit-onként a session fast-import folyamatába."""
+    layout_manager._place_inline_elements(elements)
+    git_handler.sync()
+
+
+def _draw_batch(git_handler, layout_manager, elements):
+    """Batch út: canvas-ra rajzolás, majd egyetlen git fast-import futás."""
+    canvas = git_handler.new_canvas()
+    with git_handler.drawing_to(canvas):
+        layout_manager._place_inline_elements(elements)
+    git_handler.commit_canvas(canvas)
+
+
+# Commit utak: név -> (rajzoló függvény, GitHandler kulcsszó argumentumok)
+PATHS = {
+    'per_commit': (_draw_per_commit, {}),
+    'streaming': (_draw_streaming, {}),
+    'batch': (_draw_batch, {}),
+    'objects': (_draw_batch, {'backend': 'objects'}),
+    'pack': (_draw_batch, {'backend': 'pack'}),
+}
+
+
+class SubprocessCounter:
+    """Megszámolja az elindított subprocess-eket (a Popen konstruktor becsomagolásával)."""
+
+    def __init__(self):
+        self.count = 0
+        self._original = None
+
+    def __enter__(self):
+        self._original = subprocess.Popen.__init__
+        counter = self
+
+        def counting_init(popen, *args, **kwargs):
+            counter.count += 1
+            counter._original(popen, *args, **kwargs)
+
+        subprocess.Popen.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc_info):
+        subprocess.Popen.__init__ = self._original
+
+
+def _init_repo(repo_path: str):
+    """Eldobható repository egy kezdő commit-tal."""
+    env = dict(os.environ, GIT_AUTHOR_NAME='bench', GIT_AUTHOR_EMAIL='bench@localhost',
+               GIT_COMMITTER_NAME='bench', GIT_COMMITTER_EMAIL='bench@localhost')
+    for args in (['init', '-q'], ['config', 'user.name', 'bench'], ['config', 'user.email', 'bench@localhost'],
+                 ['commit', '-q', '--allow-empty', '-m', 'init']):
+        subprocess.run(['git'] + args, cwd=repo_path, env=env, check=True, capture_output=True)
+
+
+def _peak_rss_kb(who) -> int:
+    """Peak RSS kilobájtban (macOS-en a ru_maxrss bájtban van)."""
+    rss = resource.getrusage(who).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def run_case(scenario: str, path: str) -> dict:
+    """Egy eset lefuttatása az aktuális folyamatban."""
+    draw, handler_kwargs = PATHS[path]
+    prompt = SCENARIOS[scenario]
+
+    with tempfile.TemporaryDirectory(prefix='push-picasso-bench-') as repo_path:
+        _init_repo(repo_path)
+        git_handler = GitHandler(repo_path, **handler_kwargs)
+        layout_manager = LayoutManager(git_handler, TextRenderer(git_handler), ShapeRenderer(git_handler))
+        elements = layout_manager.parse_text_with_shapes(prompt)
+
+        with SubprocessCounter() as counter, redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            draw(git_handler, layout_manager, elements)
+            seconds = time.perf_counter() - started
+        git_handler.close()
+
+        commits = int(subprocess.run(['git', 'rev-list', '--count', 'HEAD'], cwd=repo_path,
+                                     capture_output=True, text=True).stdout.strip()) - 1
+
+    return {
+        'scenario': scenario,
+        'prompt': prompt,
+        'path': path,
+        'commits': commits,
+        'seconds': seconds,
+        'commits_per_second': commits / seconds if seconds > 0 else 0.0,
+        'subprocesses': counter.count,
+        'peak_rss_kb': _peak_rss_kb(resource.RUSAGE_SELF),
+        'peak_child_rss_kb': _peak_rss_kb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def run_isolated(scenario: str, path: str) -> dict:
+    """Egy eset futtatása külön Python folyamatban, hogy a memória mérés független legyen."""
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', f"{scenario}:{path}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'scenario': scenario, 'path': path, 'error': result.stderr.strip().splitlines()[-1:]}
+    # A git parancsok is a stdout-ra írhatnak, az eredmény az utolsó sor
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _write_png(path: str, width: int, height: int, filters) -> None:
+    """
+    Szintetikus RGB PNG a megadott soronkénti szűrőkkel. A szűrt bájtok
+    közvetlenül íródnak (kis, soronként változó különbségek), így bármely
+    szűrővel érvényes, sima átmenetes kép lesz, és nem kell kódolni.
+    """
+    raw = b''.join(bytes([filters[row % len(filters)]]) + bytes((column * 7 + row) % 5 for column in range(width * 3))
+                   for row in range(height))
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+                + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+def run_image_cases(scenarios) -> list:
+    """A kép import lépései szcenáriónként, NumPy-jal (ha telepítve van) és tisztán Pythonban."""
+    results = []
+    width, height = IMAGE_SIZE
+    with tempfile.TemporaryDirectory(prefix='push-picasso-bench-') as directory:
+        for scenario in scenarios:
+            path = os.path.join(directory, f"{scenario}.png")
+            _write_png(path, width, height, IMAGE_SCENARIOS[scenario])
+            for use_numpy in ([True, False] if numpy is not None else [False]):
+                importer = ImageImporter(use_numpy=use_numpy)
+                started = time.perf_counter()
+                image = importer.load(path)
+                decoded = time.perf_counter()
+                cells = importer.downsample(image, importer.fit_weeks(image, 53))
+                downsampled = time.perf_counter()
+                importer.quantize(cells)
+                quantized = time.perf_counter()
+                results.append({
+                    'scenario': scenario,
+                    'path': 'numpy' if use_numpy else 'python',
+                    'pixels': width * height,
+                    'decode_seconds': decoded - started,
+                    'downsample_seconds': downsampled - decoded,
+                    'quantize_seconds': quantized - downsampled,
+                })
+    return results
+
+
+def print_image_table(results: list):
+    """A kép import mérés összefoglalója, a NumPy-os út gyorsulásával."""
+    print(f"{'szcenárió':<22} {'út':<8} {'dekódolás':>10} {'kicsinyítés':>12} {'kvantálás':>10}")
+    print("-" * 66)
+    for r in results:
+        print(f"{r['scenario']:<22} {r['path']:<8} {r['decode_seconds']:>10.3f} "
+              f"{r['downsample_seconds']:>12.4f} {r['quantize_seconds']:>10.5f}")
+    by_key = {(r['scenario'], r['path']): r for r in results}
+    for (scenario, path), result in by_key.items():
+        base = by_key.get((scenario, 'python'))
+        if path == 'numpy' and base:
+            speedup = base['decode_seconds'] / result['decode_seconds']
+            print(f"⚡ {scenario}: a NumPy-os dekódolás {speedup:.1f}x gyorsabb" if speedup >= 1 else
+                  f"🐢 {scenario}: a NumPy-os dekódolás {1 / speedup:.1f}x lassabb")
+    if numpy is None:
+        print("💡 A NumPy-os út méréséhez telepítsd a numpy csomagot (pip install numpy)")
+
+
+def compare(results: list, baseline: str = 'per_commit') -> dict:
+    """Gyorsulás a baseline úthoz képest, szcenáriónként."""
+    speedups = {}
+    by_key = {(r['scenario'], r['path']): r for r in results if 'error' not in r}
+    for (scenario, path), result in by_key.items():
+        base = by_key.get((scenario, baseline))
+        if path != baseline and base and result['seconds'] > 0:
+            speedups.setdefault(scenario, {})[path] = base['seconds'] / result['seconds']
+    return speedups
+
+
+def print_table(results: list, speedups: dict):
+    """Ember által olvasható összefoglaló."""
+    print(f"{'szcenárió':<22} {'út':<12} {'commit':>7} {'idő (mp)':>10} {'commit/mp':>10} "
+          f"{'subprocess':>11} {'RSS (MB)':>9}")
+    print("-" * 87)
+    for r in results:
+        if 'error' in r:
+            print(f"{r['scenario']:<22} {r['path']:<12} ❌ {r['error']}")
+            continue
+        print(f"{r['scenario']:<22} {r['path']:<12} {r['commits']:>7} {r['seconds']:>10.3f} "
+              f"{r['commits_per_second']:>10.0f} {r['subprocesses']:>11} {r['peak_rss_kb'] / 1024:>9.1f}")
+    for scenario, paths in speedups.items():
+        for path, speedup in paths.items():
+            # 1 alatti arány regresszió: a fordított arányt "lassabb"-ként írjuk ki, hogy ne rejtőzzön el
+            if speedup >= 1:
+                print(f"⚡ {scenario}: {path} {speedup:.1f}x gyorsabb, mint a per_commit út")
+            else:
+                print(f"🐢 {scenario}: {path} {1 / speedup:.1f}x lassabb, mint a per_commit út")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Push Picasso pipeline benchmark')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument('--paths', nargs='+', choices=sorted(PATHS), default=list(PATHS))
+    parser.add_argument('--images', nargs='*', choices=sorted(IMAGE_SCENARIOS), metavar='SZCENÁRIÓ',
+                        help=f"Kép import mérés a commit utak helyett ({', '.join(IMAGE_SCENARIOS)})")
+    parser.add_argument('--json', metavar='FILE', help='Eredmények mentése JSON-ba ("-" = stdout)')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        scenario, path = args.case.split(':', 1)
+        print(json.dumps(run_case(scenario, path)))
+        return
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    if args.images is not None:
+        results = run_image_cases(args.images or list(IMAGE_SCENARIOS))
+        report.update(numpy=numpy.__version__ if numpy is not None else None, images=results)
+    else:
+        results = [run_isolated(scenario, path) for scenario in args.scenarios for path in args.paths]
+        speedups = compare(results)
+        report.update(git=subprocess.run(['git', '--version'], capture_output=True, text=True).stdout.strip(),
+                      results=results, speedups=speedups)
+
+    if args.json == '-':
+        print(json.dumps(report, indent=2))
+        return
+
+    if args.images is not None:
+        print_image_table(results)
+    else:
+        print_table(results, report['speedups'])
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 JSON eredmények: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
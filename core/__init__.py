@@ -3,8 +3,26 @@ Core modul - Fő Git műveleteket és alapvető funkciókat tartalmazó osztály
 """
 
 from .git_handler import GitHandler
+from .batch_committer import BatchCommitter
+from .git_session import GitSession
+from .object_writer import ObjectWriter
+from .pack_writer import PackWriter
+from .canvas import Canvas
+from .blit_engine import BlitEngine
+from .history_reader import HistoryReader
+from .history_rewriter import HistoryRewriter
+from .preview_renderer import PreviewRenderer
+from .instrumentation import Instrumentation
 from .text_renderer import TextRenderer
 from .shape_renderer import ShapeRenderer
 from .layout_manager import LayoutManager
+from .flow_layout import FlowLayout
+from .text_packer import Kerning, TextPacker
+from .tokenizer import Tokenizer
+from .job_runner import JobRunner
+from .batch_runner import BatchRunner
+from .async_pipeline import AsyncRenderPipeline
+from .render_journal import RenderJournal
+from .image_importer import ImageImporter
 
-__all__ = ['GitHandler', 'TextRenderer', 'ShapeRenderer', 'LayoutManager'] 
\ No newline at end of file
+__all__ = ['GitHandler', 'BatchCommitter', 'GitSession', 'ObjectWriter', 'PackWriter', 'Canvas', 'BlitEngine', 'HistoryReader', 'HistoryRewriter', 'PreviewRenderer', 'Instrumentation', 'TextRenderer', 'ShapeRenderer', 'LayoutManager', 'FlowLayout', 'Kerning', 'TextPacker', 'Tokenizer', 'JobRunner', 'BatchRunner', 'AsyncRenderPipeline', 'RenderJournal', 'ImageImporter'] 
\ No newline at end of file
@@ -0,0 +1,255 @@
+import asyncio
+import signal
+import sys
+import time
+from typing import Callable, Optional
+from .render_journal import RenderJournal
+
+QUEUE_SIZE = 4  # Várakozó commit kötegek száma a canvas és a commit lépés között
+BATCH_COMMITS = 200  # Ennyi commit után keletkezik egy köteg (egy nap sosem oszlik meg)
+
+
+class ProgressEvent:
+    """Egy haladási esemény a render pipeline-ból."""
+
+    __slots__ = ('stage', 'cells_done', 'cells_total', 'commits_done', 'commits_total', 'elapsed', 'cancelled')
+
+    def __init__(self, stage: str, cells_done: int, cells_total: int, commits_done: int,
+                 commits_total: int, elapsed: float, cancelled: bool = False):
+        self.stage = stage  # 'layout', 'commit' vagy 'done'
+        self.cells_done = cells_done  # Azok a napok (cellák), amiknek minden commit-ja kész
+        self.cells_total = cells_total
+        self.commits_done = commits_done
+        self.commits_total = commits_total
+        self.elapsed = elapsed
+        self.cancelled = cancelled
+
+    @property
+    def commits_per_second(self) -> float:
+        return self.commits_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """A hátralévő idő becslése másodpercben (None, amíg nincs mért sebesség)."""
+        rate = self.commits_per_second
+        if not rate:
+            return None
+        return (self.commits_total - self.commits_done) / rate
+
+    @property
+    def fraction(self) -> float:
+        return self.commits_done / self.commits_total if self.commits_total else 1.0
+
+    def __repr__(self) -> str:
+        return (f"ProgressEvent({self.stage}, {self.commits_done}/{self.commits_total} commit, "
+                f"{self.cells_done}/{self.cells_total} cella)")
+
+
+class TerminalProgress:
+    """Egysoros, helyben frissülő haladásjelző (a render --progress kapcsolóhoz)."""
+
+    def __init__(self, stream=None, interval: float = 0.1, width: int = 24):
+        self.stream = stream or sys.stdout
+        self.interval = interval
+        self.width = width
+        self._last = 0.0
+
+    def __call__(self, event: ProgressEvent):
+        if event.stage == 'layout':
+            return
+        now = time.perf_counter()
+        final = event.stage == 'done'
+        if not final and now - self._last < self.interval:
+            return
+        self._last = now
+        filled = int(event.fraction * self.width)
+        eta = event.eta
+        line = (f"\r⏳ [{'█' * filled}{'·' * (self.width - filled)}] "
+                f"{event.commits_done}/{event.commits_total} commit, "
+                f"{event.cells_done}/{event.cells_total} nap, {event.commits_per_second:.0f} commit/mp")
+        if not final and eta is not None:
+            line += f", még kb. {eta:.0f} mp"
+        self.stream.write(line + ("\n" if final else ""))
+        self.stream.flush()
+
+
+class AsyncRenderPipeline:
+    """
+    Art létrehozása asyncio alapú, lépcsőzetes pipeline-nal:
+
+        layout (elemzés + canvas) -> köteg képzés -> commit írás
+
+    A lépéseket korlátos asyncio.Queue-k kötik össze, a blokkoló munka
+    (layout, git olvasás és írás) executor szálon fut, így az event loop
+    közben is kiszolgálja a haladási callback-et és a megszakítást.
+
+    A megszakítás (cancel() vagy Ctrl-C) commit határon áll meg: a futó köteg
+    még befejeződik, a megírt commit-ok kikerülnek a branch-re. Egy nap
+    commit-jai mindig egy kötegbe esnek, így ugyanaz a futás később pontosan a
+    hiányzó napoktól folytatható (a render napló, ill. --incremental módban a
+    history alapján).
+    """
+
+    def __init__(self, git_handler, layout_manager,
+                 progress: Optional[Callable[[ProgressEvent], None]] = None,
+                 queue_size: int = QUEUE_SIZE, batch_commits: int = BATCH_COMMITS):
+        """
+        Args:
+            git_handler: A cél repository GitHandler-e
+            layout_manager: A promptot feldolgozó LayoutManager
+            progress: Callback, ami minden köteg után ProgressEvent-et kap
+            queue_size: A lépések közötti sorok mérete
+            batch_commits: Nagyjából ennyi commit kerül egy kötegbe
+        """
+        self.git_handler = git_handler
+        self.layout_manager = layout_manager
+        self.progress = progress
+        self.queue_size = queue_size
+        self.batch_commits = max(1, batch_commits)
+        self.cancelled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._started = 0.0
+        self._cells_total = 0
+        self._commits_total = 0
+        self._journaled = False  # A render napló meg lett nyitva (a végén törölhető)
+
+    def cancel(self):
+        """Megszakítás kérése (akár másik szálból): a következő commit határon áll meg."""
+        self.cancelled = True
+
+    def run(self, text: str, layout: str = 'inline', incremental: bool = False) -> int:
+        """
+        A pipeline futtatása saját event loop-ban. A futás alatt a Ctrl-C
+        megszakítást kér (nem lép ki azonnal).
+
+        Returns:
+            int: Létrehozott commit-ok száma
+        """
+        loop = asyncio.new_event_loop()
+        previous_handler = signal.getsignal(signal.SIGINT)
+        try:
+            try:
+                loop.add_signal_handler(signal.SIGINT, self._interrupt)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows vagy nem fő szál: marad az eredeti kezelő
+                previous_handler = None
+            return loop.run_until_complete(self.run_async(text, layout, incremental))
+        finally:
+            if previous_handler is not None:
+                loop.remove_signal_handler(signal.SIGINT)
+                signal.signal(signal.SIGINT, previous_handler)
+            self._loop = None
+            loop.close()
+
+    def _interrupt(self):
+        if not self.cancelled:
+            print("\n⏸️  Megszakítás kérve: a futó köteg még befejeződik...")
+        self.cancel()
+
+    async def run_async(self, text: str, layout: str = 'inline', incremental: bool = False) -> int:
+        """A pipeline egy már futó event loop-ban (lásd run())."""
+        self._loop = asyncio.get_event_loop()
+        self._started = time.perf_counter()
+
+        canvases: asyncio.Queue = asyncio.Queue(maxsize=1)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        tasks = [self._loop.create_task(self._layout_stage(text, layout, canvases)),
+                 self._loop.create_task(self._batch_stage(canvases, batches, incremental)),
+                 self._loop.create_task(self._commit_stage(batches, incremental))]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return results[-1]
+
+    async def _in_thread(self, func, *args):
+        return await self._loop.run_in_executor(None, func, *args)
+
+    def _emit(self, stage: str, cells_done: int = 0, commits_done: int = 0):
+        if self.progress is not None:
+            self.progress(ProgressEvent(stage, cells_done, self._cells_total, commits_done,
+                                        self._commits_total, time.perf_counter() - self._started,
+                                        self.cancelled))
+
+    async def _layout_stage(self, text: str, layout: str, canvases: asyncio.Queue):
+        """Elemzés és a canvas felrajzolása (a flow layout tábla egy lépésben)."""
+        text = text.strip()
+        canvas = None
+        if not text:
+            print("❌ Üres szöveg!")
+        elif not self.cancelled:
+            def build():
+                with self.git_handler.instrumentation.phase('parse'):
+                    elements = self.layout_manager.parse_text_with_shapes(text)
+                return self.layout_manager.build_canvas(elements, layout)
+            canvas = await self._in_thread(build)
+            self._emit('layout')
+        await canvases.put(canvas)
+
+    async def _batch_stage(self, canvases: asyncio.Queue, batches: asyncio.Queue, incremental: bool):
+        """
+        A canvas napjainak commit kötegekre bontása időrendben. Inkrementális
+        módban csak a meglévő history-ból hiányzó commit-ok kerülnek a kötegekbe,
+        egyébként a render napló szerint még hátralévő napok.
+        """
+        canvas = await canvases.get()
+        existing = None
+        if canvas is not None:
+            if incremental:
+                existing = await self._in_thread(self.git_handler.get_daily_commit_counts)
+                target, excess = self.git_handler.diff_canvas(canvas, existing)
+                if excess:
+                    print(f"⚠️  {len(excess)} napon több commit van a kelleténél "
+                          f"({sum(excess.values())} fölösleges commit)")
+            else:
+                target = await self._in_thread(self.git_handler.start_journal,
+                                               canvas.to_date_counts(self.git_handler))
+                self._journaled = True
+            self._cells_total = len(target)
+            self._commits_total = sum(target.values())
+
+            for batch in RenderJournal.batches(target, self.batch_commits):
+                if self.cancelled:
+                    break
+                await batches.put((batch, existing))
+        await batches.put(None)
+
+    async def _commit_stage(self, batches: asyncio.Queue, incremental: bool) -> int:
+        """
+        A kötegek kiírása a commit backend-del; megszakításkor a köteg határon áll meg.
+        Nem inkrementális módban minden köteg a render naplón át, tartós pontként íródik.
+        """
+        git_handler = self.git_handler
+        cells_done = commits_done = 0
+        while True:
+            item = await batches.get()
+            if item is None:
+                break
+            if self.cancelled:
+                # A sor maradékát eldobjuk, de a termelőt nem hagyjuk blokkolva
+                continue
+            batch, existing = item
+            if incremental:
+                commits_done += await self._in_thread(git_handler.batch_committer.commit_dates,
+                                                      batch, existing, False)
+            else:
+                commits_done += await self._in_thread(git_handler.commit_journal_batch, batch)
+            cells_done += len(batch)
+            self._emit('commit', cells_done, commits_done)
+
+        # Branch, index és working tree frissítése a megírt commit-okra
+        await self._in_thread(git_handler.sync)
+        self._emit('done', cells_done, commits_done)
+
+        if self.cancelled and commits_done < self._commits_total:
+            print(f"⏸️  Megszakítva: {commits_done}/{self._commits_total} commit "
+                  f"({cells_done}/{self._cells_total} nap) került a branch-re.")
+            print("💡 Folytatás: ugyanaz a parancs (a kész napok kimaradnak)")
+            return commits_done
+        if self._journaled:
+            git_handler.journal.finish()
+        if commits_done:
+            print(f"⚡ {commits_done} commit létrehozva ({git_handler.backend} backend)")
+        return commits_done
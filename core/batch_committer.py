@@ -0,0 +1,240 @@
+import subprocess
+import datetime
+from typing import Dict, Optional, Tuple
+from .git_session import GitSession
+from .instrumentation import Instrumentation
+
+
+# Art tárolási módok:
+#   files - minden commit új art_data/YYYY-MM-DD_N.txt fájlt hoz létre (eredeti viselkedés)
+#   log   - minden commit ugyanazt az egy art_data/art.log fájlt módosítja
+#   empty - üres commit-ok, a working tree és az index egyáltalán nem nő
+STORAGE_MODES = ('files', 'log', 'empty')
+LOG_FILE = 'art_data/art.log'
+DETACHED_HEAD_ERROR = "Detached HEAD: az art commit-okhoz egy branch-en kell állni (pl. git switch -c <branch>)"
+
+
+class BatchCommitter:
+    """
+    Sok dátumozott commit létrehozása a GitSession hosszú életű `git fast-import`
+    folyamatával.
+
+    A commit-ok a sync() hívásig csak a fast-import memóriájában vannak; a
+    sync() írja ki a pack-et, frissíti a branch-et és a working tree-t.
+    """
+
+    def __init__(self, repo_path: str = ".", storage_mode: str = 'files',
+                 instrumentation: Optional[Instrumentation] = None,
+                 session: Optional[GitSession] = None):
+        if storage_mode not in STORAGE_MODES:
+            raise ValueError(f"Ismeretlen tárolási mód: {storage_mode} (lehetséges: {', '.join(STORAGE_MODES)})")
+        self.repo_path = repo_path
+        self.storage_mode = storage_mode
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self.session = session or GitSession(repo_path, self.instrumentation)
+        # Ki nem írt (sync előtti) commit-ok állapota
+        self._pending = False
+        self._pending_ref: Optional[str] = None
+        self._synced_head: Optional[str] = None
+        self._last_mark: Optional[int] = None
+        self._tree_changed = False
+
+    def entry_path(self, date: datetime.date, index: int) -> Optional[str]:
+        """Az adott commit által írt fájl (repo-relatív) útvonala; üres commit-nál None."""
+        if self.storage_mode == 'empty':
+            return None
+        if self.storage_mode == 'log':
+            return LOG_FILE
+        return f"art_data/{date.strftime('%Y-%m-%d')}_{index}.txt"
+
+    @staticmethod
+    def entry_content(date: datetime.date, index: int) -> str:
+        """Az adott commit fájl tartalma."""
+        return f"Art data for {date} - entry {index}"
+
+    def branch_ref(self) -> str:
+        """
+        Az aktuális branch ref, amire a commit-ok kerülnek. Detached HEAD-en
+        nincs ilyen (a fast-import egy másik branch-re írna, vagy elutasítaná
+        a frissítést), ezért hibát adunk.
+        """
+        ref = self.session.current_ref()
+        if ref is None:
+            raise RuntimeError(DETACHED_HEAD_ERROR)
+        return ref
+
+    def _current_ref(self) -> Tuple[str, Optional[str]]:
+        """Visszaadja az aktuális branch ref-et és a HEAD commit sha-ját (ha van)."""
+        return self.branch_ref(), self.session.rev_parse('HEAD')
+
+    def _identity(self) -> str:
+        """Commit szerző azonosító (név és e-mail) a git beállításaiból."""
+        return self.session.identity()
+
+    @staticmethod
+    def _format_date(date: datetime.date) -> str:
+        """Dátum raw formátumban (unix idő + időzóna), délben helyi idő szerint."""
+        return BatchCommitter._format_moment(datetime.datetime.combine(date, datetime.time(12, 0, 0)))
+
+    @staticmethod
+    def _format_moment(moment: datetime.datetime) -> str:
+        """Időpont raw formátumban (unix idő + időzóna), helyi idő szerint."""
+        moment = moment.astimezone()
+        offset = int(moment.utcoffset().total_seconds() // 60)
+        sign = '+' if offset >= 0 else '-'
+        offset = abs(offset)
+        return f"{int(moment.timestamp())} {sign}{offset // 60:02d}{offset % 60:02d}"
+
+    @staticmethod
+    def _data(payload: bytes) -> bytes:
+        """fast-import `data` blokk."""
+        return b'data %d\n' % len(payload) + payload + b'\n'
+
+    def build_stream(self, date_counts: Dict[datetime.date, int], ref: str,
+                     parent: Optional[str], identity: str,
+                     existing_counts: Optional[Dict[datetime.date, int]] = None,
+                     first_mark: Optional[int] = None) -> bytes:
+        """
+        Összeállítja a fast-import bemenetet az összes commit-hoz.
+
+        A `from` csak az első commit-nál szerepel (ha van parent); first_mark
+        esetén a commit-ok egymást követő mark-okat kapnak.
+        """
+        existing_counts = existing_counts or {}
+        chunks = []
+        first = True
+        mark = first_mark
+
+        for date in sorted(date_counts):
+            when = self._format_date(date)
+            # A sorszámozás a napon már meglévő commit-ok után folytatódik
+            offset = existing_counts.get(date, 0)
+            for i in range(offset, offset + date_counts[date]):
+                filename = self.entry_path(date, i + 1)
+                message = f"Art commit for {date}\n".encode('utf-8')
+
+                chunks.append(f"commit {ref}\n".encode('utf-8'))
+                if mark is not None:
+                    chunks.append(b'mark :%d\n' % mark)
+                    mark += 1
+                chunks.append(f"author {identity} {when}\n".encode('utf-8'))
+                chunks.append(f"committer {identity} {when}\n".encode('utf-8'))
+                chunks.append(self._data(message))
+                if first and parent:
+                    chunks.append(f"from {parent}\n".encode('utf-8'))
+                first = False
+                if filename is not None:
+                    content = self.entry_content(date, i + 1).encode('utf-8')
+                    chunks.append(f"M 100644 inline {filename}\n".encode('utf-8'))
+                    chunks.append(self._data(content))
+                chunks.append(b'\n')
+
+        return b''.join(chunks)
+
+    def _update_worktree(self, old_head: Optional[str]):
+        """A working tree és az index szinkronizálása az új HEAD-del."""
+        if old_head:
+            args = ['read-tree', '-m', '-u', old_head, 'HEAD']
+        else:
+            args = ['read-tree', '-m', '-u', 'HEAD']
+        subprocess.run(['git'] + args, cwd=self.repo_path)
+
+    def commit_dates(self, date_counts: Dict[datetime.date, int],
+                     existing_counts: Optional[Dict[datetime.date, int]] = None,
+                     sync: bool = True) -> int:
+        """
+        Létrehozza a commit-okat a megadott dátumokra a session fast-import folyamatán.
+
+        Args:
+            date_counts: Dátum -> commit-ok száma
+            existing_counts: Dátum -> már meglévő commit-ok száma (fájl sorszámozáshoz)
+            sync: Azonnal kiírja-e a branch-et és a working tree-t (különben a sync()-nél)
+
+        Returns:
+            int: Létrehozott commit-ok száma
+        """
+        date_counts = {date: count for date, count in date_counts.items() if count > 0}
+        if not date_counts:
+            return 0
+
+        total = sum(date_counts.values())
+        instrumentation = self.instrumentation
+        with instrumentation.phase('build_stream'):
+            if self._pending:
+                # A fast-import a memóriában lévő branch csúcsról folytatja
+                ref, parent = self._pending_ref, None
+            else:
+                ref, parent = self._current_ref()
+            first_mark = self.session.allocate_marks(total)
+            stream = self.build_stream(date_counts, ref, parent, self._identity(),
+                                       existing_counts, first_mark)
+
+        with instrumentation.phase('fast_import'):
+            self.session.write(stream)
+
+        self._mark_pending(ref, parent, first_mark + total - 1, self.storage_mode != 'empty')
+
+        if sync:
+            self.sync()
+        return total
+
+    def commit_removal(self, path: str, message: str) -> Optional[str]:
+        """
+        Egy útvonal (pl. art_data) törlése egyetlen commit-tal, a jelenlegi időponttal.
+
+        Returns:
+            Az új HEAD sha-ja, vagy None ha az útvonal nincs a HEAD-ben
+        """
+        self.sync()
+        if not self.session.path_exists('HEAD', path):
+            return None
+
+        ref, parent = self._current_ref()
+        mark = self.session.allocate_marks(1)
+        when = self._format_moment(datetime.datetime.now())
+        identity = self._identity()
+
+        chunks = [f"commit {ref}\n".encode('utf-8'), b'mark :%d\n' % mark,
+                  f"author {identity} {when}\n".encode('utf-8'),
+                  f"committer {identity} {when}\n".encode('utf-8'),
+                  self._data(f"{message}\n".encode('utf-8'))]
+        if parent:
+            chunks.append(f"from {parent}\n".encode('utf-8'))
+        chunks.append(f"D {path}\n\n".encode('utf-8'))
+
+        with self.instrumentation.phase('fast_import'):
+            self.session.write(b''.join(chunks))
+        self._mark_pending(ref, parent, mark, True)
+        return self.sync()
+
+    def _mark_pending(self, ref: str, parent: Optional[str], last_mark: int, tree_changed: bool):
+        """Megjegyzi, hogy a fast-import-ban ki nem írt commit-ok vannak."""
+        if not self._pending:
+            self._pending = True
+            self._pending_ref = ref
+            self._synced_head = parent
+        self._last_mark = last_mark
+        self._tree_changed = self._tree_changed or tree_changed
+
+    def sync(self) -> Optional[str]:
+        """
+        Kiírja a függő commit-okat: checkpoint (pack + ref frissítés, a ref
+        visszaellenőrzésével), majd a working tree és az index szinkronizálása.
+
+        Returns:
+            Az új HEAD sha-ja, vagy None ha nem volt függő commit
+        """
+        if not self._pending:
+            return None
+
+        # Sikertelen checkpoint után sincs több függő commit: a fast-import leállt
+        self._pending = False
+        tree_changed, self._tree_changed = self._tree_changed, False
+        with self.instrumentation.phase('fast_import'):
+            head = self.session.checkpoint(self._last_mark, self._pending_ref)
+
+        # Üres commit-oknál a fa nem változik, nincs mit szinkronizálni
+        if tree_changed:
+            with self.instrumentation.phase('worktree_sync'):
+                self._update_worktree(self._synced_head)
+        return head
@@ -0,0 +1,103 @@
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Any, Dict, List, Optional
+
+from .job_runner import JobRunner
+
+
+def _run_repo_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Worker folyamat belépési pontja: egy repository összes job-ja sorban.
+
+    Az azonos repository-ba író job-ok nem futhatnak párhuzamosan (közös ref
+    és index), ezért repository-nként egy feladat kerül a pool-ba. Minden job
+    saját GitHandler-t kap (JobRunner.run_job).
+    """
+    results = []
+    for job in jobs:
+        output = io.StringIO()
+        started = time.perf_counter()
+        try:
+            with redirect_stdout(output):
+                commits = JobRunner.run_job(job)
+            error = None
+        except Exception as e:
+            commits = 0
+            error = f"{e}\n{traceback.format_exc()}"
+        results.append({
+            'job': job,
+            'commits': commits or 0,
+            'seconds': time.perf_counter() - started,
+            'error': error,
+            'log': output.getvalue() if error else '',
+            'pid': os.getpid(),
+        })
+    return results
+
+
+class BatchRunner:
+    """Sok repository art-jának párhuzamos legyártása process pool-lal."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+
+    @staticmethod
+    def group_by_repo(jobs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """A job-ok csoportosítása cél repository szerint, az eredeti sorrend megtartásával."""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for job in jobs:
+            groups.setdefault(os.path.abspath(job['repo']), []).append(job)
+        return list(groups.values())
+
+    def run(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        A job-ok futtatása a pool-ban.
+
+        Returns:
+            Dict: 'results' (job-onkénti eredmények), 'commits', 'failed',
+                  'seconds' (falióra idő) és 'commits_per_second'
+        """
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        groups = self.group_by_repo(jobs)
+
+        print(f"🚀 {len(jobs)} job, {len(groups)} repository, {min(self.workers, len(groups) or 1)} worker")
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(_run_repo_jobs, group): group for group in groups}
+            for future in as_completed(futures):
+                try:
+                    group_results = future.result()
+                except Exception as e:
+                    # A worker folyamat maga halt meg: a csoport összes job-ja hibás
+                    group_results = [{'job': job, 'commits': 0, 'seconds': 0.0, 'error': str(e),
+                                      'log': '', 'pid': None} for job in futures[future]]
+
+                for result in group_results:
+                    results.append(result)
+                    job = result['job']
+                    if result['error']:
+                        print(f"❌ {job['repo']} - '{job['prompt']}': {result['error'].splitlines()[0]}")
+                    else:
+                        print(f"✅ {job['repo']} - '{job['prompt']}': {result['commits']} commit, "
+                              f"{result['seconds']:.2f} mp")
+
+        seconds = time.perf_counter() - started
+        commits = sum(result['commits'] for result in results)
+        summary = {
+            'results': results,
+            'commits': commits,
+            'failed': [result for result in results if result['error']],
+            'seconds': seconds,
+            'commits_per_second': commits / seconds if seconds > 0 else 0.0,
+        }
+
+        print(f"\n📦 {len(results)} job kész {seconds:.2f} mp alatt: {commits} commit "
+              f"({summary['commits_per_second']:.0f} commit/mp), {len(summary['failed'])} hiba")
+        for result in summary['failed']:
+            print(f"   • {result['job']['repo']}: {result['error'].splitlines()[0]}")
+        return summary
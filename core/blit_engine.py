@@ -0,0 +1,150 @@
+from typing import Dict, Iterable, Optional, Tuple
+from patterns import CompiledPattern, as_compiled
+
+try:
+    import numpy
+except ImportError:  # A NumPy opcionális: nélküle a tiszta Python út fut
+    numpy = None
+
+
+class BlitEngine:
+    """
+    Glyph-ek rámásolása a canvas-ra szeletenként, pixelenkénti set() hívás nélkül.
+
+    Minden (glyph, intenzitás) párhoz egyszer készül el a canvas elrendezésével
+    azonos (oszlopfolytonos) változat. NumPy-jal a teljes layout glyph-enként
+    csoportosítva, tömb indexeléssel kerül a canvas-ra (a Python szintű munka a
+    különböző glyph-ek számával arányos); NumPy nélkül egy glyph kirajzolása
+    oszloponként egy bytearray szelet írás. A vágást a szelet határai adják.
+    A grid-ről lelógó pixelek a Canvas.set()-tel azonos módon számolódnak.
+    """
+
+    _shared: Optional['BlitEngine'] = None
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        """
+        Args:
+            use_numpy: NumPy használata (None esetén ha telepítve van)
+        """
+        if use_numpy and numpy is None:
+            raise RuntimeError("A NumPy blit engine-hez telepítsd a numpy csomagot (pip install numpy)")
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self._cache: Dict[tuple, object] = {}
+
+    @classmethod
+    def shared(cls) -> 'BlitEngine':
+        """Folyamatonként egy közös példány (a glyph változatok cache-e így megmarad)."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _prepared(self, glyph: CompiledPattern, intensity: Optional[int], max_level: int):
+        """A glyph canvas elrendezésű változata (hét x nap), az intenzitással felülírva."""
+        key = (glyph, intensity)
+        prepared = self._cache.get(key)
+        if prepared is None:
+            columns = [bytes(min(intensity or cell, max_level) if cell else 0 for cell in column)
+                       for column in zip(*glyph.rows)]
+            if self.use_numpy:
+                prepared = numpy.frombuffer(b''.join(columns), dtype=numpy.uint8).reshape(
+                    glyph.width, glyph.height)
+            else:
+                prepared = columns
+            self._cache[key] = prepared
+        return prepared
+
+    def blit(self, canvas, placements: Iterable) -> int:
+        """
+        Több glyph kirajzolása egy lépésben.
+
+        Args:
+            canvas: A cél Canvas
+            placements: Elemek week, day, glyph és intensity attribútummal (pl. flow_layout.Placement)
+
+        Returns:
+            A kirajzolt (grid-en belüli) pixelek száma
+        """
+        if not self.use_numpy:
+            drawn = 0
+            for placement in placements:
+                drawn += self._blit_one(canvas, None, placement.glyph, placement.week, placement.day,
+                                        placement.intensity)
+            return drawn
+
+        # NumPy: a teljesen grid-en belüli glyph-ek glyph-enként csoportosítva, csoportonként
+        # egyetlen numpy.maximum.at hívással kerülnek a canvas-ra; csak a lelógók mennek egyenként
+        width, height = canvas.width, canvas.height
+        view = numpy.frombuffer(canvas.cells, dtype=numpy.uint8).reshape(width, height)
+        groups: Dict[Tuple[CompiledPattern, Optional[int]], list] = {}
+        drawn = 0
+        for placement in placements:
+            glyph, week, day = placement.glyph, placement.week, placement.day
+            if 0 <= week and week + glyph.width <= width and 0 <= day and day + glyph.height <= height:
+                groups.setdefault((glyph, placement.intensity), []).append(week * height + day)
+            else:
+                drawn += self._blit_one(canvas, view, glyph, week, day, placement.intensity)
+
+        flat = view.reshape(-1)
+        for (glyph, intensity), bases in groups.items():
+            offsets, values = self._lit_cells(glyph, intensity, height, canvas.MAX_LEVEL)
+            index = (numpy.array(bases)[:, None] + offsets).ravel()
+            numpy.maximum.at(flat, index, numpy.tile(values, len(bases)))
+            drawn += len(bases) * len(offsets)
+        return drawn
+
+    def _lit_cells(self, glyph: CompiledPattern, intensity: Optional[int], height: int, max_level: int):
+        """A glyph világító celláinak canvas index eltolásai (dx * magasság + dy) és szintjei."""
+        key = (glyph, intensity, height)
+        lit = self._cache.get(key)
+        if lit is None:
+            lit = (numpy.array([dx * height + dy for dx, dy, _ in glyph.offsets], dtype=numpy.intp),
+                   numpy.array([min(intensity or cell, max_level) for _, _, cell in glyph.offsets],
+                               dtype=numpy.uint8))
+            self._cache[key] = lit
+        return lit
+
+    def blit_pattern(self, canvas, pattern, start_week: int = 0, start_day: int = 0,
+                     intensity: Optional[int] = None) -> int:
+        """Egyetlen minta kirajzolása (lista vagy CompiledPattern)."""
+        view = None
+        if self.use_numpy:
+            view = numpy.frombuffer(canvas.cells, dtype=numpy.uint8).reshape(canvas.width, canvas.height)
+        return self._blit_one(canvas, view, as_compiled(pattern), start_week, start_day, intensity)
+
+    def _blit_one(self, canvas, view, glyph: CompiledPattern, week: int, day: int,
+                  intensity: Optional[int]) -> int:
+        width, height = canvas.width, canvas.height
+        lit = len(glyph.offsets)
+        if not (0 <= week and week + glyph.width <= width and 0 <= day and day + glyph.height <= height):
+            # Részben vagy teljesen a grid-en kívül: a lelógó pixelek nyilvántartása
+            for dx, dy, _ in glyph.offsets:
+                if not canvas.in_bounds(week + dx, day + dy):
+                    canvas.clipped += 1
+                    canvas.clipped_cells.append((week + dx, day + dy))
+                    lit -= 1
+
+        first_column, last_column = max(0, -week), min(glyph.width, width - week)
+        first_row, last_row = max(0, -day), min(glyph.height, height - day)
+        if first_column >= last_column or first_row >= last_row:
+            return lit
+
+        prepared = self._prepared(glyph, intensity, canvas.MAX_LEVEL)
+        if view is not None:
+            target = view[week + first_column:week + last_column, day + first_row:day + last_row]
+            numpy.maximum(target, prepared[first_column:last_column, first_row:last_row], out=target)
+            return lit
+
+        cells = canvas.cells
+        rows = last_row - first_row
+        start = (week + first_column) * height + day + first_row
+        for column in prepared[first_column:last_column]:
+            if first_row or rows != glyph.height:
+                column = column[first_row:last_row]
+            existing = cells[start:start + rows]
+            if existing.count(0) == rows:
+                cells[start:start + rows] = column
+            else:
+                # Átfedésnél a nagyobb szint marad meg, mint a Canvas.set()-ben
+                cells[start:start + rows] = bytes(map(max, existing, column))
+            start += height
+        return lit
@@ -0,0 +1,104 @@
+import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .blit_engine import BlitEngine
+
+
+class Canvas:
+    """Memóriabeli contribution grid (hetek x napok), amire a rendererek rajzolnak."""
+
+    MAX_LEVEL = 4  # A GitHub contribution graph 4 színárnyalata (0 = üres)
+
+    def __init__(self, width: int = 53, height: int = 7):
+        self.width = width
+        self.height = height
+        # Oszlopfolytonos tárolás: index = hét * magasság + nap (ugyanaz a sorrend, mint a dátumoké)
+        self.cells = bytearray(width * height)
+        self.clipped = 0  # Grid-en kívül eső, eldobott pixelek száma
+        self.clipped_cells: List[Tuple[int, int]] = []  # Az eldobott pixelek (hét, nap) pozíciói
+
+    def _index(self, week: int, day: int) -> int:
+        return week * self.height + day
+
+    def in_bounds(self, week: int, day: int) -> bool:
+        """Ellenőrzi, hogy a pozíció a grid-en belül van-e."""
+        return 0 <= week < self.width and 0 <= day < self.height
+
+    def get(self, week: int, day: int) -> int:
+        """Visszaadja egy cella értékét."""
+        return self.cells[self._index(week, day)]
+
+    def set(self, week: int, day: int, value: int = 1) -> bool:
+        """
+        Beállít egy cellát (intenzitás szint 0-4). Átfedésnél a nagyobb érték
+        marad meg, így ugyanaz a nap nem kerül kétszer commit-olásra.
+        """
+        if not self.in_bounds(week, day):
+            self.clipped += 1
+            self.clipped_cells.append((week, day))
+            return False
+
+        value = min(max(value, 0), self.MAX_LEVEL)
+        index = self._index(week, day)
+        if value > self.cells[index]:
+            self.cells[index] = value
+        return True
+
+    def blit(self, pattern, start_week: int = 0, start_day: int = 0,
+             intensity: Optional[int] = None) -> int:
+        """
+        Rárajzol egy mintát a canvas-ra, és visszaadja a kirajzolt pixelek számát.
+
+        Args:
+            pattern: Lista vagy CompiledPattern minta (cellaértékek = intenzitás szintek)
+            intensity: Ha meg van adva, minden világító cella ezt a szintet kapja
+        """
+        return BlitEngine.shared().blit_pattern(self, pattern, start_week, start_day, intensity)
+
+    def blit_many(self, placements: Iterable, engine: Optional[BlitEngine] = None) -> int:
+        """
+        Egy teljes layout tábla (flow_layout.Placement elemek) kirajzolása egy lépésben.
+
+        Args:
+            placements: Elemek week, day, glyph és intensity attribútummal
+            engine: Blit engine (None esetén a közös, NumPy-t használó ha elérhető)
+        """
+        return (engine or BlitEngine.shared()).blit(self, placements)
+
+    def clear(self):
+        """Kiüríti a canvas-t."""
+        self.cells = bytearray(self.width * self.height)
+        self.clipped = 0
+        self.clipped_cells = []
+
+    def lit_cells(self) -> Iterator[Tuple[int, int, int]]:
+        """Végigmegy a nem üres cellákon: (hét, nap, érték)."""
+        for index, value in enumerate(self.cells):
+            if value:
+                week, day = divmod(index, self.height)
+                yield week, day, value
+
+    def count_lit(self) -> int:
+        """Nem üres cellák száma."""
+        return self.width * self.height - self.cells.count(0)
+
+    def diff(self, other: 'Canvas') -> List[Tuple[int, int, int, int]]:
+        """Eltérő cellák listája: (hét, nap, saját érték, másik érték)."""
+        if (self.width, self.height) != (other.width, other.height):
+            raise ValueError("A két canvas mérete eltér")
+
+        changes = []
+        for index, (mine, theirs) in enumerate(zip(self.cells, other.cells)):
+            if mine != theirs:
+                week, day = divmod(index, self.height)
+                changes.append((week, day, mine, theirs))
+        return changes
+
+    def to_date_counts(self, git_handler) -> Dict[datetime.date, int]:
+        """
+        Dátum -> commit szám leképezés: minden nap pontosan egyszer szerepel, a szintjének
+        megfelelő commit számmal. A teljes canvas egy lépésben, a grid dátum táblájával.
+        """
+        if self.height == git_handler.grid.height:
+            return git_handler.grid.date_counts(self.cells, git_handler.intensity_commits)
+        return {git_handler.grid_pos_to_date(week, day): git_handler.commits_for_level(value)
+                for week, day, value in self.lit_cells()}
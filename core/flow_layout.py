@@ -0,0 +1,282 @@
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from patterns import CompiledPattern
+from .text_packer import Kerning
+
+# Elrendezési módok: egy sorban középre (az eredeti), évenkénti ablakokon
+# átfolyó banner, illetve a teljes grid-en többsoros tördelés
+LAYOUT_MODES = ('inline', 'banner', 'wrap')
+
+UNKNOWN_CHAR_WIDTH = 4  # Ismeretlen karakter helye (ahogy a write_text-ben)
+FULL_YEAR_WEEKS = 52  # Egy teljes éves ablak, a hiányzó évek becsléséhez
+
+# Egy szó: glyph-ek (None = ismeretlen karakter) és szélességeik
+Glyphs = List[Tuple[Optional[CompiledPattern], int]]
+
+
+class Placement:
+    """Egy glyph helye a layout táblában."""
+
+    __slots__ = ('week', 'day', 'glyph', 'intensity')
+
+    def __init__(self, week: int, day: int, glyph: CompiledPattern, intensity: Optional[int] = None):
+        self.week = week
+        self.day = day
+        self.glyph = glyph
+        self.intensity = intensity
+
+    def __repr__(self) -> str:
+        return f"Placement(hét {self.week}, nap {self.day}, {self.glyph!r})"
+
+
+class LayoutPlan:
+    """
+    Az előre kiszámolt teljes layout: glyph -> (hét, nap) offset tábla,
+    a kitöltött sorok és a helyhiány miatt kimaradt szavak.
+    """
+
+    def __init__(self):
+        self.placements: List[Placement] = []
+        self.lines: List[Tuple[int, int, int, str]] = []  # (hét, nap, szélesség, szöveg)
+        self.overflow: List[str] = []  # A grid-re már nem férő szavak
+        self.windows_needed = 0  # Ennyi éves ablak kellene a teljes szöveghez
+
+    def __len__(self) -> int:
+        return len(self.placements)
+
+
+class FlowLayout:
+    """
+    Hosszú promptok tördelése: a szavak sorokba kerülnek, a sorok pedig az
+    egymást követő éves ablakokba (banner), vagy a teljes grid-en egymás alá
+    (wrap). Egy ablakba annyi sor kerül, amennyi a grid magasságába belefér.
+
+    A teljes layout egyszer, commit-olás előtt készül el: az eredmény egy
+    glyph offset tábla (LayoutPlan), amit a LayoutManager egyben rajzol ki, így
+    a szöveg nem vágódik le csendben az első 53 hetes ablak végén.
+    """
+
+    def __init__(self, glyphs: Mapping[str, CompiledPattern], shapes: Mapping[str, CompiledPattern],
+                 letter_spacing: int = 1, element_spacing: int = 1, line_spacing: int = 1,
+                 kerning: Optional[Kerning] = None, space_width: Optional[int] = None):
+        """
+        Args:
+            glyphs: Karakter -> lefordított betű minta
+            shapes: Alakzat név -> lefordított minta
+            letter_spacing: Betűk közötti távolság (kerningnél a világító cellák közötti minimum)
+            element_spacing: Szöveg és alakzat elemek közötti távolság (mint inline módban)
+            line_spacing: Egy ablakon belüli sorok közötti távolság
+            kerning: Pár kerning szoros befoglaló dobozokkal (None esetén fix betűköz)
+            space_width: A szóköz szélessége (None esetén a font szóköz glyph-je)
+        """
+        self.glyphs = glyphs
+        self.shapes = shapes
+        self.letter_spacing = letter_spacing
+        self.element_spacing = element_spacing
+        self.line_spacing = line_spacing
+        self.kerning = kerning
+        self.narrow_space = space_width
+        if space_width is None:
+            space = glyphs.get(' ')
+            space_width = space.width if space is not None else UNKNOWN_CHAR_WIDTH
+        # Két szó között ugyanannyi hely van, mint amennyit a write_text hagyna;
+        # minden további (explicit) szóköz még egy szóköz glyph-nyi hely
+        self.space_advance = space_width + letter_spacing
+        self.word_spacing = letter_spacing + self.space_advance
+
+    def _gap(self, element: Dict[str, Any]) -> int:
+        """Az elem előtti hely: elem távolság, plusz az explicit többlet szóközök."""
+        return self.element_spacing + max(0, (element.get('space_before') or 0) - 1) * self.space_advance
+
+    def _resolve_text(self, text: str) -> Glyphs:
+        resolved = []
+        for char in text.upper():
+            if char == ' ' and self.narrow_space is not None:
+                resolved.append((None, self.narrow_space))
+                continue
+            glyph = self.glyphs.get(char)
+            resolved.append((glyph, glyph.width if glyph is not None else UNKNOWN_CHAR_WIDTH))
+        return resolved
+
+    def tokenize(self, elements: Sequence[Dict[str, Any]]) -> List[Tuple[str, Glyphs, int, Optional[int]]]:
+        """
+        Az elemek szavakra bontása: (szöveg, glyph-ek, előtte hagyott hely, intenzitás).
+        Egy alakzat egyetlen, oszthatatlan szó; a sortörés üres glyph listájú token.
+        """
+        tokens = []
+        for element in elements:
+            intensity = element.get('intensity')
+            gap = self._gap(element)
+            if element['type'] == 'break':
+                tokens.append(('', [], 0, None))
+            elif element['type'] == 'shape':
+                shape = self.shapes.get(element['content'])
+                if shape is not None:
+                    tokens.append((element['content'], [(shape, shape.width)], gap, intensity))
+            else:
+                for match in re.finditer(r'(\s*)(\S+)', element['content']):
+                    if match.start():
+                        gap = self.word_spacing + (len(match.group(1)) - 1) * self.space_advance
+                    tokens.append((match.group(2), self._resolve_text(match.group(2)), gap, intensity))
+        return tokens
+
+    def resolve(self, element: Dict[str, Any]) -> Glyphs:
+        """Egy elem glyph-jei szóközökkel együtt (inline módhoz), egyszer feloldva."""
+        if element['type'] == 'shape':
+            shape = self.shapes.get(element['content'])
+            return [(shape, shape.width)] if shape is not None else []
+        return self._resolve_text(element['content'])
+
+    def inline(self, width: int, height: int, elements: Sequence[Dict[str, Any]]) -> LayoutPlan:
+        """
+        Az eredeti inline elrendezés táblaként: minden elem egymás mellett, a
+        sor a grid közepén. Minden elemet egyszer oldunk fel és mérünk le.
+
+        Args:
+            width, height: A grid mérete (hetek, napok)
+            elements: A parse_text_with_shapes elemei
+        """
+        plan = LayoutPlan()
+        # Egy sorban nincs sortörés: a break elemek kimaradnak
+        elements = [element for element in elements if element['type'] != 'break']
+        resolved = [(element, self.resolve(element)) for element in elements]
+        widths = [self._word_width(glyphs) if glyphs else 0 for _, glyphs in resolved]
+        gaps = [self._gap(element) for element in elements[1:]] + [self.element_spacing]
+        total_width = sum(widths) + sum(gaps)
+        line_height = max((glyph.height for _, glyphs in resolved
+                           for glyph, _ in glyphs if glyph is not None), default=0)
+
+        week = max(0, (width - total_width) // 2)
+        day = max(0, (height - line_height) // 2)
+        plan.lines.append((week, day, total_width - self.element_spacing,
+                           ' '.join(element['content'] for element in elements)))
+        for (element, glyphs), element_width, gap in zip(resolved, widths, gaps):
+            self._place(plan, glyphs, week, day, element.get('intensity'))
+            week += element_width + gap
+        return plan
+
+    def _place(self, plan: LayoutPlan, glyphs: Glyphs, week: int, day: int, intensity: Optional[int]):
+        offsets, _ = self._offsets(glyphs)
+        for (glyph, _), offset in zip(glyphs, offsets):
+            if glyph is not None:
+                plan.placements.append(Placement(week + offset, day, glyph, intensity))
+
+    def _offsets(self, glyphs: Glyphs) -> Tuple[List[int], int]:
+        """A szó glyph-jeinek kezdő oszlopai és a szó szélessége (kerninggel szoros dobozokkal)."""
+        if self.kerning is not None:
+            return self.kerning.layout(glyphs, self.letter_spacing)
+        offsets = []
+        current = 0
+        for _, width in glyphs:
+            offsets.append(current)
+            current += width + self.letter_spacing
+        return offsets, current - self.letter_spacing
+
+    def _word_width(self, glyphs: Glyphs) -> int:
+        return self._offsets(glyphs)[1]
+
+    def _split_word(self, glyphs: Glyphs, width: int) -> List[Glyphs]:
+        """Egy ablaknál szélesebb szó tördelése karakterenként."""
+        parts: List[Glyphs] = [[]]
+        for item in glyphs:
+            if parts[-1] and self._word_width(parts[-1] + [item]) > width:
+                parts.append([])
+            parts[-1].append(item)
+        return parts
+
+    def plan(self, windows: Sequence[Tuple[int, int]], height: int,
+             elements: Sequence[Dict[str, Any]]) -> LayoutPlan:
+        """
+        A teljes layout kiszámítása.
+
+        Args:
+            windows: (kezdő hét, szélesség) ablakok balról jobbra
+            height: A grid magassága (napok)
+            elements: A parse_text_with_shapes elemei
+        """
+        tokens = self.tokenize(elements)
+        plan = LayoutPlan()
+        if not tokens:
+            return plan
+
+        line_height = max((glyph.height for _, glyphs, _, _ in tokens
+                           for glyph, _ in glyphs if glyph is not None), default=0)
+        rows = max(1, (height + self.line_spacing) // (line_height + self.line_spacing))
+        block_height = rows * line_height + (rows - 1) * self.line_spacing
+        top = max(0, (height - block_height) // 2)
+        # Sorhelyek: minden ablakban fentről lefelé annyi sor, amennyi elfér
+        slots = [(start, width, top + row * (line_height + self.line_spacing))
+                 for start, width in windows for row in range(rows)]
+
+        # Szavak sorokba rendezése: (szavak, szélesség) soronként
+        lines: List[List[Tuple[str, Glyphs, int, Optional[int]]]] = [[]]
+        widths = [0]
+        slot_widths = [width for _, width, _ in slots]
+
+        def slot_width(index: int) -> int:
+            # A grid utáni képzeletbeli ablakok csak a szükséges évek becsléséhez kellenek
+            return slot_widths[index] if index < len(slot_widths) else FULL_YEAR_WEEKS
+
+        last_break = False
+        for text, glyphs, gap, intensity in tokens:
+            line = len(lines) - 1
+            if not glyphs:
+                # Sortörés: új sor, ha az aktuális nem üres (két egymás utáni törés üres sort hagy)
+                if widths[line] or last_break:
+                    lines.append([])
+                    widths.append(0)
+                last_break = True
+                continue
+            last_break = False
+            width = self._word_width(glyphs)
+            if widths[line] and widths[line] + gap + width <= slot_width(line):
+                lines[line].append((text, glyphs, widths[line] + gap, intensity))
+                widths[line] += gap + width
+                continue
+            if widths[line]:
+                lines.append([])
+                widths.append(0)
+                line += 1
+            # Üres sor: ha a szó így sem fér el, karakterenként tördeljük; a túl
+            # keskeny ablakokat (pl. az év utolsó, csonka hete) átugorjuk
+            remaining = glyphs
+            while True:
+                while slot_width(line) < min(remaining[0][1], FULL_YEAR_WEEKS):
+                    lines.append([])
+                    widths.append(0)
+                    line += 1
+                part = remaining
+                if self._word_width(part) > slot_width(line):
+                    part = self._split_word(part, slot_width(line))[0]
+                lines[line].append((text, part, 0, intensity))
+                widths[line] = self._word_width(part)
+                remaining = remaining[len(part):]
+                if not remaining:
+                    break
+                lines.append([])
+                widths.append(0)
+                line += 1
+
+        for line, (words, width) in enumerate(zip(lines, widths)):
+            if line >= len(slots):
+                plan.overflow.extend(text for text, _, _, _ in words)
+                continue
+            if not words:
+                continue
+            start, slot, day = slots[line]
+            # Soronként középre igazítva az ablakon belül
+            week = start + max(0, (slot - width) // 2)
+            plan.lines.append((week, day, width, ' '.join(text for text, _, _, _ in words)))
+            for text, glyphs, offset, intensity in words:
+                self._place(plan, glyphs, week + offset, day, intensity)
+
+        # A karakterenként tördelt szavak darabjai egyszer szerepeljenek
+        plan.overflow = list(dict.fromkeys(plan.overflow))
+        plan.windows_needed = -(-len(lines) // rows)
+        return plan
+
+    @staticmethod
+    def year_windows(grid) -> List[Tuple[int, int]]:
+        """A grid éves ablakai: (kezdő hét, szélesség) a Grid.year_starts() határai mentén."""
+        starts = [week for week, _ in grid.year_starts()] + [grid.width]
+        return [(start, end - start) for start, end in zip(starts, starts[1:]) if end > start]
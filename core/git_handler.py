@@ -1,73 +1,316 @@
 import os
 import stat
+import atexit
 import shutil
 import subprocess
 import datetime
-from typing import Tuple, Optional
+from contextlib import contextmanager
+from typing import Dict, Tuple, Optional
+from .batch_committer import BatchCommitter
+from .object_writer import BACKENDS, LOOSE_FILES_WARN_COMMITS, ObjectWriter
+from .pack_writer import PackWriter
+from .canvas import Canvas
+from .git_session import GitSession
+from .grid import Grid
+from .history_reader import HistoryReader
+from .history_rewriter import BACKUP_REF_PREFIX, HistoryRewriter
+from .instrumentation import Instrumentation
+from .render_journal import JOURNAL_BATCH_COMMITS, RenderJournal
+from patterns import as_compiled
 
 
 class GitHandler:
     """Git repository műveletek kezelése."""
     
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", storage_mode: str = 'files', year: Optional[int] = None,
+                 instrumentation: Optional[Instrumentation] = None, backend: str = 'fast-import',
+                 grid: Optional[Grid] = None):
+        """
+        Args:
+            repo_path: A Git repository útvonala
+            storage_mode: Art tárolási mód ('files', 'log' vagy 'empty', lásd batch_committer)
+            year: Ha meg van adva, a grid az adott év contribution graph-ját fedi le
+            instrumentation: Fázis mérés (None esetén kikapcsolt példány)
+            backend: Commit író ('fast-import', 'objects' vagy 'pack', lásd object_writer)
+            grid: Tetszőleges dátum ablak (pl. Grid.for_years(2023, 2025)); elsőbbséget élvez a year-rel szemben
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Ismeretlen backend: {backend} (lehetséges: {', '.join(BACKENDS)})")
         self.repo_path = repo_path
-        self.start_date = datetime.date(2024, 6, 16)  # Vasárnap
-        self.grid_width = 53  # Hetek száma
-        self.grid_height = 7  # Napok száma (0=vasárnap, 6=szombat)
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        # A naptári rács: alapértelmezésben 53 hét 2024-06-16 (vasárnap) kezdettel
+        if grid is None:
+            grid = Grid.for_years(year) if year is not None else Grid()
+        self.grid = grid
+        # Intenzitás szint (0-4) -> napi commit szám. A GitHub a legaktívabb naphoz
+        # viszonyított negyedekbe sorolja a napokat, így a 4 szint 4 külön színt ad.
+        self.intensity_commits = (0, 1, 4, 7, 10)
+        # Hosszú életű git folyamatok: minden repo olvasás és írás ezen megy át
+        self.git_session = GitSession(repo_path, self.instrumentation)
+        committer_class = {'objects': ObjectWriter, 'pack': PackWriter}.get(backend, BatchCommitter)
+        self.batch_committer = committer_class(repo_path, storage_mode, self.instrumentation, self.git_session)
+        self.storage_mode = storage_mode
+        self.backend = backend
+        self.history_reader = HistoryReader(repo_path, self.instrumentation, self.git_session)
+        self.journal = RenderJournal(repo_path, self.git_session)
+        self._pending_commits: Optional[Dict[datetime.date, int]] = None
+        self.canvas: Optional[Canvas] = None  # Ha be van állítva, a draw_pattern ide rajzol
+        # A függő commit-ok kilépéskor se vesszenek el
+        atexit.register(self.close)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def sync(self):
+        """A session-ben függő commit-ok kiírása (branch, index és working tree frissítése)."""
+        self.batch_committer.sync()
+    
+    def close(self):
+        """Függő commit-ok kiírása és a git folyamatok leállítása."""
+        # A lezárt handler-t az atexit hook se tartsa életben (sok job egy folyamatban)
+        atexit.unregister(self.close)
+        self.batch_committer.sync()
+        self.git_session.close()
+    
+    @property
+    def start_date(self) -> datetime.date:
+        """A grid első napja (vasárnap)."""
+        return self.grid.start_date
+    
+    @property
+    def end_date(self) -> datetime.date:
+        """A grid utolsó napja (szombat)."""
+        return self.grid.end_date
+    
+    @property
+    def grid_width(self) -> int:
+        """Hetek száma."""
+        return self.grid.width
+    
+    @property
+    def grid_height(self) -> int:
+        """Napok száma (0=vasárnap, 6=szombat)."""
+        return self.grid.height
+    
+    @staticmethod
+    def year_start_date(year: int) -> datetime.date:
+        """Az éves contribution graph első napja: a január 1-jén vagy előtte lévő vasárnap."""
+        return Grid.week_start(datetime.date(year, 1, 1))
     
     def date_to_grid_pos(self, date: datetime.date) -> Tuple[int, int]:
         """Dátumot grid pozícióvá konvertál."""
-        delta = date - self.start_date
-        week = delta.days // 7
-        day = delta.days % 7
-        return week, day
+        return self.grid.position_of(date)
     
     def grid_pos_to_date(self, week: int, day: int) -> datetime.date:
-        """Grid pozíciót dátummá konvertál."""
-        delta = datetime.timedelta(days=week * 7 + day)
-        return self.start_date + delta
+        """Grid pozíciót dátummá konvertál (az előre kiszámolt dátum táblából)."""
+        return self.grid.date_at(week, day)
+    
+    def commits_for_level(self, level: int) -> int:
+        """Intenzitás szinthez (0-4) tartozó napi commit szám."""
+        level = min(max(level, 0), len(self.intensity_commits) - 1)
+        return self.intensity_commits[level]
     
     def create_commit(self, date: datetime.date, commits_count: int = 1):
         """Létrehoz commit-okat a megadott dátumra."""
-        for i in range(commits_count):
-            # Fájl név generálása dátum és sorszám alapján
-            filename = f"art_data/{date.strftime('%Y-%m-%d')}_{i+1}.txt"
-            
-            # Könyvtár létrehozása, ha nem létezik
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            
-            # Fájl tartalom
-            content = f"Art data for {date} - entry {i+1}"
-            
-            # Fájl írása
-            with open(filename, 'w') as f:
-                f.write(content)
-            
-            # Git add
-            subprocess.run(['git', 'add', filename], cwd=self.repo_path)
-            
-            # Commit készítése a megadott dátummal
-            env = os.environ.copy()
-            commit_datetime = datetime.datetime.combine(date, datetime.time(12, 0, 0))
-            env['GIT_AUTHOR_DATE'] = commit_datetime.isoformat()
-            env['GIT_COMMITTER_DATE'] = commit_datetime.isoformat()
+        # Batch módban csak összegyűjtjük, a commit-ok a flush-nál készülnek
+        if self._pending_commits is not None:
+            self._pending_commits[date] = self._pending_commits.get(date, 0) + commits_count
+            return
+        
+        # A commit a session fast-import folyamatába kerül (nincs git add/commit folyamat
+        # commit-onként); a branch és a working tree a következő olvasásnál vagy a
+        # sync()/close() hívásnál frissül
+        self.batch_committer.commit_dates({date: commits_count}, sync=False)
+    
+    def new_canvas(self) -> Canvas:
+        """Üres canvas a grid méretével."""
+        return Canvas(self.grid_width, self.grid_height)
+    
+    @contextmanager
+    def drawing_to(self, canvas: Canvas):
+        """A blokkon belül a draw_pattern a megadott canvas-ra rajzol commit-olás helyett."""
+        previous = self.canvas
+        self.canvas = canvas
+        try:
+            yield canvas
+        finally:
+            self.canvas = previous
+    
+    def commit_canvas(self, canvas: Canvas, incremental: bool = False) -> int:
+        """
+        Egyetlen lépésben commit-olja a canvas-t: minden dátum egyszer, a megfelelő commit számmal.
+        
+        Args:
+            canvas: A kirajzolt canvas
+            incremental: Csak a meglévő history-hoz képest hiányzó commit-ok létrehozása
+        """
+        if not incremental:
+            created = self.commit_journaled(canvas.to_date_counts(self))
+            print(f"⚡ {created} commit létrehozva ({self.backend} backend)")
+            return created
+        
+        existing = self.get_daily_commit_counts()
+        missing, excess = self.diff_canvas(canvas, existing)
+        
+        if excess:
+            extra = sum(excess.values())
+            print(f"⚠️  {len(excess)} napon több commit van a kelleténél ({extra} fölösleges commit)")
+            for date in sorted(excess)[:5]:
+                print(f"   • {date}: +{excess[date]}")
+            if len(excess) > 5:
+                print(f"   • ... és még {len(excess) - 5} nap")
+            print("💡 A pontos képhez tisztítsd meg az art history-t, majd rajzold újra.")
+        
+        if not missing:
+            print("✅ A history már tartalmazza a teljes art-ot, nincs új commit.")
+            return 0
+        
+        self._check_backend_cost(sum(missing.values()))
+        created = self.batch_committer.commit_dates(missing, existing)
+        print(f"⚡ {created} hiányzó commit létrehozva ({len(missing)} nap)")
+        return created
+    
+    def commit_journaled(self, date_counts: Dict[datetime.date, int],
+                         batch_commits: int = JOURNAL_BATCH_COMMITS) -> int:
+        """
+        Commit-olás a render naplóval: kötegenként tartós pont, így egy félbeszakadt
+        futás újraindítva a kész napokat kihagyja (lásd render_journal).
+        """
+        self._check_backend_cost(sum(date_counts.values()))
+        created = 0
+        for batch in self.journal.batches(self.start_journal(date_counts), batch_commits):
+            created += self.commit_journal_batch(batch)
+        self.journal.finish()
+        return created
+    
+    def _check_backend_cost(self, commits: int):
+        """Figyelmeztetés, ha a választott backend és tárolási mód a commit számhoz túl lassú."""
+        if self.backend == 'objects' and self.storage_mode == 'files' and commits >= LOOSE_FILES_WARN_COMMITS:
+            print(f"⚠️  {commits} commit objects backend-del, files tárolással: minden commit a teljes art_data "
+                  f"fát új loose objektumként írja (lassú, és több száz MB is lehet)")
+            print("💡 Nagy art-hoz: --backend pack (egyetlen deltázott packfile) vagy --storage log/empty")
+    
+    def start_journal(self, date_counts: Dict[datetime.date, int]) -> Dict[datetime.date, int]:
+        """A render napló megnyitása a tervhez; visszaadja a még hátralévő napokat."""
+        self.sync()
+        ref = self.batch_committer.branch_ref()
+        return self.journal.start(date_counts, ref, self.storage_mode, self.git_session.rev_parse('HEAD'))
+    
+    def commit_journal_batch(self, batch: Dict[datetime.date, int]) -> int:
+        """Egy napló köteg: bejegyzés, commit-ok, branch frissítés, majd a tartós pont rögzítése."""
+        self.journal.begin_batch(sorted(batch), self.git_session.rev_parse('HEAD'))
+        created = self.batch_committer.commit_dates(batch, sync=False)
+        self.journal.end_batch(self.batch_committer.sync())
+        return created
+    
+    def diff_canvas(self, canvas: Canvas, existing: Dict[datetime.date, int]
+                    ) -> Tuple[Dict[datetime.date, int], Dict[datetime.date, int]]:
+        """
+        Összeveti a cél canvas-t a meglévő napi commit számokkal.
+        
+        Returns:
+            Tuple: (hiányzó commit-ok naponként, fölösleges commit-ok naponként)
+        """
+        target = canvas.to_date_counts(self)
+        missing = {}
+        excess = {}
+        
+        for date in self.grid.dates:
+            wanted = target.get(date, 0)
+            have = existing.get(date, 0)
+            if wanted > have:
+                missing[date] = wanted - have
+            elif have > wanted:
+                excess[date] = have - wanted
+        
+        return missing, excess
+    
+    def get_daily_commit_counts(self, window_only: bool = True) -> Dict[datetime.date, int]:
+        """
+        Napi commit számok (szerző dátuma szerint) a jelenlegi HEAD-ig.
+        
+        Egyetlen streamelt `git log` futás, HEAD sha szerint memoizálva, így az
+        előnézet, a diff és a statisztika sem olvassa újra a history-t.
+        
+        Args:
+            window_only: Csak a grid ablakba eső napok
+        """
+        self.sync()
+        if not window_only:
+            return self.history_reader.daily_counts()
+        return self.history_reader.window_counts(self.grid.start_date, self.grid.end_date)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Batch mód: a blokkon belüli rajzolás egy canvas-ra kerül, a közvetlen
+        create_commit hívások összegyűlnek, majd a végén egyetlen
+        `git fast-import` futással jön létre minden commit.
+        
+        Példa:
+            with git_handler.batch():
+                git_handler.draw_pattern(pattern, 0, 0)
+        """
+        if self._pending_commits is not None:
+            # Beágyazott batch: a külső blokk végén írunk
+            yield self.canvas
+            return
+        
+        self._pending_commits = {}
+        try:
+            with self.drawing_to(self.new_canvas()) as canvas:
+                yield canvas
+                self.flush_batch()
+        finally:
+            self._pending_commits = None
+    
+    def flush_batch(self) -> int:
+        """Kiírja az összegyűjtött canvas-t és commit-okat, és visszaadja a számukat."""
+        pending = dict(self._pending_commits or {})
+        if self.canvas is not None:
+            for date, count in self.canvas.to_date_counts(self).items():
+                pending[date] = pending.get(date, 0) + count
+            self.canvas.clear()
+        if self._pending_commits is not None:
+            self._pending_commits = {}
+        
+        if not pending:
+            return 0
+        
+        self._check_backend_cost(sum(pending.values()))
+        created = self.batch_committer.commit_dates(pending)
+        print(f"⚡ {created} commit létrehozva egy lépésben ({self.backend} backend)")
+        return created
+    
+    def draw_pattern(self, pattern, start_week: int = 0, start_day: int = 0,
+                     intensity: Optional[int] = None):
+        """
+        Rajzol egy mintát a grid-re (vagy a csatolt canvas-ra, ha van).
+        
+        A cellaértékek intenzitás szintek (0-4); egy szint annyi commit-ot jelent
+        az adott napon, amennyit az intensity_commits tábla megad.
+        
+        Args:
+            pattern: A minta (lista vagy CompiledPattern)
+            start_week: Kezdő hét pozíció
+            start_day: Kezdő nap pozíció
+            intensity: Ha meg van adva, minden világító cella ezt a szintet kapja
+        """
+        if self.canvas is not None:
+            self.canvas.blit(pattern, start_week, start_day, intensity)
+            return
+        
+        for col_idx, row_idx, cell in as_compiled(pattern).offsets:
+            week = start_week + col_idx
+            day = start_day + row_idx
             
-            commit_message = f"Art commit for {date}"
-            subprocess.run(['git', 'commit', '-m', commit_message], 
-                         cwd=self.repo_path, env=env)
-    
-    def draw_pattern(self, pattern, start_week: int = 0, start_day: int = 0):
-        """Rajzol egy mintát a grid-re."""
-        for row_idx, row in enumerate(pattern):
-            for col_idx, cell in enumerate(row):
-                if cell == 1:  # Csak az 1-es értékekre rajzolunk
-                    week = start_week + col_idx
-                    day = start_day + row_idx
-                    
-                    # Ellenőrizzük, hogy a pozíció a grid-en belül van-e
-                    if 0 <= week < self.grid_width and 0 <= day < self.grid_height:
-                        date = self.grid_pos_to_date(week, day)
-                        self.create_commit(date, commits_count=1)
+            # Ellenőrizzük, hogy a pozíció a grid-en belül van-e
+            if 0 <= week < self.grid_width and 0 <= day < self.grid_height:
+                date = self.grid_pos_to_date(week, day)
+                self.create_commit(date, commits_count=self.commits_for_level(intensity or cell))
     
     def init_git_repo(self):
         """Inicializálja a Git repository-t."""
@@ -78,16 +321,12 @@ class GitHandler:
             print("ℹ️  Git repository már létezik.")
     
     def get_repository_stats(self):
-        """Visszaadja a repository statisztikáit."""
+        """Visszaadja a repository statisztikáit (összes commit, mai commit-ok)."""
         try:
-            result = subprocess.run(['git', 'rev-list', '--count', 'HEAD'], 
-                                  capture_output=True, text=True, cwd=self.repo_path)
-            total_commits = int(result.stdout.strip()) if result.returncode == 0 else 0
-            
-            result = subprocess.run(['git', 'log', '--oneline'], 
-                                  capture_output=True, text=True, cwd=self.repo_path)
-            commits_today = len([line for line in result.stdout.split('\n') 
-                               if datetime.date.today().strftime('%Y-%m-%d') in line])
+            self.sync()
+            counts = self.history_reader.daily_counts()
+            total_commits = sum(counts.values())
+            commits_today = counts.get(datetime.date.today(), 0)
             
             return total_commits, commits_today
         except:
@@ -103,22 +342,26 @@ class GitHandler:
         if os.path.exists(directory_path):
             shutil.rmtree(directory_path, onerror=handle_readonly_files)
     
-    def clean_repository(self):
-        """Helyi art adatok tisztítása (git repository megtartva)."""
+    def clean_repository(self, rewrite: bool = False):
+        """
+        Helyi art adatok tisztítása (git repository megtartva).
+        
+        Args:
+            rewrite: A branch history újraírása az art commit-ok nélkül (törlő commit helyett),
+                     így a régi art a contribution graph-ról is eltűnik
+        """
         try:
             # Csak az art_data mappa törlése, .git mappa megmarad
             art_data_dir = os.path.join(self.repo_path, 'art_data')
             self._remove_readonly_dir(art_data_dir)
             
-            # Art fájlok törlése a git index-ből is (ha vannak)
+            if rewrite:
+                return self._rewrite_history()
+            
+            # Art fájlok törlése a git index-ből is (ha vannak): egyetlen törlő commit
+            # a session fast-import folyamatán, majd index és working tree szinkron
             try:
-                # Ellenőrizzük van-e art_data mappa a git-ben
-                result = subprocess.run(['git', 'ls-files', 'art_data/'], 
-                                      capture_output=True, text=True, cwd=self.repo_path)
-                if result.returncode == 0 and result.stdout.strip():
-                    # Van art_data fájl a git-ben, távolítsuk el
-                    subprocess.run(['git', 'rm', '-rf', 'art_data/'], cwd=self.repo_path)
-                    subprocess.run(['git', 'commit', '-m', 'Törölve art adatok'], cwd=self.repo_path)
+                if self.batch_committer.commit_removal('art_data', 'Törölve art adatok'):
                     print("🔄 Art commit-ok eltávolítva a git history-ból")
             except Exception as git_error:
                 print(f"⚠️  Git fájl törlés sikertelen: {git_error}")
@@ -127,4 +370,25 @@ class GitHandler:
             return True
         except Exception as e:
             print(f"❌ Hiba az art adatok törlésekor: {e}")
-            return False 
\ No newline at end of file
+            return False
+    
+    def _rewrite_history(self) -> bool:
+        """Az art commit-ok eltávolítása a branch history-jából (fast-export | szűrő | fast-import)."""
+        self.sync()
+        rewriter = HistoryRewriter(self.repo_path, self.instrumentation, self.git_session)
+        result = rewriter.rewrite()
+        if result is None:
+            print("✅ A history nem tartalmaz art commit-ot, nincs mit újraírni.")
+            return True
+        
+        old_head, new_head = result
+        branch = self.git_session.current_ref() or ''
+        branch = branch[len('refs/heads/'):] if branch.startswith('refs/heads/') else branch
+        print(f"🔄 History újraírva: {rewriter.dropped} art commit eltávolítva, {rewriter.kept} commit megmaradt")
+        if new_head is None:
+            print("⚠️  A branch csak art commit-okból állt, ezért törölve lett")
+        print(f"💾 Az eredeti history mentése: {BACKUP_REF_PREFIX}{branch} ({old_head[:12]})")
+        print(f"💡 Visszaállítás: git reset --hard {BACKUP_REF_PREFIX}{branch}")
+        print(f"💡 GitHub-ra force push kell: git push --force-with-lease origin {branch}")
+        print("✅ Art adatok sikeresen törölve!")
+        return True
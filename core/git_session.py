@@ -0,0 +1,258 @@
+import os
+import subprocess
+import tempfile
+from typing import Dict, Optional, Tuple
+from .instrumentation import Instrumentation
+
+
+class GitSession:
+    """
+    Hosszú életű git folyamatok pipe-okon keresztül, hogy ne kelljen
+    műveletenként új git folyamatot indítani.
+
+    - olvasás: `git cat-file --batch` (ref feloldás, objektumok, fák)
+    - írás: `git fast-import` (blob-ok, fák és commit-ok egyetlen folyamatban;
+      a `get-mark` válaszok a --cat-blob-fd pipe-on jönnek vissza)
+
+    Mindkét folyamat lustán, az első használatkor indul, és a close()
+    (vagy a with blokk vége) állítja le.
+    """
+
+    def __init__(self, repo_path: str = ".", instrumentation: Optional[Instrumentation] = None):
+        self.repo_path = repo_path
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self._git_dir: Optional[str] = None
+        self._identity: Optional[str] = None
+        self._reader: Optional[subprocess.Popen] = None
+        self._writer: Optional[subprocess.Popen] = None
+        self._writer_responses = None
+        self._writer_errors = None
+        self._next_mark = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- Egyszeri lekérdezések -------------------------------------------------
+
+    def git_dir(self) -> str:
+        """A .git könyvtár abszolút útvonala (egyszer kérdezzük le)."""
+        if self._git_dir is None:
+            result = subprocess.run(['git', 'rev-parse', '--absolute-git-dir'],
+                                    capture_output=True, text=True, cwd=self.repo_path)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or "Nem git repository")
+            self._git_dir = result.stdout.strip()
+        return self._git_dir
+
+    def identity(self) -> str:
+        """Commit szerző azonosító (név és e-mail) a git beállításaiból."""
+        if self._identity is None:
+            result = subprocess.run(['git', 'var', 'GIT_AUTHOR_IDENT'],
+                                    capture_output=True, text=True, cwd=self.repo_path)
+            ident = result.stdout.strip() if result.returncode == 0 else ''
+            if '>' in ident:
+                self._identity = ident[:ident.rindex('>') + 1]
+            else:
+                self._identity = 'Push Picasso <push-picasso@localhost>'
+        return self._identity
+
+    def current_ref(self) -> Optional[str]:
+        """Az aktuális branch ref neve a HEAD fájlból (git folyamat nélkül); detached HEAD esetén None."""
+        with open(os.path.join(self.git_dir(), 'HEAD'), 'r', encoding='utf-8') as f:
+            head = f.read().strip()
+        if head.startswith('ref: '):
+            return head[5:]
+        return None
+
+    # --- Olvasás: git cat-file --batch ---------------------------------------------
+
+    def _start_reader(self) -> subprocess.Popen:
+        if self._reader is None or self._reader.poll() is not None:
+            self._reader = subprocess.Popen(['git', 'cat-file', '--batch'],
+                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            stderr=subprocess.DEVNULL, cwd=self.repo_path)
+        return self._reader
+
+    def read_object(self, name: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        Beolvas egy objektumot (sha, ref vagy `fa:útvonal` formában).
+
+        Returns:
+            (sha, típus, tartalom), vagy None ha nem létezik
+        """
+        with self.instrumentation.phase('cat_file'):
+            reader = self._start_reader()
+            try:
+                reader.stdin.write(name.encode('utf-8') + b'\n')
+                reader.stdin.flush()
+            except BrokenPipeError:
+                # A cat-file nem indult el (pl. még nincs git repository)
+                self._reader = None
+                return None
+
+            header = reader.stdout.readline().rstrip(b'\n').split(b' ')
+            if len(header) != 3:
+                # "<név> missing" vagy "<név> ambiguous"
+                return None
+
+            sha, obj_type, size = header[0].decode('ascii'), header[1].decode('ascii'), int(header[2])
+            data = reader.stdout.read(size + 1)[:-1]
+            return sha, obj_type, data
+
+    def rev_parse(self, name: str) -> Optional[str]:
+        """Egy név (pl. HEAD) feloldása commit sha-vá; None, ha nem létezik."""
+        obj = self.read_object(f"{name}^{{commit}}")
+        return obj[0] if obj else None
+
+    def path_exists(self, treeish: str, path: str) -> bool:
+        """Létezik-e az útvonal a megadott commit/fa alatt."""
+        return self.read_object(f"{treeish}:{path}") is not None
+
+    def read_tree(self, treeish: str) -> Dict[str, Tuple[str, str]]:
+        """Egy fa bejegyzései: név -> (mód, sha)."""
+        obj = self.read_object(f"{treeish}^{{tree}}")
+        entries: Dict[str, Tuple[str, str]] = {}
+        if obj is None:
+            return entries
+
+        data = obj[2]
+        pos = 0
+        while pos < len(data):
+            space = data.index(b' ', pos)
+            nul = data.index(b'\0', space)
+            mode = data[pos:space].decode('ascii')
+            name = data[space + 1:nul].decode('utf-8', 'surrogateescape')
+            entries[name] = (mode, data[nul + 1:nul + 21].hex())
+            pos = nul + 21
+        return entries
+
+    # --- Írás: git fast-import ---------------------------------------------------
+
+    def _start_writer(self) -> subprocess.Popen:
+        if self._writer is not None:
+            if self._writer.poll() is None:
+                return self._writer
+            self._fail_writer()
+
+        response_read, response_write = os.pipe()
+        self._writer_errors = tempfile.TemporaryFile()
+        try:
+            self._writer = subprocess.Popen(
+                ['git', 'fast-import', '--quiet', '--done', f'--cat-blob-fd={response_write}'],
+                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._writer_errors,
+                pass_fds=(response_write,), cwd=self.repo_path
+            )
+        finally:
+            os.close(response_write)
+        self._writer_responses = os.fdopen(response_read, 'rb')
+        self._writer.stdin.write(b'feature done\n')
+        return self._writer
+
+    def _fail_writer(self, reason: Optional[str] = None):
+        """
+        A fast-import hibával leállt (vagy hibás állapotba került): a folyamatot
+        leállítjuk, és a hibaüzenetét kivételként adjuk tovább.
+        """
+        if self._writer is not None:
+            if self._writer.poll() is None:
+                self._writer.kill()
+                self._writer.wait()
+            try:
+                self._writer.stdin.close()
+            except OSError:
+                pass
+        message = ''
+        if self._writer_errors is not None:
+            self._writer_errors.seek(0)
+            message = self._writer_errors.read().decode('utf-8', 'replace').strip()
+        self._reset_writer()
+        if reason:
+            message = f"{reason}: {message}" if message else reason
+        raise RuntimeError(message or "A git fast-import váratlanul leállt")
+
+    def _reset_writer(self):
+        for stream in (self._writer_responses, self._writer_errors):
+            if stream is not None:
+                stream.close()
+        self._writer = None
+        self._writer_responses = None
+        self._writer_errors = None
+
+    def write(self, payload: bytes):
+        """Nyers fast-import parancsok küldése."""
+        writer = self._start_writer()
+        try:
+            writer.stdin.write(payload)
+        except BrokenPipeError:
+            self._fail_writer()
+
+    def allocate_marks(self, count: int) -> int:
+        """Lefoglal `count` egymást követő mark-ot, és visszaadja az elsőt."""
+        first = self._next_mark
+        self._next_mark += count
+        return first
+
+    def get_mark(self, mark: int) -> str:
+        """
+        Egy mark sha-jának lekérdezése. Mivel a fast-import sorban dolgozza fel
+        a parancsokat, a válasz egyben azt is jelenti, hogy minden korábbi
+        parancs (pl. checkpoint) lefutott.
+        """
+        writer = self._start_writer()
+        try:
+            writer.stdin.write(b'get-mark :%d\n' % mark)
+            writer.stdin.flush()
+        except BrokenPipeError:
+            self._fail_writer()
+
+        line = self._writer_responses.readline()
+        if not line:
+            self._fail_writer()
+        return line.strip().decode('ascii')
+
+    def checkpoint(self, last_mark: Optional[int] = None, ref: Optional[str] = None) -> Optional[str]:
+        """
+        A pack kiírása és a ref-ek frissítése a lemezen. Ha last_mark meg van
+        adva, megvárja a befejezést, és visszaadja a mark sha-ját.
+
+        A fast-import az elutasított ref frissítést (pl. "Not updating ...")
+        csak figyelmeztetésként írja ki, és csak a kilépési kódjában jelzi;
+        ezért ha a ref is meg van adva, a cat-file folyamattal visszaolvassuk,
+        és hibát adunk, ha nem a mark commit-jára mutat.
+        """
+        with self.instrumentation.phase('checkpoint'):
+            self.write(b'checkpoint\n\n')
+            if last_mark is None:
+                self._writer.stdin.flush()
+                return None
+            head = self.get_mark(last_mark)
+            if ref is not None and self.rev_parse(ref) != head:
+                self._fail_writer(f"A git fast-import nem frissítette a {ref} ref-et")
+            return head
+
+    # --- Leállítás ---------------------------------------------------------------
+
+    def close(self):
+        """A folyamatok leállítása (a fast-import a `done` paranccsal zárja a streamet)."""
+        if self._writer is not None:
+            writer = self._writer
+            try:
+                writer.stdin.write(b'done\n')
+                writer.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = writer.wait()
+            if returncode != 0:
+                self._fail_writer()
+            self._reset_writer()
+
+        if self._reader is not None:
+            try:
+                self._reader.stdin.close()
+            except BrokenPipeError:
+                pass
+            self._reader.wait()
+            self._reader = None
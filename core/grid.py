@@ -0,0 +1,139 @@
+import datetime
+from itertools import compress
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Az alapértelmezett (eredeti) ablak: 53 hét 2024-06-16 vasárnaptól
+DEFAULT_START_DATE = datetime.date(2024, 6, 16)
+DEFAULT_WEEKS = 53
+DAYS_PER_WEEK = 7  # 0=vasárnap, 6=szombat
+
+
+class Grid:
+    """
+    A contribution graph naptári rácsa: hetek × napok egy tetszőleges dátum ablakra
+    (egy év, több év egymás mellett, vagy bármilyen tartomány).
+
+    A cellák dátumai egyszer, előre kiszámolt táblában vannak; az index ugyanaz,
+    mint a Canvas oszlopfolytonos indexe (hét * 7 + nap), így a teljes canvas
+    egyetlen lépésben képezhető le dátumokra, pixelenkénti dátum aritmetika nélkül.
+    """
+
+    def __init__(self, start_date: datetime.date = DEFAULT_START_DATE, weeks: int = DEFAULT_WEEKS):
+        """
+        Args:
+            start_date: Az első hét bármely napja (a vasárnapra igazítjuk, ahogy a GitHub)
+            weeks: A hetek (oszlopok) száma
+        """
+        if weeks < 1:
+            raise ValueError("A grid legalább egy hét széles kell legyen")
+        self.start_date = self.week_start(start_date)
+        self.width = weeks
+        self.height = DAYS_PER_WEEK
+        day = datetime.timedelta(days=1)
+        dates = [self.start_date]
+        for _ in range(weeks * DAYS_PER_WEEK - 1):
+            dates.append(dates[-1] + day)
+        self.dates: Tuple[datetime.date, ...] = tuple(dates)
+        self.end_date = self.dates[-1]
+
+    def __repr__(self) -> str:
+        return f"Grid({self.start_date} - {self.end_date}, {self.width} hét)"
+
+    @staticmethod
+    def week_start(date: datetime.date) -> datetime.date:
+        """A megadott napon vagy előtte lévő vasárnap."""
+        return date - datetime.timedelta(days=(date.weekday() + 1) % 7)
+
+    @classmethod
+    def for_range(cls, start_date: datetime.date, end_date: datetime.date) -> 'Grid':
+        """Grid, ami a [start_date, end_date] napokat teljes hetekkel lefedi."""
+        if end_date < start_date:
+            raise ValueError(f"Az ablak vége ({end_date}) a kezdete ({start_date}) előtt van")
+        start = cls.week_start(start_date)
+        return cls(start, (end_date - start).days // DAYS_PER_WEEK + 1)
+
+    @classmethod
+    def for_years(cls, first_year: int, last_year: Optional[int] = None) -> 'Grid':
+        """Egy vagy több egymást követő év contribution graph-ja egymás mellett."""
+        last_year = first_year if last_year is None else last_year
+        if last_year < first_year:
+            raise ValueError(f"Hibás év tartomány: {first_year}-{last_year}")
+        return cls.for_range(datetime.date(first_year, 1, 1), datetime.date(last_year, 12, 31))
+
+    @classmethod
+    def from_options(cls, year: Optional[int] = None, years: Optional[str] = None,
+                     start: Optional[str] = None, end: Optional[str] = None) -> Optional['Grid']:
+        """
+        Grid a parancssori / job fájl beállításokból; None, ha egyik sincs megadva
+        (ilyenkor az alapértelmezett ablak marad).
+
+        Args:
+            year: Egy év, pl. 2025
+            years: Év tartomány, pl. "2023-2025" (vagy egyetlen év)
+            start, end: ISO dátumok (YYYY-MM-DD); end nélkül 53 hét a start-tól
+        """
+        if years:
+            first, _, last = str(years).partition('-')
+            return cls.for_years(int(first), int(last) if last else None)
+        if year is not None:
+            return cls.for_years(int(year))
+        if start:
+            start_date = datetime.date.fromisoformat(str(start))
+            if end:
+                return cls.for_range(start_date, datetime.date.fromisoformat(str(end)))
+            return cls(start_date)
+        if end:
+            raise ValueError("Az ablak végéhez (end) kezdő dátum (start) is kell")
+        return None
+
+    def contains(self, date: datetime.date) -> bool:
+        """A dátum a grid ablakába esik-e."""
+        return self.start_date <= date <= self.end_date
+
+    def date_at(self, week: int, day: int) -> datetime.date:
+        """Grid pozíció -> dátum (a táblából; a rácson kívül számolva)."""
+        index = week * DAYS_PER_WEEK + day
+        if 0 <= index < len(self.dates) and 0 <= day < DAYS_PER_WEEK:
+            return self.dates[index]
+        return self.start_date + datetime.timedelta(days=index)
+
+    def position_of(self, date: datetime.date) -> Tuple[int, int]:
+        """Dátum -> (hét, nap) pozíció."""
+        return divmod((date - self.start_date).days, DAYS_PER_WEEK)
+
+    def week_dates(self, day: int = 0) -> Sequence[datetime.date]:
+        """Minden hét adott napja (pl. a hónap fejléchez), szeletként a táblából."""
+        return self.dates[day::DAYS_PER_WEEK]
+
+    def year_starts(self) -> List[Tuple[int, int]]:
+        """(hét, év) párok: az egyes évek első hete (a grid elejét is beleértve)."""
+        starts = []
+        last_year = None
+        for week, date in enumerate(self.week_dates(DAYS_PER_WEEK - 1)):
+            if date.year != last_year:
+                starts.append((week, date.year))
+                last_year = date.year
+        return starts
+
+    def date_counts(self, cells: Sequence[int], commits: Sequence[int]) -> Dict[datetime.date, int]:
+        """
+        Canvas cellák (index = hét * 7 + nap) -> {dátum: commit szám} egy lépésben.
+
+        A szint -> commit szám leképezés bytes.translate-tel, a nem üres napok
+        kiválasztása itertools.compress-szel történik, Python szintű ciklus nélkül.
+
+        Args:
+            cells: Intenzitás szintek (bytearray)
+            commits: Szint -> napi commit szám tábla
+        """
+        if len(cells) > len(self.dates):
+            raise ValueError("A canvas nagyobb, mint a grid")
+
+        top = len(commits) - 1
+        if max(commits) < 256 and isinstance(cells, (bytes, bytearray)):
+            # Az üres cella sosem kap commit-ot, akármi is a tábla 0. eleme
+            table = bytes(commits[min(level, top)] if level else 0 for level in range(256))
+            counts = cells.translate(table)
+        else:
+            counts = [commits[min(level, top)] if level else 0 for level in cells]
+        return dict(compress(zip(self.dates, counts), counts))
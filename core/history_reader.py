@@ -0,0 +1,63 @@
+import subprocess
+import datetime
+from typing import Dict, Optional
+from .git_session import GitSession
+from .instrumentation import Instrumentation
+
+
+class HistoryReader:
+    """Napi commit hisztogram olvasása egyetlen streamelt `git log` futással, HEAD sha szerint memoizálva."""
+
+    def __init__(self, repo_path: str = ".", instrumentation: Optional[Instrumentation] = None,
+                 session: Optional[GitSession] = None):
+        self.repo_path = repo_path
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self.session = session or GitSession(repo_path, self.instrumentation)
+        self._cache_head: Optional[str] = None
+        self._cache_counts: Dict[datetime.date, int] = {}
+
+    def head_sha(self) -> Optional[str]:
+        """A jelenlegi HEAD commit sha-ja (üres repository esetén None), a session cat-file folyamatán."""
+        return self.session.rev_parse('HEAD')
+
+    def _scan(self) -> Dict[datetime.date, int]:
+        """A teljes history végigolvasása soronként, a kimenet pufferelése nélkül."""
+        counts: Dict[datetime.date, int] = {}
+        process = subprocess.Popen(['git', 'log', '--format=%ad', '--date=short', 'HEAD'],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   cwd=self.repo_path)
+        try:
+            for line in process.stdout:
+                key = line.strip()
+                if key:
+                    # A dátum szövegét csak egyszer alakítjuk date objektummá
+                    counts[key] = counts.get(key, 0) + 1
+        finally:
+            process.stdout.close()
+            process.wait()
+
+        return {datetime.date.fromisoformat(key.decode('ascii')): count
+                for key, count in counts.items()}
+
+    def daily_counts(self) -> Dict[datetime.date, int]:
+        """Dátum -> commit szám a teljes history-ra (szerző dátuma szerint)."""
+        head = self.head_sha()
+        if head is None:
+            self._cache_head = None
+            self._cache_counts = {}
+            return {}
+
+        if head != self._cache_head:
+            with self.instrumentation.phase('history_scan'):
+                self._cache_counts = self._scan()
+            self._cache_head = head
+        return self._cache_counts
+
+    def window_counts(self, start_date: datetime.date, end_date: datetime.date) -> Dict[datetime.date, int]:
+        """Dátum -> commit szám a megadott (zárt) dátum intervallumra."""
+        return {date: count for date, count in self.daily_counts().items()
+                if start_date <= date <= end_date}
+
+    def total_commits(self) -> int:
+        """Az összes commit száma a HEAD-ig."""
+        return sum(self.daily_counts().values())
@@ -0,0 +1,248 @@
+import subprocess
+import tempfile
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from .git_session import GitSession
+from .instrumentation import Instrumentation
+
+ART_DIR = b'art_data'
+ART_MESSAGE_PREFIX = b'Art commit for '  # Az üres (storage=empty) art commit-ok üzenete
+EMPTY_TREE = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+REWRITE_REF = 'refs/push-picasso/rewrite'  # Átmeneti ref az újraírt history-nak
+BACKUP_REF_PREFIX = 'refs/push-picasso/backup/'  # Az eredeti branch csúcs mentése
+
+# Fájl műveletek és a commit-on belül előforduló parancsok a fast-export streamben
+FILE_COMMANDS = (b'M ', b'D ', b'C ', b'R ', b'deleteall')
+
+
+class _Stream:
+    """Soronkénti olvasó egy sor visszatételi lehetőséggel."""
+
+    def __init__(self, source: BinaryIO):
+        self.source = source
+        self._pushed: Optional[bytes] = None
+
+    def readline(self) -> bytes:
+        if self._pushed is not None:
+            line, self._pushed = self._pushed, None
+            return line
+        return self.source.readline()
+
+    def unread(self, line: bytes):
+        self._pushed = line
+
+    def read(self, size: int) -> bytes:
+        return self.source.read(size)
+
+
+class HistoryRewriter:
+    """
+    Az art commit-ok végleges eltávolítása a branch history-jából, egyetlen
+    streamelt menetben: `git fast-export | szűrő | git fast-import`.
+
+    Kimarad minden commit, ami csak az art_data/ alatti útvonalakat érinti
+    (files és log tárolás, illetve a korábbi "Törölve art adatok" commit), és
+    minden üres "Art commit for ..." commit (empty tárolás). A megmaradó
+    commit-okból az art_data/ műveletek törlődnek, a kimaradók mark-jai a
+    legközelebbi megmaradt ősre képződnek le. Merge commit sosem marad ki.
+
+    A fast-export --no-data módban fut, így a blob-ok nem mennek át a pipe-on:
+    az újraírás a commit-ok számával arányos, több ezer art commit-nál is gyors.
+    Az új history egy átmeneti ref-re épül, a branch csak a végén, egyetlen
+    ellenőrzött `update-ref`-fel vált át; az eredeti csúcs a backup ref-ben marad.
+    """
+
+    def __init__(self, repo_path: str = ".", instrumentation: Optional[Instrumentation] = None,
+                 session: Optional[GitSession] = None):
+        self.repo_path = repo_path
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self.session = session or GitSession(repo_path, self.instrumentation)
+        self.kept = 0
+        self.dropped = 0
+
+    @staticmethod
+    def _is_art_path(path: bytes) -> bool:
+        if path.startswith(b'"'):
+            path = path[1:]
+        return path == ART_DIR or path.startswith(ART_DIR + b'/') or path == ART_DIR + b'"'
+
+    @classmethod
+    def _is_art_operation(cls, line: bytes) -> bool:
+        """Csak az art_data/ alatti útvonalat érintő M vagy D művelet."""
+        if line.startswith(b'M '):
+            return cls._is_art_path(line.rstrip(b'\n').split(b' ', 3)[3])
+        if line.startswith(b'D '):
+            return cls._is_art_path(line[2:].rstrip(b'\n'))
+        return False
+
+    def _git(self, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(['git'] + list(args), capture_output=True, text=True, cwd=self.repo_path)
+
+    def rewrite(self, ref: Optional[str] = None) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        A branch újraírása az art commit-ok nélkül.
+
+        Args:
+            ref: A branch (None esetén az aktuális)
+
+        Returns:
+            (régi csúcs, új csúcs), vagy None ha nem volt mit eltávolítani;
+            az új csúcs None, ha a branch csak art commit-okból állt
+        """
+        ref = ref or self.session.current_ref()
+        if ref is None:
+            raise RuntimeError("Detached HEAD: az újraíráshoz egy branch-en kell állni")
+        old_head = self.session.rev_parse(ref)
+        if old_head is None:
+            return None
+
+        self._git('update-ref', '-d', REWRITE_REF)
+        with self.instrumentation.phase('history_rewrite'), tempfile.TemporaryFile() as export_errors, \
+                tempfile.TemporaryFile() as import_errors:
+            exporter = subprocess.Popen(
+                ['git', 'fast-export', '--no-data', '--signed-tags=strip', '--reencode=no', ref],
+                stdout=subprocess.PIPE, stderr=export_errors, cwd=self.repo_path)
+            importer = subprocess.Popen(['git', 'fast-import', '--quiet'],
+                                        stdin=subprocess.PIPE, stderr=import_errors, cwd=self.repo_path)
+            tip = None
+            try:
+                tip = self._filter(_Stream(exporter.stdout), importer.stdin)
+                if tip is not None:
+                    importer.stdin.write(b'reset %s\nfrom %s\n\n' % (REWRITE_REF.encode(), tip))
+                importer.stdin.close()
+            except BrokenPipeError:
+                # A fast-import leállt: a hibaüzenete lent jelenik meg
+                pass
+            finally:
+                exporter.stdout.close()
+            exported, imported = exporter.wait(), importer.wait()
+            for returncode, errors, command in ((exported, export_errors, 'fast-export'),
+                                                (imported, import_errors, 'fast-import')):
+                if returncode != 0:
+                    errors.seek(0)
+                    message = errors.read().decode('utf-8', 'replace').strip()
+                    self._git('update-ref', '-d', REWRITE_REF)
+                    raise RuntimeError(message or f"A git {command} sikertelen")
+
+        if not self.dropped:
+            self._git('update-ref', '-d', REWRITE_REF)
+            return None
+
+        new_head = self.session.rev_parse(REWRITE_REF) if tip is not None else None
+        branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else ref
+        self._git('update-ref', '-m', 'push-picasso: art history backup', BACKUP_REF_PREFIX + branch, old_head)
+        # A branch csak akkor vált, ha közben senki nem mozdította el
+        if new_head is not None:
+            result = self._git('update-ref', '-m', 'push-picasso: art commit-ok eltávolítva',
+                               ref, new_head, old_head)
+        else:
+            result = self._git('update-ref', '-d', ref, old_head)
+        self._git('update-ref', '-d', REWRITE_REF)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"A {ref} frissítése sikertelen")
+
+        if ref == self.session.current_ref():
+            # Index és working tree: az art_data/ fájlok eltűnnek, a többi változatlan
+            with self.instrumentation.phase('worktree_sync'):
+                self._git('read-tree', '-m', '-u', old_head, new_head or EMPTY_TREE)
+        return old_head, new_head
+
+    def _filter(self, stream: _Stream, sink: BinaryIO) -> Optional[bytes]:
+        """
+        A fast-export stream szűrése. Visszaadja az újraírt branch csúcsának
+        dataref-jét (mark vagy sha), vagy None-t, ha semmi sem maradt.
+        """
+        temp_ref = REWRITE_REF.encode()
+        alias: Dict[bytes, Optional[bytes]] = {}  # kimaradt commit mark -> megmaradt ős
+        tip: Optional[bytes] = None
+
+        def resolve(dataref: bytes) -> Optional[bytes]:
+            return alias[dataref] if dataref in alias else dataref
+
+        while True:
+            line = stream.readline()
+            if not line:
+                return tip
+
+            if line.startswith(b'reset '):
+                # A branch állapot beállítása; a célja a kimaradt commit-ok ősére képződik
+                follow = stream.readline()
+                target = None
+                if follow.startswith(b'from '):
+                    target = resolve(follow[5:].strip())
+                elif follow:
+                    stream.unread(follow)
+                sink.write(b'reset %s\n' % temp_ref)
+                if target is not None:
+                    sink.write(b'from %s\n' % target)
+                sink.write(b'\n')
+                tip = target
+                continue
+
+            if not line.startswith(b'commit '):
+                # feature, progress stb. változatlanul; az üres sorok elhagyhatók
+                if line.strip():
+                    sink.write(line)
+                continue
+
+            # Fejléc (mark, author, committer, encoding...) a data parancsig
+            header: List[bytes] = []
+            mark = None
+            line = stream.readline()
+            while line and not line.startswith(b'data '):
+                if line.startswith(b'mark '):
+                    mark = line[5:].strip()
+                header.append(line)
+                line = stream.readline()
+            message = stream.read(int(line[5:]))
+
+            parents: List[Optional[bytes]] = []
+            operations: List[bytes] = []
+            art_operations = 0
+            line = stream.readline()
+            if line == b'\n' and not message.endswith(b'\n'):
+                # A data utáni opcionális LF
+                line = stream.readline()
+            while line and line != b'\n':
+                if line.startswith(b'from ') or line.startswith(b'merge '):
+                    parents.append(resolve(line.split(b' ', 1)[1].strip()))
+                elif line.startswith(FILE_COMMANDS):
+                    if self._is_art_operation(line):
+                        art_operations += 1
+                    else:
+                        operations.append(line)
+                else:
+                    stream.unread(line)
+                    break
+                line = stream.readline()
+
+            merge = len(parents) > 1
+            only_art = art_operations and not operations
+            empty_art = not art_operations and not operations and message.startswith(ART_MESSAGE_PREFIX)
+            if not merge and (only_art or empty_art):
+                self.dropped += 1
+                if mark is not None:
+                    alias[mark] = parents[0] if parents else None
+                tip = parents[0] if parents else None
+                continue
+
+            self.kept += 1
+            # A megmaradt szülők, duplikátumok és a gyökérig kimaradt ágak nélkül
+            kept_parents: List[bytes] = []
+            for parent in parents:
+                if parent is not None and parent not in kept_parents:
+                    kept_parents.append(parent)
+            chunks = []
+            if not kept_parents:
+                # Új gyökér: a branch állapotot törölni kell, különben az előző commit-ra épülne
+                chunks.append(b'reset %s\n\n' % temp_ref)
+            chunks.append(b'commit %s\n' % temp_ref)
+            chunks.extend(header)
+            chunks.append(b'data %d\n' % len(message))
+            chunks.append(message)
+            if kept_parents:
+                chunks.append(b'from %s\n' % kept_parents[0])
+                chunks.extend(b'merge %s\n' % parent for parent in kept_parents[1:])
+            chunks.extend(operations)
+            chunks.append(b'\n')
+            sink.write(b''.join(chunks))
+            tip = mark
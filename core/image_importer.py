@@ -0,0 +1,440 @@
+import os
+import re
+import struct
+import zlib
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+from patterns import CompiledPattern, ShapePatterns, as_compiled
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+GRID_ROWS = 7  # A contribution graph napjai
+LEVELS = 5  # Intenzitás szintek: 0 = nincs commit, 1-4 = egyre sötétebb
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}  # Színtípus -> csatornák száma
+BAND_CELLS = 1 << 23  # A NumPy-os Average/Paeth visszafejtés ferdített sávjának legnagyobb mérete (cella)
+WAVEFRONT_STEP_BYTES = 250  # Ennyi bájtot fejt vissza a tiszta Python egy hullámfront lépés ideje alatt
+
+# Egy betöltött kép: szélesség, magasság és soronként a "tinta" (0 = fehér/átlátszó, 255 = fekete)
+Image = Tuple[int, int, Sequence[int]]
+
+
+class ImageImporter:
+    """
+    PNG/PGM kép importálása alakzatként: a kép 7 sor x N hét méretre
+    kicsinyítve (terület-átlagolással), és az 5 contribution szintre
+    kvantálva, opcionális Floyd–Steinberg ditheringgel.
+
+    A dekódolás külső képkönyvtár nélkül fut (zlib); NumPy-jal a PNG szűrők
+    visszafejtése (az Average/Paeth is, átlós hullámfronttal) vektorizált. A
+    kicsinyítés integrál képpel (összegzett terület táblával) dolgozik:
+    NumPy-jal egyetlen vektorizált lépésben, nélküle soronkénti
+    itertools.accumulate prefix összegekkel. A dithering már a cél méreten
+    (7 x N cella) fut, így a forráskép méretétől független.
+    """
+
+    def __init__(self, dither: bool = False, invert: bool = False, use_numpy: Optional[bool] = None):
+        """
+        Args:
+            dither: Floyd–Steinberg dithering a kvantálásnál
+            invert: Világos rajz sötét háttéren (a világos pixelek lesznek a commit-ok)
+            use_numpy: NumPy használata (None esetén ha telepítve van)
+        """
+        if use_numpy and numpy is None:
+            raise RuntimeError("A NumPy-os kicsinyítéshez telepítsd a numpy csomagot (pip install numpy)")
+        self.dither = dither
+        self.invert = invert
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+
+    def load(self, path: str) -> Image:
+        """Kép betöltése a fájl tartalma alapján (PNG vagy PGM)."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data.startswith(PNG_SIGNATURE):
+            width, height, ink = self.decode_png(data)
+        elif data[:2] in (b'P2', b'P5'):
+            width, height, ink = self.decode_pgm(data)
+        else:
+            raise ValueError(f"Nem támogatott képformátum: {path} (PNG vagy PGM kell)")
+        if self.invert:
+            ink = bytes(255 - value for value in ink)
+        return width, height, ink
+
+    @staticmethod
+    def decode_pgm(data: bytes) -> Image:
+        """P5 (bináris) és P2 (szöveges) PGM, 8 és 16 bites mintákkal."""
+        # A fejléc négy mezője (típus, szélesség, magasság, maxval), közöttük megjegyzések lehetnek
+        fields = []
+        position = 0
+        header = re.compile(rb'\s*(?:#[^\n]*\n\s*)*(\S+)')
+        while len(fields) < 4:
+            match = header.match(data, position)
+            if match is None:
+                raise ValueError("Hibás PGM fejléc")
+            fields.append(match.group(1))
+            position = match.end()
+        try:
+            width, height, maxval = int(fields[1]), int(fields[2]), int(fields[3])
+        except ValueError:
+            raise ValueError("Hibás PGM fejléc")
+        if width <= 0 or height <= 0 or not 0 < maxval < 65536:
+            raise ValueError(f"Hibás PGM méret: {width}x{height}, maxval {maxval}")
+
+        count = width * height
+        if fields[0] == b'P2':
+            samples = [int(value) for value in data[position:].split()[:count]]
+        elif maxval < 256:
+            samples = data[position + 1:position + 1 + count]
+        else:
+            raw = data[position + 1:position + 1 + 2 * count]
+            samples = struct.unpack(f'>{len(raw) // 2}H', raw)
+        if len(samples) < count:
+            raise ValueError("Csonka PGM fájl")
+        if maxval == 255:
+            return width, height, bytes(255 - value for value in samples)
+        return width, height, bytes(255 - min(value, maxval) * 255 // maxval for value in samples)
+
+    def decode_png(self, data: bytes) -> Image:
+        """
+        Nem interlace-elt PNG, minden színtípussal (szürke, RGB, paletta, alfával
+        is) és bitmélységgel. Az átlátszó pixelek fehér háttérre keverednek.
+        """
+        position = len(PNG_SIGNATURE)
+        header = None
+        palette = b''
+        transparency = b''
+        chunks = []
+        while position + 8 <= len(data):
+            length, kind = struct.unpack('>I4s', data[position:position + 8])
+            body = data[position + 8:position + 8 + length]
+            crc = data[position + 8 + length:position + 12 + length]
+            if len(body) < length or len(crc) < 4 or zlib.crc32(kind + body) != struct.unpack('>I', crc)[0]:
+                raise ValueError(f"Sérült PNG chunk: {kind.decode('latin-1')}")
+            position += 12 + length
+            if kind == b'IHDR':
+                header = struct.unpack('>IIBBBBB', body)
+            elif kind == b'PLTE':
+                palette = body
+            elif kind == b'tRNS':
+                transparency = body
+            elif kind == b'IDAT':
+                chunks.append(body)
+            elif kind == b'IEND':
+                break
+        if header is None or not chunks:
+            raise ValueError("Hibás PNG: hiányzó IHDR vagy IDAT")
+
+        width, height, depth, color_type, _, _, interlace = header
+        if color_type not in PNG_CHANNELS or depth not in (1, 2, 4, 8, 16):
+            raise ValueError(f"Nem támogatott PNG: színtípus {color_type}, {depth} bit")
+        if interlace:
+            raise ValueError("Az interlace-elt PNG nem támogatott (mentsd el interlace nélkül)")
+        channels = PNG_CHANNELS[color_type]
+        stride = (width * channels * depth + 7) // 8
+        pixel_bytes = max(1, channels * depth // 8)
+        raw = zlib.decompress(b''.join(chunks))
+        if len(raw) < (stride + 1) * height:
+            raise ValueError("Csonka PNG képadat")
+
+        if self.use_numpy:
+            pixels = self._unfilter_numpy(raw, height, stride, pixel_bytes)
+            if depth >= 8 and color_type != 3:
+                return width, height, self._ink_numpy(pixels, width, height, depth, channels)
+            lines = [pixels[row * stride:(row + 1) * stride] for row in range(height)]
+        else:
+            lines = []
+            previous = bytes(stride)
+            for row in range(height):
+                offset = row * (stride + 1)
+                previous = self._unfilter(raw[offset], raw[offset + 1:offset + 1 + stride], previous, pixel_bytes)
+                lines.append(previous)
+        ink = b''.join(self._row_ink(line, width, depth, color_type, palette, transparency) for line in lines)
+        return width, height, ink
+
+    @staticmethod
+    def _ink_numpy(pixels: bytes, width: int, height: int, depth: int, channels: int) -> bytes:
+        """A teljes kibontott kép tintája egy vektorizált lépésben (8/16 bites, nem palettás kép)."""
+        samples = numpy.frombuffer(pixels, numpy.uint8).reshape(height, -1)
+        if depth == 16:
+            samples = samples[:, ::2]
+        samples = samples.reshape(height, width, channels).astype(numpy.int32)
+        if channels >= 3:
+            gray = (299 * samples[..., 0] + 587 * samples[..., 1] + 114 * samples[..., 2]) // 1000
+        else:
+            gray = samples[..., 0]
+        ink = 255 - gray
+        if channels in (2, 4):
+            ink = ink * samples[..., -1] // 255
+        return ink.astype(numpy.uint8).tobytes()
+
+    def _unfilter_numpy(self, raw: bytes, height: int, stride: int, pixel_bytes: int) -> bytes:
+        """
+        A teljes kép PNG szűrőinek visszafejtése NumPy-jal. A None/Sub/Up sorok
+        soronként vektorizáltak; az Average/Paeth sorok (és a köztük lévő többi
+        sor) sávokban, átlósan haladva (lásd _unfilter_band). A sáv magassága
+        úgy van korlátozva, hogy a ferdített tömb legfeljebb BAND_CELLS cella
+        legyen. A sor hossza mindig a pixel méret többszöröse (8 bit alatt
+        1 bájt).
+
+        A hullámfront sávonként (sorok + pixel oszlopok) Python lépés, ez
+        1000x1000-es RGB Paeth képen kb. 0,2 s, 2000x1500-ason kb. 0,6 s. Ha egy
+        sávban csak néhány Average/Paeth sor van, azokat a tiszta Python
+        _unfilter fejti vissza soronként (WAVEFRONT_STEP_BYTES), mert az olcsóbb.
+        """
+        rows = numpy.frombuffer(raw, numpy.uint8, count=(stride + 1) * height).reshape(height, stride + 1)
+        kinds = rows[:, 0].tolist()
+        if max(kinds, default=0) > 4:
+            raise ValueError(f"Ismeretlen PNG szűrő: {max(kinds)}")
+        data = rows[:, 1:].reshape(height, stride // pixel_bytes, pixel_bytes)
+        band_rows = max(1, BAND_CELLS // (pixel_bytes * (stride // pixel_bytes + height + 1)))
+        # Egy nulla sor a kép fölött: az első sor "felső" szomszédja
+        out = numpy.zeros((height + 1, stride // pixel_bytes, pixel_bytes), numpy.uint8)
+        row = 0
+        while row < height:
+            kind = kinds[row]
+            if kind >= 3:
+                end = min(height, row + band_rows)
+                while kinds[end - 1] < 3:
+                    end -= 1
+                # Kevés Average/Paeth sornál a soronkénti Python olcsóbb a (sorok + oszlopok) lépéses hullámfrontnál
+                heavy = sum(1 for band_kind in kinds[row:end] if band_kind >= 3)
+                if heavy * stride > (end - row + stride // pixel_bytes) * WAVEFRONT_STEP_BYTES:
+                    self._unfilter_band(out, data, kinds, row, end)
+                    row = end
+                    continue
+                line = self._unfilter(kind, data[row].tobytes(), out[row].tobytes(), pixel_bytes)
+                out[row + 1] = numpy.frombuffer(line, numpy.uint8).reshape(out.shape[1:])
+            elif kind == 0:
+                out[row + 1] = data[row]
+            elif kind == 1:
+                # A Sub szűrő pixel-bájt oszloponkénti futó összeg (mod 256)
+                out[row + 1] = numpy.cumsum(data[row], axis=0, dtype=numpy.uint8)
+            else:
+                out[row + 1] = data[row] + out[row]
+            row += 1
+        return out[1:].tobytes()
+
+    @staticmethod
+    def _unfilter_band(out, data, kinds: List[int], start: int, end: int):
+        """
+        A [start, end) sorok visszafejtése hullámfronttal: egy pixel a bal, a
+        felső és a bal felső szomszédjától függ, így egy anti-diagonális
+        (sor + oszlop = állandó) pixelei egymástól függetlenek, és egy lépésben
+        számolhatók. A sáv ferdítve tárolódik (skewed[sor + oszlop + 2, sor + 1]),
+        így minden anti-diagonális és a szomszédai is folytonos szeletek.
+        """
+        rows, pixels, pixel_bytes = end - start, data.shape[1], data.shape[2]
+        band = numpy.array(kinds[start:end])[:, None]
+        present = set(kinds[start:end])
+        row_index, column_index = numpy.indices((rows, pixels))
+        diagonal_index = row_index + column_index
+        deltas = numpy.zeros((rows + pixels - 1, rows, pixel_bytes), numpy.int16)
+        deltas[diagonal_index, row_index] = data[start:end]
+        # A 0. oszlop a sáv fölötti (már kész) sor, a bal oldali keret nulla marad
+        skewed = numpy.zeros((rows + pixels + 1, rows + 1, pixel_bytes), numpy.int16)
+        skewed[1:pixels + 1, 0] = out[start]
+        for diagonal in range(rows + pixels - 1):
+            first, last = max(0, diagonal - pixels + 1), min(rows - 1, diagonal) + 1
+            left = skewed[diagonal + 1, first + 1:last + 1]
+            up = skewed[diagonal + 1, first:last]
+            upper_left = skewed[diagonal, first:last]
+            paeth = average = 0
+            if 4 in present:
+                # Paeth: a becslés (bal + felső - bal felső) a legközelebbi szomszéd
+                vertical, horizontal = up - upper_left, left - upper_left
+                distance_left, distance_up = numpy.abs(vertical), numpy.abs(horizontal)
+                distance_corner = numpy.abs(vertical + horizontal)
+                paeth = numpy.where((distance_left <= distance_up) & (distance_left <= distance_corner), left,
+                                    numpy.where(distance_up <= distance_corner, up, upper_left))
+            if 3 in present:
+                average = (left + up) >> 1
+            predictor = (0, left, up, average, paeth)
+            if len(present) == 1:
+                predictor = predictor[kinds[start]]
+            else:
+                predictor = numpy.choose(band[first:last], predictor)
+            skewed[diagonal + 2, first + 1:last + 1] = (deltas[diagonal, first:last] + predictor) & 0xFF
+        out[start + 1:end + 1] = skewed[diagonal_index + 2, row_index + 1]
+
+    def _unfilter(self, kind: int, line: bytes, previous: bytes, pixel_bytes: int) -> bytes:
+        """Egy sor PNG szűrőjének visszafejtése (None, Sub, Up, Average, Paeth), tisztán Pythonban."""
+        if kind == 0:
+            return line
+        if kind == 2:
+            return bytes((a + b) & 0xFF for a, b in zip(line, previous))
+
+        result = bytearray(line)
+        for i in range(len(result)):
+            left = result[i - pixel_bytes] if i >= pixel_bytes else 0
+            if kind == 1:
+                result[i] = (result[i] + left) & 0xFF
+            elif kind == 3:
+                result[i] = (result[i] + ((left + previous[i]) >> 1)) & 0xFF
+            elif kind == 4:
+                up = previous[i]
+                upper_left = previous[i - pixel_bytes] if i >= pixel_bytes else 0
+                estimate = left + up - upper_left
+                distance_left, distance_up, distance_corner = \
+                    abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+                if distance_left <= distance_up and distance_left <= distance_corner:
+                    predictor = left
+                elif distance_up <= distance_corner:
+                    predictor = up
+                else:
+                    predictor = upper_left
+                result[i] = (result[i] + predictor) & 0xFF
+            else:
+                raise ValueError(f"Ismeretlen PNG szűrő: {kind}")
+        return bytes(result)
+
+    @staticmethod
+    def _row_ink(line: bytes, width: int, depth: int, color_type: int,
+                 palette: bytes, transparency: bytes) -> bytes:
+        """Egy kibontott sor tintája: 255 - szürkeség, fehér háttérre keverve."""
+        if depth == 16:
+            line = line[::2]  # A felső bájt bőven elég 5 szinthez
+            depth = 8
+        if depth < 8:
+            per_byte = 8 // depth
+            mask = (1 << depth) - 1
+            samples = [byte >> (8 - depth * (i + 1)) & mask for byte in line for i in range(per_byte)][:width]
+            if color_type == 0:
+                line = bytes(sample * 255 // mask for sample in samples)
+            else:
+                line = bytes(samples)
+
+        if color_type == 3:
+            if len(palette) < 3:
+                raise ValueError("Hibás PNG: palettás kép PLTE chunk nélkül")
+            colors = [palette[i:i + 3] for i in range(0, len(palette), 3)]
+            alphas = list(transparency) + [255] * (len(colors) - len(transparency))
+            table = bytes((255 - ImageImporter._gray(*color)) * alpha // 255 for color, alpha in zip(colors, alphas))
+            return line[:width].translate(table.ljust(256, b'\xff'))
+        if color_type == 0:
+            return bytes(255 - value for value in line[:width])
+        if color_type == 4:
+            return bytes((255 - gray) * alpha // 255 for gray, alpha in zip(line[0::2], line[1::2]))
+        if color_type == 2:
+            return bytes(255 - ImageImporter._gray(r, g, b) for r, g, b in zip(line[0::3], line[1::3], line[2::3]))
+        return bytes((255 - ImageImporter._gray(r, g, b)) * alpha // 255
+                     for r, g, b, alpha in zip(line[0::4], line[1::4], line[2::4], line[3::4]))
+
+    @staticmethod
+    def _gray(r: int, g: int, b: int) -> int:
+        return (299 * r + 587 * g + 114 * b) // 1000
+
+    @staticmethod
+    def _edges(size: int, cells: int) -> List[Tuple[int, int]]:
+        """Forrás pixel sávok cellánként; nagyításnál egy pixel több cellába is eshet."""
+        edges = []
+        for cell in range(cells):
+            start = min(cell * size // cells, size - 1)
+            edges.append((start, max(start + 1, (cell + 1) * size // cells)))
+        return edges
+
+    def downsample(self, image: Image, weeks: int, rows: int = GRID_ROWS) -> List[List[float]]:
+        """
+        A kép kicsinyítése rows x weeks cellára terület-átlagolással.
+
+        Returns:
+            Soronként a cellák átlagos tintája (0.0 - 1.0)
+        """
+        width, height, ink = image
+        columns, bands = self._edges(width, weeks), self._edges(height, rows)
+        if self.use_numpy:
+            pixels = numpy.frombuffer(bytes(ink), numpy.uint8).reshape(height, width)
+            integral = numpy.zeros((height + 1, width + 1), numpy.int64)
+            integral[1:, 1:] = pixels.cumsum(axis=0, dtype=numpy.int64).cumsum(axis=1)
+            x0, x1 = (numpy.array(side) for side in zip(*columns))
+            y0, y1 = (numpy.array(side) for side in zip(*bands))
+            sums = (integral[y1[:, None], x1] - integral[y0[:, None], x1]
+                    - integral[y1[:, None], x0] + integral[y0[:, None], x0])
+            area = (y1 - y0)[:, None] * (x1 - x0) * 255
+            return (sums / area).tolist()
+
+        cells = []
+        for top, bottom in bands:
+            totals = [0] * weeks
+            for row in range(top, bottom):
+                prefix = [0, *accumulate(ink[row * width:(row + 1) * width])]
+                for index, (left, right) in enumerate(columns):
+                    totals[index] += prefix[right] - prefix[left]
+            cells.append([total / ((bottom - top) * (right - left) * 255)
+                          for total, (left, right) in zip(totals, columns)])
+        return cells
+
+    def quantize(self, cells: List[List[float]], levels: int = LEVELS) -> List[List[int]]:
+        """
+        A cellák 0..levels-1 szintre kvantálása. A legsötétebb cella a legmagasabb
+        szintre kerül (a halvány képek is kitöltik a skálát); ditheringnél a
+        kerekítési hiba Floyd–Steinberg szerint oszlik szét a szomszédokra.
+        """
+        top = max((value for row in cells for value in row), default=0.0)
+        if top <= 0:
+            return [[0] * len(row) for row in cells]
+        steps = levels - 1
+        work = [[value / top * steps for value in row] for row in cells]
+        result = []
+        for y, row in enumerate(work):
+            out = []
+            for x, value in enumerate(row):
+                level = min(steps, max(0, int(value + 0.5)))
+                out.append(level)
+                if not self.dither:
+                    continue
+                error = value - level
+                if x + 1 < len(row):
+                    row[x + 1] += error * 7 / 16
+                if y + 1 < len(work):
+                    below = work[y + 1]
+                    if x > 0:
+                        below[x - 1] += error * 3 / 16
+                    below[x] += error * 5 / 16
+                    if x + 1 < len(below):
+                        below[x + 1] += error * 1 / 16
+            result.append(out)
+        return result
+
+    @staticmethod
+    def fit_weeks(image: Image, max_weeks: int, rows: int = GRID_ROWS) -> int:
+        """A képarányt megtartó szélesség hetekben, legfeljebb max_weeks."""
+        width, height, _ = image
+        return max(1, min(max_weeks, round(width * rows / height)))
+
+    def to_pattern(self, path: str, weeks: Optional[int] = None, max_weeks: int = 53) -> CompiledPattern:
+        """Kép -> 7 sor magas, lefordított minta (cellaértékek: intenzitás szintek)."""
+        if weeks is not None and weeks < 1:
+            raise ValueError(f"A kép szélessége legalább 1 hét legyen (kapott: {weeks})")
+        image = self.load(path)
+        weeks = weeks or self.fit_weeks(image, max_weeks)
+        rows = self.quantize(self.downsample(image, weeks))
+        # Az üres szélső oszlopok levágása, hogy az alakzat a layout-ban ne foglaljon fölösleges helyet
+        lit = [x for x in range(weeks) if any(row[x] for row in rows)]
+        if not lit:
+            raise ValueError(f"A kép üres a kvantálás után: {path}")
+        return as_compiled([row[lit[0]:lit[-1] + 1] for row in rows])
+
+    def register(self, path: str, shape_patterns: ShapePatterns, name: Optional[str] = None,
+                 weeks: Optional[int] = None, max_weeks: int = 53) -> str:
+        """
+        A kép alakzatként regisztrálása (a promptban "név"-ként használható).
+
+        Args:
+            path: A kép fájl
+            shape_patterns: Az alakzat tábla, amibe a kép kerül (pl. egy ShapeRenderer-é);
+                            a kép csak ott látszik, más renderer-ek és job-ok nem kapják meg
+            name: Az alakzat neve
+            weeks: A kép szélessége hetekben (None esetén képarány szerint)
+            max_weeks: A legnagyobb szélesség (a grid szélessége)
+
+        Returns:
+            str: Az alakzat neve (alapértelmezés: a fájlnév kiterjesztés nélkül)
+        """
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        pattern = self.to_pattern(path, weeks, max_weeks)
+        shape_patterns.register(name, pattern)
+        print(f"🖼️  Kép alakzat: \"{name}\" ({pattern.width}x{pattern.height}, {len(pattern.offsets)} pixel)")
+        return name
@@ -0,0 +1,86 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+
+class Instrumentation:
+    """
+    Opcionális fázis mérés: idők és darabszámok fázisonként
+    (pl. file_write, git_add, git_commit, pattern_lookup, layout).
+
+    Kikapcsolt állapotban a phase() szinte semmibe sem kerül, így a
+    GitHandler és a rendererek mindig hívhatják.
+
+    Példa:
+        instrumentation = Instrumentation()
+        instrumentation.add_callback(lambda name, seconds: print(name, seconds))
+        with instrumentation.phase('layout'):
+            ...
+        instrumentation.print_summary()
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._callbacks: List[Callable[[str, float], None]] = []
+
+    def __enter__(self):
+        self.enabled = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self.enabled = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """Egy fázis időtartamának mérése (egymásba ágyazható, az idők inkluzívak)."""
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float, count: int = 1):
+        """Egy mérés rögzítése és a callback-ek értesítése."""
+        if not self.enabled:
+            return
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + count
+        for callback in self._callbacks:
+            callback(name, seconds)
+
+    def add_callback(self, callback: Callable[[str, float], None]):
+        """Callback regisztrálása, amit minden lezárt fázis után meghívunk: callback(név, másodperc)."""
+        self._callbacks.append(callback)
+
+    def reset(self):
+        """Az eddigi mérések törlése."""
+        self.timings.clear()
+        self.counts.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Fázis -> {'seconds', 'count', 'avg_ms'} összesítés."""
+        return {
+            name: {
+                'seconds': seconds,
+                'count': self.counts[name],
+                'avg_ms': seconds * 1000 / self.counts[name] if self.counts[name] else 0.0,
+            }
+            for name, seconds in self.timings.items()
+        }
+
+    def print_summary(self):
+        """Az összesítés kiírása, a leglassabb fázissal kezdve."""
+        if not self.timings:
+            print("⏱️  Nincs mért fázis.")
+            return
+
+        print("\n⏱️  Fázis mérések (az egymásba ágyazott fázisok ideje inkluzív):")
+        print(f"   {'fázis':<16} {'db':>7} {'összesen (mp)':>14} {'átlag (ms)':>11}")
+        for name, data in sorted(self.summary().items(), key=lambda item: -item[1]['seconds']):
+            print(f"   {name:<16} {data['count']:>7} {data['seconds']:>14.4f} {data['avg_ms']:>11.3f}")
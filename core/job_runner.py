@@ -0,0 +1,152 @@
+import os
+import json
+from typing import Any, Dict, List, Optional
+
+from .batch_committer import STORAGE_MODES
+from .object_writer import BACKENDS
+from .git_handler import GitHandler
+from .flow_layout import LAYOUT_MODES
+from .grid import Grid
+from .text_renderer import TextRenderer
+from .shape_renderer import ShapeRenderer
+from .layout_manager import LayoutManager
+from .image_importer import ImageImporter
+from .instrumentation import Instrumentation
+from patterns import FontLoader
+
+
+class JobRunner:
+    """Batch job fájlok (JSON/YAML) betöltése és az art-ok menü nélküli legyártása."""
+
+    # Egy job alapértelmezett értékei
+    DEFAULTS = {
+        'repo': '.',
+        'incremental': False,
+        'storage': 'files',
+        'year': None,
+        'years': None,
+        'start': None,
+        'end': None,
+        'backend': 'fast-import',
+        'layout': 'inline',
+        'font': None,
+        'fit': False,
+        'image': None,  # PNG/PGM kép alakzatként; a promptban "fájlnév"-ként hivatkozható
+        'image_name': None,
+        'image_weeks': None,
+        'dither': False,
+        'invert': False,
+    }
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        self.instrumentation = instrumentation
+
+    @classmethod
+    def load_job_file(cls, path: str) -> List[Dict[str, Any]]:
+        """
+        Betölt egy job fájlt. Elfogadott formák:
+
+            {"jobs": [{"repo": "...", "prompt": "..."}, ...]}
+            [{"repo": "...", "prompt": "..."}, ...]
+
+        A .yaml/.yml fájlokhoz a PyYAML csomag szükséges.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("YAML job fájlhoz telepítsd a PyYAML csomagot (pip install pyyaml)")
+            data = yaml.safe_load(raw)
+        else:
+            data = json.loads(raw)
+
+        if isinstance(data, dict):
+            data = data.get('jobs', [])
+        if not isinstance(data, list):
+            raise ValueError("A job fájlnak job-ok listáját kell tartalmaznia")
+
+        # A relatív repo útvonalak a job fájlhoz képest értendők
+        base_dir = os.path.dirname(os.path.abspath(path))
+        jobs = []
+        for index, job in enumerate(data):
+            job = cls.normalize_job(job, index)
+            job['repo'] = os.path.join(base_dir, os.path.expanduser(job['repo']))
+            if job['image']:
+                job['image'] = os.path.join(base_dir, os.path.expanduser(job['image']))
+            jobs.append(job)
+        return jobs
+
+    @classmethod
+    def normalize_job(cls, job: Dict[str, Any], index: int = 0) -> Dict[str, Any]:
+        """Ellenőrzi és az alapértelmezésekkel kiegészíti egy job leírását."""
+        if not isinstance(job, dict):
+            raise ValueError(f"{index + 1}. job: objektumnak kell lennie")
+        if not str(job.get('prompt', '')).strip():
+            raise ValueError(f"{index + 1}. job: hiányzik a 'prompt'")
+
+        normalized = dict(cls.DEFAULTS)
+        normalized.update(job)
+        if normalized['storage'] not in STORAGE_MODES:
+            raise ValueError(f"{index + 1}. job: ismeretlen tárolási mód: {normalized['storage']}")
+        if normalized['backend'] not in BACKENDS:
+            raise ValueError(f"{index + 1}. job: ismeretlen backend: {normalized['backend']}")
+        if normalized['layout'] not in LAYOUT_MODES:
+            raise ValueError(f"{index + 1}. job: ismeretlen elrendezés: {normalized['layout']}")
+        if normalized['font'] is not None:
+            try:
+                FontLoader.resolve(normalized['font'])
+            except ValueError as e:
+                raise ValueError(f"{index + 1}. job: {e}")
+        if normalized['image_weeks'] is not None:
+            try:
+                normalized['image_weeks'] = int(normalized['image_weeks'])
+            except (TypeError, ValueError):
+                raise ValueError(f"{index + 1}. job: hibás image_weeks: {normalized['image_weeks']}")
+            if normalized['image_weeks'] < 1:
+                raise ValueError(f"{index + 1}. job: az image_weeks legalább 1 legyen")
+        if normalized['year'] is not None:
+            normalized['year'] = int(normalized['year'])
+        try:
+            Grid.from_options(normalized['year'], normalized['years'], normalized['start'], normalized['end'])
+        except ValueError as e:
+            raise ValueError(f"{index + 1}. job: hibás dátum ablak: {e}")
+        return normalized
+
+    @staticmethod
+    def run_job(job: Dict[str, Any], instrumentation: Optional[Instrumentation] = None) -> int:
+        """Egy job futtatása: a repo inicializálása, az art kirajzolása és commit-olása."""
+        os.makedirs(job['repo'], exist_ok=True)
+        grid = Grid.from_options(job['year'], job['years'], job['start'], job['end'])
+        git_handler = GitHandler(job['repo'], job['storage'], instrumentation=instrumentation,
+                                 backend=job['backend'], grid=grid)
+        shape_renderer = ShapeRenderer(git_handler)
+        layout_manager = LayoutManager(git_handler, TextRenderer(git_handler, job['font']),
+                                       shape_renderer, bool(job['fit']))
+
+        try:
+            if job['image']:
+                # A kép csak ennek a job-nak a renderer-ébe kerül
+                ImageImporter(dither=bool(job['dither']), invert=bool(job['invert'])).register(
+                    job['image'], shape_renderer.shape_patterns, job['image_name'], job['image_weeks'],
+                    git_handler.grid_width)
+            git_handler.init_git_repo()
+            return layout_manager.create_combined_art(incremental=job['incremental'], text=job['prompt'],
+                                                       layout=job['layout'])
+        finally:
+            git_handler.close()
+
+    def run_all(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Az összes job futtatása egymás után; egy hibás job nem állítja meg a többit."""
+        results = []
+        for index, job in enumerate(jobs):
+            print(f"\n📦 Job {index + 1}/{len(jobs)}: {job['repo']} - '{job['prompt']}'")
+            try:
+                commits = self.run_job(job, self.instrumentation)
+                results.append({'job': job, 'commits': commits, 'error': None})
+            except Exception as e:
+                print(f"❌ Job {index + 1} sikertelen: {e}")
+                results.append({'job': job, 'commits': 0, 'error': str(e)})
+        return results
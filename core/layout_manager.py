@@ -1,154 +1,209 @@
-from typing import List, Dict, Any, Tuple
-import re
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from .flow_layout import LAYOUT_MODES, FlowLayout, LayoutPlan
+from patterns import FontLoader
+from .text_packer import Kerning, PackingOption, TextPacker
+from .tokenizer import Element, Tokenizer
 
 
 class LayoutManager:
     """Layout és elemek elhelyezését kezelő osztály."""
     
-    def __init__(self, git_handler, text_renderer, shape_renderer):
+    def __init__(self, git_handler, text_renderer, shape_renderer, fit: bool = False):
+        """
+        Args:
+            fit: Ha a szöveg nem fér el, a legsűrűbb még szükséges elrendezés
+                 keresése (kerning, keskenyebb szóköz, kisebb font; lásd text_packer)
+        """
         self.git_handler = git_handler
         self.text_renderer = text_renderer
         self.shape_renderer = shape_renderer
+        self.fit = fit
+        self.kerning = Kerning()
+        self._packing: Optional[PackingOption] = None
+        self._packing_glyphs = None
+    
+    def iter_elements(self, text: str) -> Iterator[Element]:
+        """A prompt elemei generátorként (a tokenizer alakzat készletenként egyszer fordul le)."""
+        return Tokenizer.for_shapes(self.shape_renderer.get_available_shapes()).tokenize(text)
     
-    def parse_text_with_shapes(self, text: str, compact: bool = None) -> List[Dict[str, Any]]:
+    def parse_text_with_shapes(self, text: str, compact: bool = None) -> List[Element]:
         """
-        Szöveget elemez és szétválasztja szöveg és alakzat elemekre.
+        Szöveget elemez és szétválasztja szöveg, alakzat és sortörés elemekre.
         
         Args:
-            text: Bemenet szöveg (pl. "Hello \"heart\" World")
+            text: Bemenet szöveg (pl. "Hello \"heart\" World", lásd tokenizer a teljes nyelvhez)
             compact: Nem használt paraméter (backward compatibility)
             
         Returns:
-            List[Dict]: Elemek listája
+            List[Element]: Elemek listája (szótárként is olvashatók)
         """
-        available_shapes = self.shape_renderer.get_available_shapes()
-        
-        elements = []
-        current_pos = 0
-        
-        # Regex minta az alakzatok keresésére: "alakzat_név"
-        shape_pattern = r'"(' + '|'.join(available_shapes) + r')"'
+        return list(self.iter_elements(text))
+    
+    def create_combined_art(self, incremental: bool = False, text: Optional[str] = None,
+                            layout: str = 'inline') -> int:
+        """
+        Kombinált art létrehozása szöveg és alakzatok keverékével.
         
-        for match in re.finditer(shape_pattern, text):
-            # Szöveg hozzáadása az alakzat előtt (ha van)
-            if match.start() > current_pos:
-                text_before = text[current_pos:match.start()].strip()
-                if text_before:
-                    elements.append({
-                        'type': 'text',
-                        'content': text_before
-                    })
-            
-            # Alakzat hozzáadása
-            shape_name = match.group(1)
-            elements.append({
-                'type': 'shape',
-                'content': shape_name
-            })
+        Args:
+            incremental: Csak a meglévő history-ból hiányzó commit-ok létrehozása
+            text: A prompt (None esetén interaktívan kérjük be)
+            layout: Elrendezés ('inline', 'banner' vagy 'wrap', lásd flow_layout)
             
-            current_pos = match.end()
-        
-        # Szöveg hozzáadása az utolsó alakzat után (ha van)
-        if current_pos < len(text):
-            text_after = text[current_pos:].strip()
-            if text_after:
-                elements.append({
-                    'type': 'text',
-                    'content': text_after
-                })
-        
-        # Ha nincs alakzat, az egész szöveg
-        if not elements:
-            elements.append({
-                'type': 'text',
-                'content': text.strip()
-            })
-        
-        return elements
-    
-    def create_combined_art(self):
-        """Kombinált art létrehozása szöveg és alakzatok keverékével."""
+        Returns:
+            int: Létrehozott commit-ok száma
+        """
         print("🎨 Kombinált Art Létrehozása")
         print("=" * 50)
         
-        # Szöveg bekérése
-        text = input("📝 Mit írjunk ki? ").strip()
+        # Szöveg bekérése (ha nem kaptuk meg paraméterként)
+        if text is None:
+            text = input("📝 Mit írjunk ki? ")
+        text = text.strip()
         
         if not text:
             print("❌ Üres szöveg!")
-            return
+            return 0
         
         # Elemek feldolgozása
-        elements = self.parse_text_with_shapes(text)
+        with self.git_handler.instrumentation.phase('parse'):
+            elements = self.parse_text_with_shapes(text)
         
         print(f"\n🔍 Feldolgozott elemek:")
         for i, element in enumerate(elements):
             print(f"  {i+1}. {element['type']}: '{element['content']}'")
         
-        # Layout elhelyezése
-        self._place_inline_elements(elements)
+        # Layout kirajzolása canvas-ra, majd egyetlen commit lépés
+        canvas = self.build_canvas(elements, layout)
+        created = self.git_handler.commit_canvas(canvas, incremental=incremental)
         
         print("✅ Kombinált art sikeresen létrehozva!")
+        return created
+    
+    def build_canvas(self, elements: List[Dict[str, Any]], layout: str = 'inline'):
+        """Az elemeket egy memóriabeli canvas-ra rajzolja, git műveletek nélkül."""
+        if layout not in LAYOUT_MODES:
+            raise ValueError(f"Ismeretlen elrendezés: {layout} (lehetséges: {', '.join(LAYOUT_MODES)})")
+        canvas = self.git_handler.new_canvas()
+        with self.git_handler.drawing_to(canvas), self.git_handler.instrumentation.phase('layout'):
+            if self.fit:
+                self.choose_packing(elements, layout)
+            if layout == 'inline':
+                self._place_inline_elements(elements)
+            else:
+                self._draw_plan(self.plan_flow_layout(elements, layout))
+        return canvas
+    
+    def plan_flow_layout(self, elements: List[Dict[str, Any]], layout: str = 'banner') -> LayoutPlan:
+        """
+        A teljes tördelt layout előre kiszámolva: banner módban a sorok az egymást
+        követő éves ablakokba kerülnek, wrap módban a teljes grid-en egymás alá.
+        """
+        grid = self.git_handler.grid
+        windows = FlowLayout.year_windows(grid) if layout == 'banner' else [(0, grid.width)]
+        plan = self._flow_layout().plan(windows, grid.height, elements)
+        
+        print(f"📐 {layout} elrendezés: {len(plan.lines)} sor, {len(windows)} ablak, {len(plan)} glyph")
+        for week, day, width, text in plan.lines:
+            print(f"  • hét {week}, nap {day} ({width} széles): '{text}'")
+        if plan.overflow:
+            print(f"⚠️  {len(plan.overflow)} szó nem fér a grid-re, kimarad: {' '.join(plan.overflow)}")
+            if layout == 'banner':
+                first_year = grid.year_starts()[0][1]
+                print(f"💡 A teljes szöveghez kb. {plan.windows_needed} éves ablak kell "
+                      f"(pl. --years {first_year}-{first_year + plan.windows_needed - 1})")
+        return plan
+    
+    def _draw_plan(self, plan: LayoutPlan):
+        """
+        Az előre kiszámolt glyph offset tábla kirajzolása: canvas-ra egyetlen
+        blit lépésben (NumPy-jal, ha elérhető), egyébként glyph-enként.
+        """
+        with self.git_handler.instrumentation.phase('draw'):
+            if self.git_handler.canvas is not None:
+                self.git_handler.canvas.blit_many(plan.placements)
+                return
+            for placement in plan.placements:
+                self.git_handler.draw_pattern(placement.glyph, placement.week, placement.day,
+                                              placement.intensity)
+    
+    def _flow_layout(self, option: Optional[PackingOption] = None, glyphs=None) -> FlowLayout:
+        """A flow layout a beállított fonttal, vagy a megadott tömörítési fokozattal."""
+        if option is None:
+            option, glyphs = self._packing, self._packing_glyphs
+        shapes = self.shape_renderer.shape_patterns.get_compiled()
+        if option is None:
+            return FlowLayout(self.text_renderer.alphabet_patterns.get_compiled(), shapes)
+        return FlowLayout(glyphs or self.text_renderer.alphabet_patterns.get_compiled(), shapes,
+                          letter_spacing=option.letter_spacing,
+                          kerning=self.kerning if option.kerning else None,
+                          space_width=option.space_width)
+    
+    def _fallback_fonts(self, elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """A beállítottnál alacsonyabb beépített fontok, amikben a szöveg minden karaktere megvan."""
+        text = ''.join(element['content'] for element in elements if element['type'] == 'text')
+        fonts = {}
+        for name in FontLoader.available():
+            try:
+                font = FontLoader().load(name)
+            except (OSError, ValueError):
+                continue
+            if font.height < self.text_renderer.line_height and TextPacker.covers(font.get_compiled(), text):
+                fonts[name] = font.get_compiled()
+        return fonts
+    
+    def _overflow(self, flow: FlowLayout, elements: List[Dict[str, Any]], layout: str) -> int:
+        """Mennyi nem fér el: inline módban a túllógó hetek, egyébként a kimaradó szavak száma."""
+        grid = self.git_handler.grid
+        if layout == 'inline':
+            return max(0, flow.inline(grid.width, grid.height, elements).lines[0][2] - grid.width)
+        windows = FlowLayout.year_windows(grid) if layout == 'banner' else [(0, grid.width)]
+        return len(flow.plan(windows, grid.height, elements).overflow)
+    
+    def choose_packing(self, elements: List[Dict[str, Any]], layout: str = 'inline') -> PackingOption:
+        """
+        A legsűrűbb még szükséges tömörítési fokozat kiválasztása: a fokozatok a
+        lazától a szorosig mérődnek le, az első nyer, amivel a szöveg elfér a grid-en.
+        A kisebb beépített fontok csak akkor kerülnek sorra, ha a beállított fonttal
+        egyik fokozat sem elég; ha semmi sem fér el, a legkevesebbet levágó marad.
+        """
+        packer = TextPacker(self.kerning)
+        fonts: Dict[str, Any] = {}
+        best = None
+        for stage in ('font', 'fallback'):
+            if stage == 'fallback':
+                # A beállított fonttal nem fér el: jöhetnek a kisebb beépített fontok is
+                fonts = self._fallback_fonts(elements)
+                if not fonts:
+                    break
+            for option in packer.candidates(fonts)[len(packer.options) if fonts else 0:]:
+                glyphs = fonts.get(option.font)
+                overflow = self._overflow(self._flow_layout(option, glyphs), elements, layout)
+                if best is None or overflow < best[0]:
+                    best = (overflow, option, glyphs)
+                if not overflow:
+                    break
+            if not best[0]:
+                break
+        overflow, self._packing, self._packing_glyphs = best
+        if overflow:
+            print("⚠️  A szöveg a legszorosabb elrendezéssel sem fér el teljesen")
+        if self._packing is not packer.options[0]:
+            print(f"🗜️  Tömörítés: {self._packing.label}")
+        return self._packing
     
     def _place_inline_elements(self, elements: List[Dict[str, Any]]):
-        """Elemeket egymás mellett helyezi el inline módban."""
-        current_week = 0
-        current_day = 1  # Középre igazítás Y tengelyen
-        
-        # Teljes szélesség kiszámítása az inline elhelyezéshez
-        total_width = 0
-        max_height = 0
-        
-        for element in elements:
-            if element['type'] == 'text':
-                width, height = self.text_renderer.calculate_text_dimensions(
-                    element['content'], letter_spacing=1
-                )
-            else:  # shape
-                shapes = self.shape_renderer.shape_patterns.get_patterns()
-                pattern = shapes[element['content']]
-                width, height = self.shape_renderer.calculate_pattern_dimensions(pattern)
-            
-            total_width += width + 1  # +1 az elemek közötti távolság
-            max_height = max(max_height, height)
-        
-        # Kezdő pozíció középre igazítása
-        start_week = max(0, (self.git_handler.grid_width - total_width) // 2)
-        start_day = max(0, (self.git_handler.grid_height - max_height) // 2)
+        """Elemeket egymás mellett helyezi el inline módban (egy lépésben kiszámolt táblával)."""
+        plan = self._flow_layout().inline(self.git_handler.grid_width, self.git_handler.grid_height, elements)
+        start_week, start_day, layout_width, _ = plan.lines[0]
+        max_height = max((placement.glyph.height for placement in plan.placements), default=0)
         
         print(f"📍 Teljes layout pozíció: hét {start_week}, nap {start_day}")
-        print(f"📏 Teljes layout mérete: {total_width}x{max_height}")
-        
-        current_week = start_week
+        print(f"📏 Teljes layout mérete: {layout_width + 1}x{max_height}")
+        if layout_width > self.git_handler.grid_width:
+            print(f"⚠️  A layout {layout_width - self.git_handler.grid_width} héttel szélesebb a grid-nél, "
+                  f"a túllógó rész le lesz vágva!")
         
-        # Elemek elhelyezése
-        for element in elements:
-            if element['type'] == 'text':
-                print(f"📝 Szöveg elhelyezése: '{element['content']}'")
-                self.text_renderer.write_text(
-                    element['content'], 
-                    start_week=current_week, 
-                    start_day=start_day,
-                    letter_spacing=1,
-                    auto_center=False
-                )
-                width, _ = self.text_renderer.calculate_text_dimensions(
-                    element['content'], letter_spacing=1
-                )
-                current_week += width + 1
-            
-            else:  # shape
-                print(f"🎨 Alakzat elhelyezése: '{element['content']}'")
-                self.shape_renderer.draw_shape(
-                    element['content'],
-                    start_week=current_week,
-                    start_day=start_day,
-                    auto_center=False
-                )
-                shapes = self.shape_renderer.shape_patterns.get_patterns()
-                pattern = shapes[element['content']]
-                width, _ = self.shape_renderer.calculate_pattern_dimensions(pattern)
-                current_week += width + 1
+        self._draw_plan(plan)
     
     def _get_element_width(self, element: Dict[str, Any], compact: bool = None) -> int:
         """Visszaadja egy elem szélességét."""
@@ -157,11 +212,9 @@ class LayoutManager:
                 element['content'], letter_spacing=1
             )
             return width
-        else:  # shape
-            shapes = self.shape_renderer.shape_patterns.get_patterns()
-            pattern = shapes[element['content']]
-            width, _ = self.shape_renderer.calculate_pattern_dimensions(pattern)
-            return width
+        elif element['type'] == 'shape':
+            return self.shape_renderer.shape_patterns.get_compiled()[element['content']].width
+        return 0
     
     def _place_elements_automatically(self, elements: List[Dict[str, Any]]):
         """Elemeket automatikusan helyezi el a legjobb elrendezésben."""
@@ -178,7 +231,7 @@ class LayoutManager:
                     start_day=element.get('day', 0),
                     auto_center=False
                 )
-            else:  # shape
+            elif element['type'] == 'shape':
                 self.shape_renderer.draw_shape(
                     element['content'],
                     start_week=element.get('week', 0),
@@ -0,0 +1,436 @@
+import os
+import zlib
+import bisect
+import hashlib
+import datetime
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from .batch_committer import DETACHED_HEAD_ERROR, BatchCommitter
+from .git_session import GitSession
+from .instrumentation import Instrumentation
+
+
+# Commit író backend-ek a GitHandler-hez:
+#   fast-import - a GitSession hosszú életű `git fast-import` folyamata (alapértelmezés)
+#   objects     - tiszta Python: blob, fa és commit objektumok közvetlenül a .git/objects-be
+#   pack        - tiszta Python: egyetlen packfile + index, a fák deltázva (lásd pack_writer)
+BACKENDS = ('fast-import', 'objects', 'pack')
+# Ennyi commit fölött az objects backend files tárolással lassú: minden commit a teljes, egyre
+# nagyobb art_data fát új loose objektumként írja (a lemezhasználat a commit szám négyzetével nő)
+LOOSE_FILES_WARN_COMMITS = 2000
+
+TREE_MODE = b'40000'
+BLOB_MODE = b'100644'
+
+
+class ObjectWriter(BatchCommitter):
+    """
+    Commit-ok létrehozása a git bináris nélkül: a blob, fa és commit objektumok
+    zlib-bel tömörítve, SHA-1 névvel kerülnek a `.git/objects` könyvtárba, a
+    branch ref pedig lock fájllal, atomikusan frissül.
+
+    A dátumozott commit-ok láncolása a memóriában történik; a ref csak a
+    sync()-nél íródik ki. Git folyamat csak két esetben indul: packolt szülő
+    objektum olvasásakor (a session cat-file folyamatán) és a working tree
+    szinkronizálásakor (`git read-tree`), ha a fa változott.
+    """
+
+    def __init__(self, repo_path: str = ".", storage_mode: str = 'files',
+                 instrumentation: Optional[Instrumentation] = None,
+                 session: Optional[GitSession] = None):
+        super().__init__(repo_path, storage_mode, instrumentation, session)
+        self._git_dir: Optional[str] = None
+        self._common_dir: Optional[str] = None
+        self._object_dirs = set()
+        self._identity_cache: Optional[str] = None
+        # A memóriában láncolt branch csúcs és a hozzá tartozó fák
+        self._tip: Optional[str] = None
+        self._root_entries: Dict[bytes, Tuple[bytes, str]] = {}
+        # Az art_data fa sorosítva, rendezett kulcsokkal; a beszúrás a bájt sorozatba történik
+        self._art_keys: List[bytes] = []
+        self._art_sizes: Dict[bytes, int] = {}
+        self._art_tree = bytearray()
+
+    # --- Repository elrendezés ---------------------------------------------------
+
+    def git_dir(self) -> str:
+        """A .git könyvtár (a `.git` fájlos worktree-k `gitdir:` sorát is követi)."""
+        if self._git_dir is None:
+            dot_git = os.path.join(self.repo_path, '.git')
+            if os.path.isdir(dot_git):
+                self._git_dir = os.path.abspath(dot_git)
+            elif os.path.isfile(dot_git):
+                with open(dot_git, 'r', encoding='utf-8') as f:
+                    target = f.read().strip()[len('gitdir:'):].strip()
+                self._git_dir = os.path.abspath(os.path.join(self.repo_path, target))
+            else:
+                self._git_dir = self.session.git_dir()
+        return self._git_dir
+
+    def common_dir(self) -> str:
+        """Az objektumokat és ref-eket tartalmazó könyvtár (linkelt worktree-nél a fő .git)."""
+        if self._common_dir is None:
+            git_dir = self.git_dir()
+            commondir_file = os.path.join(git_dir, 'commondir')
+            self._common_dir = git_dir
+            if os.path.isfile(commondir_file):
+                with open(commondir_file, 'r', encoding='utf-8') as f:
+                    self._common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        return self._common_dir
+
+    # --- Ref-ek ------------------------------------------------------------------
+
+    def _head_ref(self) -> Optional[str]:
+        """A HEAD által mutatott branch (detached HEAD esetén None)."""
+        with open(os.path.join(self.git_dir(), 'HEAD'), 'r', encoding='utf-8') as f:
+            head = f.read().strip()
+        return head[5:] if head.startswith('ref: ') else None
+
+    def resolve_ref(self, ref: str) -> Optional[str]:
+        """Egy ref értéke a loose ref fájlból, vagy ha nincs, a packed-refs-ből."""
+        loose = os.path.join(self.common_dir(), ref)
+        if os.path.isfile(loose):
+            with open(loose, 'r', encoding='utf-8') as f:
+                value = f.read().strip()
+            if value.startswith('ref: '):
+                return self.resolve_ref(value[5:])
+            return value or None
+
+        packed = os.path.join(self.common_dir(), 'packed-refs')
+        if os.path.isfile(packed):
+            with open(packed, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith(('#', '^')):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        return None
+
+    def branch_ref(self) -> str:
+        """Az aktuális branch ref (git nélkül); detached HEAD esetén hiba, mint a fast-import backend-nél."""
+        ref = self._head_ref()
+        if ref is None:
+            raise RuntimeError(DETACHED_HEAD_ERROR)
+        return ref
+
+    def _current_ref(self) -> Tuple[str, Optional[str]]:
+        """Visszaadja az aktuális branch ref-et és a HEAD commit sha-ját (ha van), git nélkül."""
+        ref = self.branch_ref()
+        return ref, self.resolve_ref(ref)
+
+    def update_ref(self, ref: str, new: str, old: Optional[str], message: str):
+        """
+        A ref atomikus frissítése: `<ref>.lock` kizárólagos létrehozása, a régi
+        érték ellenőrzése, majd os.replace. A packed-refs-ben lévő ref-et a
+        loose ref fájl felülírja, ahogy a git is teszi.
+        """
+        path = os.path.join(self.common_dir(), ref)
+        lock_path = path + '.lock'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        try:
+            fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            raise RuntimeError(f"A {ref} ref zárolva van ({lock_path}), fut egy másik git folyamat?")
+
+        try:
+            current = self.resolve_ref(ref)
+            if current != old:
+                raise RuntimeError(f"A {ref} ref időközben megváltozott ({old} -> {current})")
+            os.write(fd, f"{new}\n".encode('ascii'))
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            os.unlink(lock_path)
+            raise
+        os.close(fd)
+        os.replace(lock_path, path)
+        self._append_reflog(ref, old, new, message)
+
+    def _append_reflog(self, ref: str, old: Optional[str], new: str, message: str):
+        """Reflog bejegyzés a ref-hez és a HEAD-hez (ha a repository vezet reflog-ot)."""
+        logs_dir = os.path.join(self.common_dir(), 'logs')
+        if not os.path.isdir(logs_dir):
+            return
+        when = self._format_moment(datetime.datetime.now())
+        line = f"{old or '0' * 40} {new} {self._identity()} {when}\t{message}\n".encode('utf-8')
+        targets = [os.path.join(logs_dir, ref)]
+        if self._head_ref() == ref:
+            targets.append(os.path.join(self.git_dir(), 'logs', 'HEAD'))
+        for target in targets:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'ab') as f:
+                f.write(line)
+
+    def _identity(self) -> str:
+        """Szerző azonosító: környezeti változók, majd a git config fájlok [user] szekciója."""
+        if self._identity_cache is not None:
+            return self._identity_cache
+
+        name = os.environ.get('GIT_AUTHOR_NAME')
+        email = os.environ.get('GIT_AUTHOR_EMAIL')
+        home = os.path.expanduser('~')
+        xdg = os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, '.config')
+        # A későbbi fájl felülírja a korábbit, ahogy a git-nél
+        for config_path in (os.path.join(xdg, 'git', 'config'), os.path.join(home, '.gitconfig'),
+                            os.path.join(self.common_dir(), 'config')):
+            values = self._read_user_config(config_path)
+            name = os.environ.get('GIT_AUTHOR_NAME') or values.get('name', name)
+            email = os.environ.get('GIT_AUTHOR_EMAIL') or values.get('email', email)
+
+        if name and email:
+            self._identity_cache = f"{name} <{email}>"
+        else:
+            self._identity_cache = self.session.identity()
+        return self._identity_cache
+
+    @staticmethod
+    def _read_user_config(path: str) -> Dict[str, str]:
+        """A [user] szekció name/email kulcsai egy git config fájlból."""
+        values: Dict[str, str] = {}
+        if not os.path.isfile(path):
+            return values
+        section = None
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith(('#', ';')):
+                    continue
+                if line.startswith('['):
+                    section = line[1:line.index(']')].strip().lower() if ']' in line else None
+                    continue
+                if section == 'user' and '=' in line:
+                    key, value = line.split('=', 1)
+                    values[key.strip().lower()] = value.strip().strip('"')
+        return values
+
+    # --- Objektumok ----------------------------------------------------------------
+
+    def write_object(self, obj_type: bytes, data: bytes, delta_key: Optional[str] = None) -> str:
+        """
+        Loose objektum írása (zlib, SHA-1 név); a már létező objektumot nem írja újra.
+
+        A delta_key azonosítja, hogy a fa melyik fa korábbi változata (a pack
+        író ez alapján deltáz, a loose író figyelmen kívül hagyja).
+        """
+        store = b'%s %d\0' % (obj_type, len(data)) + data
+        sha = hashlib.sha1(store).hexdigest()
+
+        directory = os.path.join(self.common_dir(), 'objects', sha[:2])
+        path = os.path.join(directory, sha[2:])
+        if directory not in self._object_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._object_dirs.add(directory)
+        if os.path.exists(path):
+            return sha
+
+        # Ideiglenes fájlba írás, majd átnevezés: félkész objektum nem kerülhet a helyére.
+        # A tmp_obj_ nevű maradékot (pl. megölt futás után) a git gc/prune takarítja.
+        fd, temp_path = tempfile.mkstemp(prefix='tmp_obj_', dir=os.path.dirname(directory))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(store, 1))
+            os.chmod(temp_path, 0o444)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return sha
+
+    def read_object(self, sha: str) -> Optional[Tuple[bytes, bytes]]:
+        """(típus, tartalom) egy loose objektumból, packolt objektumnál a session cat-file-ján."""
+        path = os.path.join(self.common_dir(), 'objects', sha[:2], sha[2:])
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                store = zlib.decompress(f.read())
+            header, _, data = store.partition(b'\0')
+            return header.split(b' ')[0], data
+
+        obj = self.session.read_object(sha)
+        if obj is None:
+            return None
+        return obj[1].encode('ascii'), obj[2]
+
+    @staticmethod
+    def parse_tree(data: bytes) -> Dict[bytes, Tuple[bytes, str]]:
+        """Fa objektum bejegyzései: név -> (mód, sha)."""
+        entries = {}
+        pos = 0
+        while pos < len(data):
+            space = data.index(b' ', pos)
+            nul = data.index(b'\0', space)
+            entries[data[space + 1:nul]] = (data[pos:space], data[nul + 1:nul + 21].hex())
+            pos = nul + 21
+        return entries
+
+    @staticmethod
+    def _tree_key(name: bytes, mode: bytes) -> bytes:
+        """A git fa rendezési kulcsa: a könyvtárnevek végére képzeletbeli '/' kerül."""
+        return name + b'/' if mode == TREE_MODE else name
+
+    @staticmethod
+    def _tree_entry(name: bytes, mode: bytes, sha: str) -> bytes:
+        return mode + b' ' + name + b'\0' + bytes.fromhex(sha)
+
+    def _serialize_tree(self, entries: Dict[bytes, Tuple[bytes, str]]) -> bytes:
+        ordered = sorted(entries.items(), key=lambda item: self._tree_key(item[0], item[1][0]))
+        return b''.join(self._tree_entry(name, mode, sha) for name, (mode, sha) in ordered)
+
+    def _load_tip(self, parent: Optional[str]):
+        """A szülő commit gyökér és art_data fájának betöltése a láncoláshoz."""
+        self._tip = parent
+        self._root_entries = {}
+        self._clear_art()
+        if parent is None:
+            return
+
+        commit = self.read_object(parent)
+        if commit is None:
+            raise RuntimeError(f"A szülő commit nem olvasható: {parent}")
+        tree_sha = commit[1].split(b'\n', 1)[0].split(b' ')[1].decode('ascii')
+        self._root_entries = self.parse_tree(self.read_object(tree_sha)[1])
+
+        art = self._root_entries.get(b'art_data')
+        if art is not None and art[0] == TREE_MODE:
+            # A git fa már rendezett, a sorosított formát változatlanul átvesszük
+            data = self.read_object(art[1])[1]
+            self._art_tree = bytearray(data)
+            pos = 0
+            while pos < len(data):
+                space = data.index(b' ', pos)
+                nul = data.index(b'\0', space)
+                key = self._tree_key(data[space + 1:nul], data[pos:space])
+                self._art_keys.append(key)
+                self._art_sizes[key] = nul + 21 - pos
+                pos = nul + 21
+
+    def _clear_art(self):
+        self._art_keys = []
+        self._art_sizes = {}
+        self._art_tree = bytearray()
+
+    def _set_art_entry(self, name: bytes, mode: bytes, sha: str):
+        """Bejegyzés beszúrása vagy cseréje a sorosított art_data fában."""
+        key = self._tree_key(name, mode)
+        entry = self._tree_entry(name, mode, sha)
+        keys = self._art_keys
+        pos = bisect.bisect_left(keys, key)
+        # A bájt pozíciót a fa végéről számoljuk: a dátum szerint haladó commit-ok a végére írnak
+        start = len(self._art_tree) - sum(self._art_sizes[k] for k in keys[pos:])
+        if pos < len(keys) and keys[pos] == key:
+            self._art_tree[start:start + self._art_sizes[key]] = entry
+        else:
+            keys.insert(pos, key)
+            self._art_tree[start:start] = entry
+        self._art_sizes[key] = len(entry)
+
+    def _write_root(self) -> str:
+        """A gyökér fa kiírása az aktuális art_data fával."""
+        if self._art_keys:
+            art_tree = self.write_object(b'tree', bytes(self._art_tree), 'art_data')
+            self._root_entries[b'art_data'] = (TREE_MODE, art_tree)
+        else:
+            self._root_entries.pop(b'art_data', None)
+        return self.write_object(b'tree', self._serialize_tree(self._root_entries), '')
+
+    def _write_commit(self, tree: str, when: str, message: str) -> str:
+        identity = self._identity()
+        lines = [f"tree {tree}"]
+        if self._tip:
+            lines.append(f"parent {self._tip}")
+        lines.append(f"author {identity} {when}")
+        lines.append(f"committer {identity} {when}")
+        body = ("\n".join(lines) + f"\n\n{message}\n").encode('utf-8')
+        self._tip = self.write_object(b'commit', body)
+        return self._tip
+
+    # --- BatchCommitter interfész ------------------------------------------------
+
+    def _begin(self) -> str:
+        """Függő állapot indítása: a szülő betöltése, ha még nincs láncolt csúcs."""
+        if not self._pending:
+            ref, parent = self._current_ref()
+            # Ha a branch még a legutóbb általunk írt commit-on áll, a memóriabeli fák érvényesek
+            if parent is None or parent != self._tip:
+                self._load_tip(parent)
+            self._pending_ref = ref
+            self._synced_head = parent
+            self._pending = True
+        return self._pending_ref
+
+    def commit_dates(self, date_counts: Dict[datetime.date, int],
+                     existing_counts: Optional[Dict[datetime.date, int]] = None,
+                     sync: bool = True) -> int:
+        """
+        Létrehozza a commit-okat a megadott dátumokra, git folyamat nélkül.
+
+        Args:
+            date_counts: Dátum -> commit-ok száma
+            existing_counts: Dátum -> már meglévő commit-ok száma (fájl sorszámozáshoz)
+            sync: Azonnal kiírja-e a branch-et és a working tree-t (különben a sync()-nél)
+
+        Returns:
+            int: Létrehozott commit-ok száma
+        """
+        date_counts = {date: count for date, count in date_counts.items() if count > 0}
+        if not date_counts:
+            return 0
+
+        existing_counts = existing_counts or {}
+        with self.instrumentation.phase('write_objects'):
+            self._begin()
+            tree = None
+            for date in sorted(date_counts):
+                when = self._format_date(date)
+                offset = existing_counts.get(date, 0)
+                for i in range(offset, offset + date_counts[date]):
+                    filename = self.entry_path(date, i + 1)
+                    if filename is not None:
+                        blob = self.write_object(b'blob', self.entry_content(date, i + 1).encode('utf-8'))
+                        self._set_art_entry(filename.split('/', 1)[1].encode('utf-8'), BLOB_MODE, blob)
+                        tree = self._write_root()
+                        self._tree_changed = True
+                    elif tree is None:
+                        # Üres commit: a fa a szülőé marad
+                        tree = self._write_root()
+                    self._write_commit(tree, when, f"Art commit for {date}")
+
+        if sync:
+            self.sync()
+        return sum(date_counts.values())
+
+    def commit_removal(self, path: str, message: str) -> Optional[str]:
+        """Egy gyökér szintű útvonal (pl. art_data) törlése egyetlen commit-tal."""
+        self._begin()
+        if path.encode('utf-8') not in self._root_entries:
+            self.sync()
+            return None
+
+        if path == 'art_data':
+            self._clear_art()
+        else:
+            del self._root_entries[path.encode('utf-8')]
+        with self.instrumentation.phase('write_objects'):
+            tree = self._write_root()
+            self._write_commit(tree, self._format_moment(datetime.datetime.now()), message)
+        self._tree_changed = True
+        return self.sync()
+
+    def sync(self) -> Optional[str]:
+        """A ref atomikus frissítése a láncolt csúcsra, majd working tree szinkron (ha a fa változott)."""
+        if not self._pending:
+            return None
+
+        self._pending = False
+        head = self._tip
+        if head and head != self._synced_head:
+            with self.instrumentation.phase('update_ref'):
+                self.update_ref(self._pending_ref, head, self._synced_head, 'push-picasso: art commit-ok')
+
+        if self._tree_changed:
+            with self.instrumentation.phase('worktree_sync'):
+                self._update_worktree(self._synced_head)
+        self._tree_changed = False
+        return head
@@ -0,0 +1,287 @@
+import os
+import zlib
+import struct
+import hashlib
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from .object_writer import ObjectWriter
+
+# Pack objektum típusok
+OBJ_TYPES = {b'commit': 1, b'tree': 2, b'blob': 3, b'tag': 4}
+OBJ_OFS_DELTA = 6
+
+# A delta lánc maximális mélysége (a git pack.depth alapértéke)
+MAX_DELTA_DEPTH = 50
+
+
+def encode_delta(base: bytes, target: bytes) -> bytes:
+    """
+    Git delta a base -> target átmenetre: közös prefix másolása, a változott
+    középső rész beszúrása, közös suffix másolása. Az art fák egy-egy
+    bejegyzéssel bővülnek, így ez a delta majdnem a teljes fát másolja.
+    """
+    prefix = _common_prefix(base, target)
+    limit = min(len(base), len(target)) - prefix
+    suffix = _common_suffix(base, target, limit)
+
+    out = bytearray(_varint(len(base)) + _varint(len(target)))
+    _copy_op(out, 0, prefix)
+    middle = target[prefix:len(target) - suffix]
+    for start in range(0, len(middle), 127):
+        chunk = middle[start:start + 127]
+        out.append(len(chunk))
+        out += chunk
+    _copy_op(out, len(base) - suffix, suffix)
+    return bytes(out)
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """
+    Közös prefix hossza bináris kereséssel. A [0, low) rész már egyezik, így
+    mindig csak az új szakaszt hasonlítjuk (a startswith C sebességgel, start
+    offsettel), és az összes másolás O(n) marad.
+    """
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a.startswith(b[low:middle], low):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int) -> int:
+    """Közös suffix hossza (legfeljebb limit, hogy ne fedje át a prefixet)."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a.endswith(b[len(b) - middle:len(b) - low], 0, len(a) - low):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _varint(value: int) -> bytes:
+    """A delta fejléc méret kódolása (7 bites, little-endian csoportok)."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _copy_op(out: bytearray, offset: int, size: int):
+    """Copy utasítás(ok) a base-ből; egy utasítás legfeljebb 0xffffff bájtot másol."""
+    while size > 0:
+        chunk = min(size, 0xffffff)
+        command = 0x80
+        args = bytearray()
+        for i in range(4):
+            byte = (offset >> (8 * i)) & 0xff
+            if byte:
+                command |= 1 << i
+                args.append(byte)
+        for i in range(3):
+            byte = (chunk >> (8 * i)) & 0xff
+            if byte:
+                command |= 0x10 << i
+                args.append(byte)
+        out.append(command)
+        out += args
+        offset += chunk
+        size -= chunk
+
+
+def _entry_header(obj_type: int, size: int) -> bytes:
+    """Pack bejegyzés fejléc: típus és (tömörítetlen) méret."""
+    out = bytearray()
+    byte = (obj_type << 4) | (size & 0x0f)
+    size >>= 4
+    while size:
+        out.append(byte | 0x80)
+        byte = size & 0x7f
+        size >>= 7
+    out.append(byte)
+    return bytes(out)
+
+
+def _ofs_delta_offset(distance: int) -> bytes:
+    """Az OFS_DELTA base távolságának kódolása (big-endian, +1 eltolásos 7 bites csoportok)."""
+    out = bytearray([distance & 0x7f])
+    distance >>= 7
+    while distance:
+        distance -= 1
+        out.insert(0, 0x80 | (distance & 0x7f))
+        distance >>= 7
+    return bytes(out)
+
+
+class PackWriter(ObjectWriter):
+    """
+    Az ObjectWriter pack-es változata: az objektumok loose fájlok helyett egyetlen
+    packfile-ba kerülnek (v2 .idx indexszel), a fák az előző változatukhoz
+    képest OFS_DELTA-ként, a többi objektum zlib-bel tömörítve.
+
+    A pack a sync()-nél zárul le és kerül az objects/pack könyvtárba, a ref
+    frissítése előtt; így egy több tízezer commit-os art is egyetlen, kicsi
+    pack marad, amit a git közvetlenül, újrapakolás nélkül tud push-olni.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pack = None
+        self._pack_path: Optional[str] = None
+        self._offsets: Dict[str, Tuple[int, int]] = {}  # sha -> (offset, crc32)
+        # Delta alapok kulcsonként: a fa változatok sorszáma és az ősök verme
+        # (sorszám, pack offset, tartalom, lánc mélység)
+        self._delta_counters: Dict[str, int] = {}
+        self._delta_bases: Dict[str, List[Tuple[int, int, bytes, int]]] = {}
+
+    def _open_pack(self):
+        pack_dir = os.path.join(self.common_dir(), 'objects', 'pack')
+        os.makedirs(pack_dir, exist_ok=True)
+        fd, self._pack_path = tempfile.mkstemp(prefix='tmp_pack_', dir=pack_dir)
+        self._pack = os.fdopen(fd, 'w+b')
+        # A fejléc objektum számát a lezáráskor írjuk be
+        self._pack.write(b'PACK' + struct.pack('>II', 2, 0))
+
+    def write_object(self, obj_type: bytes, data: bytes, delta_key: Optional[str] = None) -> str:
+        """Objektum hozzáfűzése a nyitott packhez (fánál delta az előző változathoz)."""
+        digest = hashlib.sha1(b'%s %d\0' % (obj_type, len(data)))
+        digest.update(data)
+        sha = digest.hexdigest()
+        if sha in self._offsets:
+            return sha
+        if self._pack is None:
+            self._open_pack()
+
+        offset = self._pack.tell()
+        base = self._delta_base(delta_key) if delta_key is not None else None
+        depth = 0
+        if base is not None:
+            delta = encode_delta(base[2], data)
+            entry = (_entry_header(OBJ_OFS_DELTA, len(delta)) + _ofs_delta_offset(offset - base[1])
+                     + zlib.compress(delta))
+            depth = base[3] + 1
+        else:
+            entry = _entry_header(OBJ_TYPES[obj_type], len(data)) + zlib.compress(data)
+
+        self._pack.write(entry)
+        self._offsets[sha] = (offset, zlib.crc32(entry))
+        if delta_key is not None:
+            number = self._delta_counters[delta_key] if base is not None else 0
+            self._delta_counters[delta_key] = number + 1
+            self._delta_bases.setdefault(delta_key, []).append((number, offset, data, depth))
+        return sha
+
+    def _delta_base(self, delta_key: str) -> Optional[Tuple[int, int, bytes, int]]:
+        """
+        A k. fa változat delta alapja a k - lowbit(k). változat (Fenwick fa szülő).
+        Így a lánc mélysége popcount(k), azaz legfeljebb log2(k), a delta pedig
+        átlagosan csak néhány bejegyzést szúr be; lineáris láncnál minden
+        MAX_DELTA_DEPTH. fát teljes egészében kellene tárolni.
+        """
+        stack = self._delta_bases.get(delta_key)
+        if not stack:
+            return None
+        number = self._delta_counters[delta_key]
+        parent = number - (number & -number)
+        # A k-1. változat ősei között mindig ott van k szülője
+        while stack and stack[-1][0] > parent:
+            stack.pop()
+        if not stack or stack[-1][3] + 1 > MAX_DELTA_DEPTH:
+            # Új lánc teljes fával
+            self._delta_bases[delta_key] = []
+            return None
+        return stack[-1]
+
+    def finish_pack(self) -> Optional[str]:
+        """
+        A pack lezárása: objektum szám a fejlécbe, SHA-1 trailer, v2 index, majd
+        átnevezés pack-<sha>.pack/.idx névre (előbb a pack, utána az index).
+
+        Returns:
+            A pack sha-ja, vagy None ha nem volt objektum
+        """
+        pack, pack_path = self._pack, self._pack_path
+        self._pack = None
+        self._delta_counters = {}
+        self._delta_bases = {}
+        if pack is None:
+            return None
+
+        offsets, self._offsets = self._offsets, {}
+        with self.instrumentation.phase('write_pack'):
+            pack.seek(8)
+            pack.write(struct.pack('>I', len(offsets)))
+            pack.flush()
+
+            pack.seek(0)
+            digest = hashlib.sha1()
+            for chunk in iter(lambda: pack.read(1 << 20), b''):
+                digest.update(chunk)
+            pack_sha = digest.digest()
+            pack.write(pack_sha)
+            pack.flush()
+            os.fsync(pack.fileno())
+            pack.close()
+
+            base = os.path.join(os.path.dirname(pack_path), f"pack-{pack_sha.hex()}")
+            index = self._build_index(offsets, pack_sha)
+            os.chmod(pack_path, 0o444)
+            os.replace(pack_path, base + '.pack')
+            fd, index_path = tempfile.mkstemp(prefix='tmp_idx_', dir=os.path.dirname(pack_path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(index)
+            os.chmod(index_path, 0o444)
+            os.replace(index_path, base + '.idx')
+        return pack_sha.hex()
+
+    @staticmethod
+    def _build_index(offsets: Dict[str, Tuple[int, int]], pack_sha: bytes) -> bytes:
+        """v2 pack index: fanout tábla, rendezett sha-k, crc32-k, 32 és 64 bites offsetek."""
+        names = sorted(offsets)
+        fanout = [0] * 256
+        for name in names:
+            fanout[int(name[:2], 16)] += 1
+        total = 0
+        for i in range(256):
+            total += fanout[i]
+            fanout[i] = total
+
+        small: List[int] = []
+        large: List[int] = []
+        for name in names:
+            offset = offsets[name][0]
+            if offset < 0x80000000:
+                small.append(offset)
+            else:
+                small.append(0x80000000 | len(large))
+                large.append(offset)
+
+        parts = [b'\xfftOc', struct.pack('>I', 2), struct.pack('>256I', *fanout),
+                 b''.join(bytes.fromhex(name) for name in names),
+                 struct.pack(f'>{len(names)}I', *(offsets[name][1] for name in names)),
+                 struct.pack(f'>{len(small)}I', *small),
+                 struct.pack(f'>{len(large)}Q', *large),
+                 pack_sha]
+        index = b''.join(parts)
+        return index + hashlib.sha1(index).digest()
+
+    def read_object(self, sha: str) -> Optional[Tuple[bytes, bytes]]:
+        """A még nyitott pack objektumai nem olvashatók: előbb le kell zárni."""
+        if sha in self._offsets:
+            self.finish_pack()
+        return super().read_object(sha)
+
+    def sync(self) -> Optional[str]:
+        """A pack lezárása, majd a ref és a working tree frissítése."""
+        if self._pending:
+            self.finish_pack()
+        return super().sync()
@@ -0,0 +1,103 @@
+import os
+import sys
+from typing import List, Optional
+
+from .canvas import Canvas
+
+
+class PreviewRenderer:
+    """A contribution graph előnézete a terminálon (ASCII vagy ANSI színek), git hívások nélkül."""
+
+    # A GitHub contribution graph színei szintenként (0 = üres nap)
+    LEVEL_COLORS = [(235, 237, 240), (155, 233, 168), (64, 196, 99), (48, 161, 78), (33, 110, 57)]
+    LEVEL_SHADES = ["· ", "░░", "▒▒", "▓▓", "██"]
+    DAY_LABELS = ["V ", "H ", "K ", "Sz", "Cs", "P ", "Sz"]
+    MONTH_LABELS = ["Jan", "Feb", "Már", "Ápr", "Máj", "Jún", "Júl", "Aug", "Sze", "Okt", "Nov", "Dec"]
+
+    def __init__(self, git_handler, color: Optional[bool] = None):
+        """
+        Args:
+            git_handler: A grid méretét és dátumait adó GitHandler
+            color: ANSI színek (None esetén automatikus: csak terminálon és NO_COLOR nélkül)
+        """
+        self.git_handler = git_handler
+        if color is None:
+            color = sys.stdout.isatty() and 'NO_COLOR' not in os.environ
+        self.color = color
+
+    @staticmethod
+    def _level_for(value: int, max_level: int) -> int:
+        """Megjelenített szint: a GitHub a legaktívabb naphoz (max_level) viszonyítva árnyal."""
+        if not value:
+            return 0
+        return -(-value * 4 // max_level)
+
+    def _cell(self, level: int, count: int, show_counts: bool) -> str:
+        """Egy cella két karakter szélesen."""
+        if not self.color:
+            if show_counts:
+                if not count:
+                    return " ·"
+                return f"{count:>2}" if count < 100 else "++"
+            return self.LEVEL_SHADES[level]
+
+        red, green, blue = self.LEVEL_COLORS[level]
+        text = "  "
+        if show_counts and count:
+            text = f"{count:>2}" if count < 100 else "++"
+        return f"\033[48;2;{red};{green};{blue}m\033[38;2;0;0;0m{text}\033[0m"
+
+    def _month_header(self, canvas: Canvas) -> str:
+        """Hónap címkék a hetek fölött (ott, ahol egy hónap először jelenik meg; több évnél januárban az évszám)."""
+        grid = self.git_handler.grid
+        multi_year = len(grid.year_starts()) > 2
+        header = ""
+        last_month = None
+        for week, date in enumerate(grid.week_dates(0)[:canvas.width]):
+            month = date.month
+            if month != last_month and len(header) <= week * 2:
+                label = str(date.year) if multi_year and month == 1 else self.MONTH_LABELS[month - 1]
+                header = header.ljust(week * 2) + label
+                last_month = month
+        return header.ljust(canvas.width * 2)[:canvas.width * 2]
+
+    def render_lines(self, canvas: Canvas, show_counts: bool = False) -> List[str]:
+        """Az előnézet sorai: hónap fejléc, 7 nap sor, túllógás jelölőkkel."""
+        clipped_left = {day for week, day in canvas.clipped_cells if week < 0}
+        clipped_right = {day for week, day in canvas.clipped_cells if week >= canvas.width}
+
+        # A legaktívabb nap renderenként egyszer számolódik, nem cellánként
+        max_level = max(canvas.cells, default=0) or 1
+        lines = ["   " + self._month_header(canvas)]
+        for day in range(canvas.height):
+            row = ""
+            for week in range(canvas.width):
+                value = canvas.get(week, day)
+                count = self.git_handler.commits_for_level(value) if value else 0
+                row += self._cell(self._level_for(value, max_level), count, show_counts)
+            label = self.DAY_LABELS[day % 7] if canvas.height == 7 else "  "
+            left = "«" if day in clipped_left else " "
+            right = "»" if day in clipped_right else ""
+            lines.append(f"{label}{left}{row}{right}")
+        return lines
+
+    def show(self, canvas: Canvas, show_counts: bool = False):
+        """Kiírja az előnézetet, a statisztikákat és a levágási figyelmeztetéseket."""
+        start = self.git_handler.start_date
+        end = self.git_handler.end_date
+        date_counts = canvas.to_date_counts(self.git_handler)
+
+        print(f"\n👀 Előnézet (dry-run, git nélkül): {start} - {end}")
+        for line in self.render_lines(canvas, show_counts):
+            print(line)
+
+        legend = ", ".join(f"{self.LEVEL_SHADES[level].strip() or '·'}={self.git_handler.commits_for_level(level)}"
+                           for level in range(1, len(self.LEVEL_SHADES)))
+        print(f"📊 {len(date_counts)} nap, {sum(date_counts.values())} commit (szint=commit/nap: {legend})")
+
+        if canvas.clipped:
+            weeks = sorted({week for week, _ in canvas.clipped_cells})
+            print(f"⚠️  {canvas.clipped} pixel a grid-en kívülre esik és le lesz vágva "
+                  f"(hetek: {weeks[0]}..{weeks[-1]}, a grid: 0..{canvas.width - 1})")
+        else:
+            print("✅ Minden pixel a grid-en belül van.")
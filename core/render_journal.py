@@ -0,0 +1,163 @@
+import os
+import json
+import hashlib
+import datetime
+import subprocess
+from typing import Any, Dict, Iterator, List, Optional
+from .git_session import GitSession
+
+JOURNAL_FILE = 'push-picasso-journal'  # A .git könyvtárban, így a working tree-t nem zavarja
+JOURNAL_VERSION = 1
+JOURNAL_BATCH_COMMITS = 1000  # Ennyi commit után lesz tartós pont (branch frissítés + napló bejegyzés)
+
+
+class RenderJournal:
+    """
+    Összeomlás-biztos, folytatható render napló (write-ahead log) a .git
+    könyvtárban: csak hozzáfűzött JSON sorok, minden bejegyzés után fsync.
+
+        {"type": "plan", "hash": ..., "ref": ..., "base": ..., "dates": {"2024-06-16": 4, ...}}
+        {"type": "batch", "dates": [...], "parent": <HEAD a köteg előtt>}
+        {"type": "done", "head": <HEAD a köteg után>}
+
+    Egy köteg akkor tartós, amikor a branch már rá mutat; a "batch" bejegyzés
+    ezt megelőzi, így ha a program a branch frissítése és a "done" között
+    hal meg, a HEAD-ből kiderül, hogy a köteg bekerült-e. Egy nap commit-jai
+    mindig egy kötegbe esnek. Az újrafuttatás ugyanazzal a tervvel (azonos
+    hash) a kész napokat kihagyja; sikeres futás végén a napló törlődik.
+    """
+
+    def __init__(self, repo_path: str = ".", session: Optional[GitSession] = None):
+        self.repo_path = repo_path
+        self.session = session or GitSession(repo_path)
+        self._path: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(self.session.git_dir(), JOURNAL_FILE)
+        return self._path
+
+    @staticmethod
+    def plan_hash(date_counts: Dict[datetime.date, int], ref: str, storage_mode: str) -> str:
+        """A terv azonosítója: a cél napi commit számok, a branch és a tárolási mód."""
+        payload = json.dumps({'ref': ref, 'storage': storage_mode,
+                              'dates': {str(date): count for date, count in sorted(date_counts.items())}},
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def records(self) -> List[Dict[str, Any]]:
+        """A napló bejegyzései; egy félbe maradt (csonka) utolsó sor kimarad."""
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    def _append(self, record: Dict[str, Any]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _is_ancestor(self, commit: str, head: Optional[str]) -> bool:
+        if head is None:
+            return False
+        if commit == head:
+            return True
+        result = subprocess.run(['git', 'merge-base', '--is-ancestor', commit, head],
+                                capture_output=True, cwd=self.repo_path)
+        return result.returncode == 0
+
+    def start(self, date_counts: Dict[datetime.date, int], ref: str, storage_mode: str,
+              head: Optional[str]) -> Dict[datetime.date, int]:
+        """
+        Egy render megkezdése vagy folytatása.
+
+        Ha a napló ugyanehhez a tervhez tartozik, és a legutóbbi tartós pont még
+        a jelenlegi HEAD őse, a kész napok kimaradnak. Egyébként új napló indul.
+
+        Returns:
+            A még hátralévő napok: dátum -> commit szám
+        """
+        plan = self.plan_hash(date_counts, ref, storage_mode)
+        finished = self._finished_dates(plan, head)
+        if finished is None:
+            self.discard()
+            self._append({'type': 'plan', 'version': JOURNAL_VERSION, 'hash': plan, 'ref': ref,
+                          'storage': storage_mode, 'base': head,
+                          'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                          'dates': {str(date): count for date, count in sorted(date_counts.items())}})
+            return dict(date_counts)
+
+        remaining = {date: count for date, count in date_counts.items() if str(date) not in finished}
+        if finished:
+            print(f"📒 Render napló: {len(finished)} nap már kész egy korábbi futásból, "
+                  f"{len(remaining)} nap van hátra")
+        return remaining
+
+    def _finished_dates(self, plan: str, head: Optional[str]) -> Optional[set]:
+        """A napló szerint kész napok, vagy None, ha a napló nem ehhez a tervhez / history-hoz tartozik."""
+        records = self.records()
+        if not records or records[0].get('type') != 'plan' or records[0].get('hash') != plan \
+                or records[0].get('version') != JOURNAL_VERSION:
+            return None
+
+        finished: set = set()
+        durable = records[0].get('base')
+        pending: Optional[Dict[str, Any]] = None
+        for record in records[1:]:
+            if record.get('type') == 'batch':
+                pending = record
+            elif record.get('type') == 'done' and pending is not None:
+                finished.update(pending['dates'])
+                durable = record['head']
+                pending = None
+
+        if pending is not None and head is not None and head != pending.get('parent'):
+            parent = pending.get('parent')
+            if parent is None or self._is_ancestor(parent, head):
+                # A köteg a branch frissítése után, a "done" bejegyzés előtt szakadt meg: bekerült
+                finished.update(pending['dates'])
+                durable = head
+
+        if durable is not None and not self._is_ancestor(durable, head):
+            # A branch azóta máshova került (pl. clean --rewrite): a napló elavult
+            return None
+        return finished
+
+    def begin_batch(self, dates: List[datetime.date], parent: Optional[str]):
+        """Egy köteg megkezdése (a commit-ok írása előtt)."""
+        self._append({'type': 'batch', 'dates': [str(date) for date in dates], 'parent': parent})
+
+    def end_batch(self, head: Optional[str]):
+        """A köteg tartós: a branch már az új commit-okra mutat."""
+        self._append({'type': 'done', 'head': head})
+
+    def finish(self):
+        """Sikeres render: a napló törlése (egy újabb futás elölről kezd)."""
+        self.discard()
+
+    def discard(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def batches(date_counts: Dict[datetime.date, int], batch_commits: int = JOURNAL_BATCH_COMMITS
+                ) -> Iterator[Dict[datetime.date, int]]:
+        """Időrendi kötegek nagyjából batch_commits commit-tal; egy nap sosem oszlik meg."""
+        batch: Dict[datetime.date, int] = {}
+        size = 0
+        for date in sorted(date_counts):
+            batch[date] = date_counts[date]
+            size += date_counts[date]
+            if size >= batch_commits:
+                yield batch
+                batch, size = {}, 0
+        if batch:
+            yield batch
@@ -1,5 +1,5 @@
 from typing import Optional, Tuple
-from patterns import ShapePatterns
+from patterns import ShapePatterns, CompiledPattern
 
 
 class ShapeRenderer:
@@ -11,6 +11,9 @@ class ShapeRenderer:
     
     def calculate_pattern_dimensions(self, pattern) -> Tuple[int, int]:
         """Kiszámítja egy minta szélességét és magasságát."""
+        if isinstance(pattern, CompiledPattern):
+            return pattern.width, pattern.height
+        
         if not pattern or not pattern[0]:
             return 0, 0
         
@@ -20,7 +23,7 @@ class ShapeRenderer:
         return width, height
     
     def draw_shape(self, shape_name: str, start_week: Optional[int] = None, start_day: Optional[int] = None, 
-                   auto_center: bool = True, compact: bool = None):
+                   auto_center: bool = True, compact: bool = None, intensity: Optional[int] = None):
         """
         Alakzatot rajzol a grid-re.
         
@@ -30,11 +33,14 @@ class ShapeRenderer:
             start_day: Kezdő nap pozíció (None esetén automatikus középre igazítás)
             auto_center: Automatikus középre igazítás engedélyezése
             compact: Nem használt paraméter (backward compatibility)
+            intensity: Intenzitás szint (1-4) a teljes alakzatra (None esetén a minta értékei)
         """
-        shapes = self.shape_patterns.get_patterns()
+        instrumentation = self.git_handler.instrumentation
+        with instrumentation.phase('pattern_lookup'):
+            shapes = self.shape_patterns.get_compiled()
+            shape_pattern = shapes.get(shape_name)
         
-        if shape_name in shapes:
-            shape_pattern = shapes[shape_name]
+        if shape_pattern is not None:
             
             # Automatikus középre igazítás
             if auto_center and (start_week is None or start_day is None):
@@ -54,22 +60,26 @@ class ShapeRenderer:
                 start_day = 0
             
             print(f"🎨 Alakzat rajzolása: {shape_name}")
-            self.git_handler.draw_pattern(shape_pattern, start_week, start_day)
+            with instrumentation.phase('draw'):
+                self.git_handler.draw_pattern(shape_pattern, start_week, start_day, intensity)
         else:
             print(f"❌ Ismeretlen alakzat: {shape_name}")
             print(f"📋 Elérhető alakzatok: {list(shapes.keys())}")
     
     def get_available_shapes(self, compact: bool = None) -> list:
         """Visszaadja az elérhető alakzatok listáját."""
-        return list(self.shape_patterns.get_patterns().keys())
+        return list(self.shape_patterns.get_compiled().keys())
     
     def show_preview(self, pattern):
         """Megjeleníti egy minta előnézetét."""
         print("📋 Előnézet:")
+        # Árnyalás a minta legerősebb cellájához viszonyítva (bináris minta = teli blokk)
+        shades = ["  ", "░░", "▒▒", "▓▓", "██"]
+        max_level = max((max(row) for row in pattern if row), default=0) or 1
         for row in pattern:
             line = ""
             for cell in row:
-                line += "██" if cell == 1 else "  "
+                line += shades[-(-cell * 4 // max_level)] if cell > 0 else "  "
             print(f"   {line}")
     
     def _calculate_centered_position(self, content_width: int, content_height: int) -> Tuple[int, int]:
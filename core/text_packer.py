@@ -0,0 +1,192 @@
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from patterns import CompiledPattern
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Egy szó: glyph-ek (None = ismeretlen karakter) és szélességeik (mint a flow_layout-ban)
+Glyphs = List[Tuple[Optional[CompiledPattern], int]]
+
+NO_PIXEL = 1 << 16  # Üres sor profil értéke: bármilyen valós oszlopnál távolabb van
+
+
+class GlyphMetrics:
+    """
+    Egy glyph szoros befoglaló doboza és soronkénti profilja a lefordított
+    oszlop bitmaszkokból: a legbaloldalibb és legjobboldalibb világító oszlop.
+    """
+
+    __slots__ = ('first', 'last', 'left', 'right')
+
+    def __init__(self, glyph: CompiledPattern):
+        lit = [col for col, mask in enumerate(glyph.columns) if mask]
+        self.first = lit[0] if lit else None  # Szoros doboz: első és utolsó világító oszlop
+        self.last = lit[-1] if lit else None
+        self.left = tuple(next((col for col in lit if glyph.columns[col] >> row & 1), NO_PIXEL)
+                          for row in range(glyph.height))
+        self.right = tuple(next((col for col in reversed(lit) if glyph.columns[col] >> row & 1), -NO_PIXEL)
+                           for row in range(glyph.height))
+
+    @property
+    def empty(self) -> bool:
+        return self.first is None
+
+
+class Kerning:
+    """
+    Pár kerning a lefordított bitmapekből: a következő betű annyira csúszik
+    közelebb, hogy a két betű világító cellái között minden sorban (és a
+    szomszédos sorok között átlósan is) legalább `gap` üres oszlop maradjon.
+    A fix betűköz ennek a felső korlátja, így a kerning sosem szélesít.
+
+    Egy szó összes betűpárja NumPy-jal egyetlen vektorizált lépésben számolódik
+    (ha telepítve van), egyébként páronként, cache-elve.
+    """
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        """
+        Args:
+            use_numpy: NumPy használata (None esetén ha telepítve van)
+        """
+        if use_numpy and numpy is None:
+            raise RuntimeError("A vektorizált kerninghez telepítsd a numpy csomagot (pip install numpy)")
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self._metrics: Dict[CompiledPattern, GlyphMetrics] = {}
+        self._pairs: Dict[Tuple[CompiledPattern, CompiledPattern, int], int] = {}
+
+    def metrics(self, glyph: CompiledPattern) -> GlyphMetrics:
+        metrics = self._metrics.get(glyph)
+        if metrics is None:
+            metrics = self._metrics[glyph] = GlyphMetrics(glyph)
+        return metrics
+
+    def _kernable(self, glyph: Optional[CompiledPattern]) -> bool:
+        return glyph is not None and not self.metrics(glyph).empty
+
+    def pair(self, left: CompiledPattern, right: CompiledPattern, gap: int = 1) -> int:
+        """A jobb oldali betű kezdő oszlopa a bal oldaliéhoz képest (két nem üres glyph-re)."""
+        key = (left, right, gap)
+        advance = self._pairs.get(key)
+        if advance is None:
+            a, b = self.metrics(left), self.metrics(right)
+            # A jobb betű szoros doboza legalább egy oszloppal a bal betűé után kezdődik
+            advance = a.first - b.first + 1
+            for row, edge in enumerate(a.right):
+                for near in range(max(0, row - 1), min(len(b.left), row + 2)):
+                    advance = max(advance, edge - b.left[near] + 1 + gap)
+            self._pairs[key] = advance
+        return advance
+
+    def advances(self, glyphs: Glyphs, letter_spacing: int = 1) -> List[int]:
+        """
+        A szó egymást követő glyph-jei közötti lépésközök (len(glyphs) - 1 darab).
+        Üres glyph (pl. szóköz) vagy ismeretlen karakter mellett a fix betűköz marad.
+        """
+        advances = [width + letter_spacing for _, width in glyphs[:-1]]
+        pairs = [index for index in range(len(glyphs) - 1)
+                 if self._kernable(glyphs[index][0]) and self._kernable(glyphs[index + 1][0])]
+        if not pairs:
+            return advances
+        if self.use_numpy and len(pairs) > 1:
+            kerned = self._advances_numpy([glyphs[index][0] for index in pairs],
+                                          [glyphs[index + 1][0] for index in pairs], letter_spacing)
+        else:
+            kerned = [self.pair(glyphs[index][0], glyphs[index + 1][0], letter_spacing) for index in pairs]
+        for index, advance in zip(pairs, kerned):
+            advances[index] = advance
+        return advances
+
+    def _advances_numpy(self, lefts: Sequence[CompiledPattern], rights: Sequence[CompiledPattern],
+                        gap: int) -> List[int]:
+        """Az összes pár egyszerre: (pár, sor) profil mátrixok, a szomszédos sorok eltolással."""
+        height = max(glyph.height for glyph in list(lefts) + list(rights))
+
+        def profiles(glyphs, side, fill):
+            matrix = numpy.full((len(glyphs), height + 2), fill, dtype=numpy.int64)
+            for index, glyph in enumerate(glyphs):
+                profile = getattr(self.metrics(glyph), side)
+                matrix[index, 1:len(profile) + 1] = profile
+            return matrix
+
+        right = profiles(lefts, 'right', -NO_PIXEL)[:, 1:-1]
+        left = profiles(rights, 'left', NO_PIXEL)
+        # Minden sor a saját, a fölötte és az alatta lévő sorral vetve össze
+        nearest = numpy.minimum(numpy.minimum(left[:, :-2], left[:, 1:-1]), left[:, 2:])
+        advance = (right - nearest).max(axis=1) + 1 + gap
+        firsts = numpy.array([self.metrics(a).first - self.metrics(b).first + 1
+                              for a, b in zip(lefts, rights)], dtype=numpy.int64)
+        return numpy.maximum(advance, firsts).tolist()
+
+    def layout(self, glyphs: Glyphs, letter_spacing: int = 1) -> Tuple[List[int], int]:
+        """
+        Egy szó glyph-jeinek kezdő oszlopai és a szó szoros szélessége: a szó az
+        első világító oszlopnál kezdődik és az utolsónál ér véget.
+        """
+        if not glyphs:
+            return [], 0
+        first = glyphs[0][0]
+        current = -self.metrics(first).first if self._kernable(first) else 0
+        offsets = [current]
+        for advance in self.advances(glyphs, letter_spacing):
+            current += advance
+            offsets.append(current)
+        end = 0
+        for (glyph, width), offset in zip(glyphs, offsets):
+            end = max(end, offset + (self.metrics(glyph).last + 1 if self._kernable(glyph) else width))
+        return offsets, end
+
+
+class PackingOption:
+    """Egy tömörítési fokozat: betűköz, kerning, szóköz szélesség és font."""
+
+    __slots__ = ('label', 'letter_spacing', 'kerning', 'space_width', 'font')
+
+    def __init__(self, label: str, letter_spacing: int = 1, kerning: bool = False,
+                 space_width: Optional[int] = None, font: Optional[str] = None):
+        self.label = label
+        self.letter_spacing = letter_spacing
+        self.kerning = kerning
+        self.space_width = space_width  # None: a font szóköz glyph-je
+        self.font = font  # None: a beállított font
+
+    def with_font(self, font: str) -> 'PackingOption':
+        return PackingOption(f"{self.label}, {font} font", self.letter_spacing, self.kerning,
+                             self.space_width, font)
+
+    def __repr__(self) -> str:
+        return f"PackingOption({self.label})"
+
+
+# Egyre sűrűbb fokozatok; az első, amivel a szöveg elfér, nyer (a lazább jobban olvasható)
+PACKING_OPTIONS = (
+    PackingOption('alap'),
+    PackingOption('kerning', kerning=True),
+    PackingOption('kerning, keskeny szóköz', kerning=True, space_width=1),
+)
+
+
+class TextPacker:
+    """
+    A legsűrűbb még szükséges elrendezés keresése: a fokozatok lazától a
+    szorosig (előbb a beállított fonttal, utána a kisebb beépített fontokkal)
+    mérődnek le, és az első, amivel a szöveg elfér a grid-en, nyer.
+    """
+
+    def __init__(self, kerning: Optional[Kerning] = None,
+                 options: Sequence[PackingOption] = PACKING_OPTIONS):
+        self.kerning = kerning or Kerning()
+        self.options = tuple(options)
+
+    def candidates(self, fonts: Mapping[str, Mapping[str, CompiledPattern]]) -> List[PackingOption]:
+        """Az összes fokozat: a beállított fonttal, majd a megadott tartalék fontokkal."""
+        candidates = list(self.options)
+        for font in fonts:
+            candidates.extend(option.with_font(font) for option in self.options)
+        return candidates
+
+    @staticmethod
+    def covers(glyphs: Mapping[str, CompiledPattern], text: str) -> bool:
+        """A font tartalmazza-e a szöveg összes (nem szóköz) karakterét."""
+        return all(char in glyphs for char in text.upper() if not char.isspace())
@@ -1,33 +1,43 @@
 from typing import List, Optional, Tuple
-from patterns import AlphabetPatterns
+from patterns import AlphabetPatterns, FontLoader
+from patterns.alphabet import DEFAULT_FONT
+from .flow_layout import UNKNOWN_CHAR_WIDTH
 
 
 class TextRenderer:
     """Szöveg renderelésért felelős osztály."""
     
-    def __init__(self, git_handler):
+    def __init__(self, git_handler, font: Optional[str] = None):
+        """
+        Args:
+            git_handler: A GitHandler példány
+            font: Beépített font név (pl. mini3, classic7) vagy BDF/PSF/JSON fájl útvonala
+                  (None esetén a beépített 5 sor magas ábécé)
+        """
         self.git_handler = git_handler
-        self.alphabet_patterns = AlphabetPatterns()
+        if font is None or font == DEFAULT_FONT:
+            self.alphabet_patterns = AlphabetPatterns()
+        else:
+            self.alphabet_patterns = FontLoader().load(font)
+    
+    @property
+    def line_height(self) -> int:
+        """A font magassága (egy szövegsor magassága)."""
+        return self.alphabet_patterns.height
     
     def calculate_text_dimensions(self, text: str, letter_spacing: int = 1, compact: bool = None) -> Tuple[int, int]:
-        """Kiszámítja egy szöveg teljes szélességét és magasságát."""
+        """
+        Kiszámítja egy szöveg teljes szélességét és magasságát, ugyanúgy lépve,
+        ahogy a write_text rajzol: minden karakter (az ismeretlen is, UNKNOWN_CHAR_WIDTH
+        szélesen) egy helyet foglal, és csak a karakterek között van betűköz.
+        """
         if not text:
             return 0, 0
         
-        alphabet = self.alphabet_patterns.get_patterns()
-        total_width = 0
-        height = 5  # Egységes 5 pixel magas
-        
-        for i, char in enumerate(text.upper()):
-            if char in alphabet:
-                letter_width = len(alphabet[char][0])  # 4 pixel széles
-                total_width += letter_width
-                
-                # Betűköz hozzáadása (kivéve az utolsó betű után)
-                if i < len(text) - 1:
-                    total_width += letter_spacing
-        
-        return total_width, height
+        glyphs = self.alphabet_patterns.get_compiled()
+        widths = [glyph.width if glyph is not None else UNKNOWN_CHAR_WIDTH
+                  for glyph in map(glyphs.get, text.upper())]
+        return sum(widths) + letter_spacing * (len(widths) - 1), self.line_height
     
     def calculate_multiline_text_dimensions(self, lines: List[str], letter_spacing: int = 1, 
                                           line_spacing: int = 1, compact: bool = None) -> Tuple[int, int]:
@@ -37,7 +47,7 @@ class TextRenderer:
         
         max_width = 0
         total_height = 0
-        line_height = 5  # Egységes 5 pixel magas
+        line_height = self.line_height
         
         for i, line in enumerate(lines):
             line_width, _ = self.calculate_text_dimensions(line, letter_spacing)
@@ -50,7 +60,8 @@ class TextRenderer:
         return max_width, total_height
     
     def write_text(self, text: str, start_week: Optional[int] = None, start_day: Optional[int] = None, 
-                   letter_spacing: int = 1, auto_center: bool = True, compact: bool = None):
+                   letter_spacing: int = 1, auto_center: bool = True, compact: bool = None,
+                   intensity: Optional[int] = None):
         """
         Szöveget ír ki a grid-re.
         
@@ -61,8 +72,12 @@ class TextRenderer:
             letter_spacing: Betűk közötti távolság
             auto_center: Automatikus középre igazítás engedélyezése
             compact: Nem használt paraméter (backward compatibility)
+            intensity: Intenzitás szint (1-4) a betűkhöz (None esetén a minta értékei)
         """
-        alphabet = self.alphabet_patterns.get_patterns()
+        instrumentation = self.git_handler.instrumentation
+        with instrumentation.phase('pattern_lookup'):
+            glyphs = self.alphabet_patterns.get_compiled()
+            resolved = [(char, glyphs.get(char)) for char in text.upper()]
         
         # Automatikus középre igazítás
         if auto_center and (start_week is None or start_day is None):
@@ -85,19 +100,20 @@ class TextRenderer:
         
         print(f"📝 Szöveg kiírása: '{text}'")
         
-        for char in text.upper():
-            if char in alphabet:
-                pattern = alphabet[char]
-                self.git_handler.draw_pattern(pattern, current_week, start_day)
-                current_week += len(pattern[0]) + letter_spacing
-            else:
-                print(f"⚠️  Ismeretlen karakter: {char}")
-                current_week += 4  # Hely az ismeretlen karakternek (4 széles)
+        with instrumentation.phase('draw'):
+            for char, glyph in resolved:
+                if glyph is not None:
+                    self.git_handler.draw_pattern(glyph, current_week, start_day, intensity)
+                    current_week += glyph.width + letter_spacing
+                else:
+                    print(f"⚠️  Ismeretlen karakter: {char}")
+                    current_week += UNKNOWN_CHAR_WIDTH + letter_spacing  # Hely az ismeretlen karakternek
         
         print(f"✅ Szöveg kiírása befejezve!")
     
     def write_multiline_text(self, lines: List[str], start_week: Optional[int] = None, start_day: Optional[int] = None, 
-                           letter_spacing: int = 1, line_spacing: int = 1, auto_center: bool = True, compact: bool = None):
+                           letter_spacing: int = 1, line_spacing: int = 1, auto_center: bool = True, compact: bool = None,
+                           intensity: Optional[int] = None):
         """
         Többsoros szöveget ír ki.
         
@@ -109,6 +125,7 @@ class TextRenderer:
             line_spacing: Sorok közötti távolság
             auto_center: Automatikus középre igazítás engedélyezése
             compact: Nem használt paraméter (backward compatibility)
+            intensity: Intenzitás szint (1-4) a betűkhöz (None esetén a minta értékei)
         """
         # Automatikus középre igazítás
         if auto_center and (start_week is None or start_day is None):
@@ -132,11 +149,11 @@ class TextRenderer:
         for i, line in enumerate(lines):
             print(f"📝 Sor {i+1}: '{line}'")
             # Kikapcsoljuk az automatikus központosítást az egyes soroknál, mert már mi kezeljük
-            self.write_text(line, start_week, current_day, letter_spacing, auto_center=False)
-            line_height = 5  # Egységes 5 pixel magas
-            current_day += line_height + line_spacing
+            self.write_text(line, start_week, current_day, letter_spacing, auto_center=False,
+                            intensity=intensity)
+            current_day += self.line_height + line_spacing
             
-            if current_day + 5 > self.git_handler.grid_height:  # Ellenőrzés: van-e hely a következő sornak
+            if current_day + self.line_height > self.git_handler.grid_height:  # Ellenőrzés: van-e hely a következő sornak
                 print("⚠️  Figyelem: A következő sor túlnyúlik a grid magasságán!")
                 break
     
@@ -0,0 +1,157 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Elem típusok
+TEXT = 'text'
+SHAPE = 'shape'
+BREAK = 'break'
+
+# Direktívák: {intensity=N} (N = 1-4, vagy auto a minta saját szintjeihez), {br} sortörés
+DIRECTIVES = ('intensity', 'br')
+MAX_INTENSITY = 4
+
+# Ennyi alakzat készlet tokenizer-ét tartjuk meg (a job-onkénti kép alakzatok miatt
+# a készletek száma egy hosszú futásban nem korlátos)
+TOKENIZER_CACHE_SIZE = 32
+
+
+class Element:
+    """
+    A prompt egy eleme: szöveg, alakzat vagy sortörés.
+
+    Szótárként is olvasható (element['type'], element.get('intensity')), így a
+    korábbi, dict elemeket váró kód változatlanul működik.
+    """
+
+    __slots__ = ('type', 'content', 'intensity', 'space_before')
+
+    def __init__(self, type: str, content: str = '', intensity: Optional[int] = None, space_before: int = 0):
+        self.type = type
+        self.content = content
+        self.intensity = intensity
+        self.space_before = space_before  # Az elem előtti szóközök száma (explicit térköz)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Element):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Element({self.type}, {self.content!r}, intensity={self.intensity}, space_before={self.space_before})"
+
+
+class Tokenizer:
+    """
+    A prompt nyelv lefordított tokenizere.
+
+    Nyelv:
+        "heart"          alakzat (csak az ismert alakzat nevek; más idézőjeles szöveg sima szöveg)
+        \\" \\{ \\\\        escape-elt idézőjel, kapcsos zárójel, backslash
+        {intensity=3}    a következő elemek intenzitás szintje (1-4); {intensity=auto} visszaállítja
+        {br} vagy újsor  sortörés (a banner / wrap elrendezés új sort kezd)
+
+    A szöveg belső szóközei megmaradnak, az elemek közötti szóközök száma az
+    elem space_before mezőjébe kerül. A regex alakzat készletenként egyszer
+    fordul le (korlátos LRU cache), így sok ezer prompt sem fordítja újra, és
+    a job-onként regisztrált kép alakzatok sem halmozódnak fel egy hosszú futásban.
+    """
+
+    def __init__(self, shape_names: Sequence[str]):
+        self.shape_names = tuple(shape_names)
+        # Hosszabb név előre, hogy a közös prefixű nevek se ütközzenek
+        shapes = '|'.join(re.escape(name) for name in sorted(self.shape_names, key=len, reverse=True))
+        self.pattern = re.compile(
+            r'\\(?P<escape>.)'
+            + (r'|"(?P<shape>' + shapes + r')"' if shapes else '')
+            + r'|\{(?P<directive>[a-z_]+)(?:=(?P<value>[^}]*))?\}'
+            + r'|(?P<space>\s+)'
+            + r'|(?P<text>[^\\"{\s]+|["{\\])',
+            re.DOTALL,
+        )
+
+    @classmethod
+    def for_shapes(cls, shape_names: Sequence[str]) -> 'Tokenizer':
+        """A megadott alakzat készlethez tartozó (cache-elt) tokenizer."""
+        return cls._compiled(tuple(shape_names))
+
+    @classmethod
+    @lru_cache(maxsize=TOKENIZER_CACHE_SIZE)
+    def _compiled(cls, shape_names: Tuple[str, ...]) -> 'Tokenizer':
+        return cls(shape_names)
+
+    def tokenize(self, text: str) -> Iterator[Element]:
+        """Az elemek generátora, balról jobbra."""
+        buffer: List[str] = []
+        space = ''  # A legutóbbi szövegdarab vagy elem utáni, még el nem számolt térköz
+        space_before = 0
+        intensity: Optional[int] = None
+        after_directive = False  # A direktíva két oldalán álló szóköz csak egyszer számít
+
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == 'space':
+                if after_directive and space and '\n' not in match.group('space'):
+                    continue
+                if '\n' in match.group('space'):
+                    if buffer:
+                        yield Element(TEXT, ''.join(buffer), intensity, space_before)
+                        buffer = []
+                    yield Element(BREAK, intensity=intensity)
+                    space = ''
+                else:
+                    space += match.group('space')
+                continue
+
+            after_directive = False
+            if kind in ('text', 'escape'):
+                if buffer:
+                    buffer.append(space)
+                else:
+                    space_before = len(space)
+                buffer.append(match.group(kind))
+                space = ''
+                continue
+
+            # Alakzat vagy direktíva: a függő szöveg lezárul
+            if buffer:
+                yield Element(TEXT, ''.join(buffer), intensity, space_before)
+                buffer = []
+            if kind == 'shape':
+                yield Element(SHAPE, match.group('shape'), intensity, len(space))
+                space = ''
+            elif match.group('directive') == 'br':
+                yield Element(BREAK, intensity=intensity)
+                space = ''
+            else:
+                intensity = self._directive(match.group('directive'), match.group('value'), intensity)
+                after_directive = True
+
+        if buffer:
+            yield Element(TEXT, ''.join(buffer), intensity, space_before)
+
+    @staticmethod
+    def _directive(name: str, value: Optional[str], intensity: Optional[int]) -> Optional[int]:
+        """Egy direktíva alkalmazása; visszaadja az új intenzitás beállítást."""
+        if name != 'intensity':
+            raise ValueError(f"Ismeretlen direktíva: {{{name}}} (lehetséges: {', '.join(DIRECTIVES)})")
+        if value is None or value.strip() in ('', 'auto'):
+            return None
+        try:
+            level = int(value)
+        except ValueError:
+            level = 0
+        if not 1 <= level <= MAX_INTENSITY:
+            raise ValueError(f"Hibás intenzitás: {value} (1-{MAX_INTENSITY} vagy auto)")
+        return level
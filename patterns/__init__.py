@@ -4,5 +4,7 @@ Patterns modul - Alfabetikus és alakzat minták kezelése.
 
 from .alphabet import AlphabetPatterns
 from .shapes import ShapePatterns
+from .compiled import CompiledPattern, as_compiled
+from .font_loader import CompiledFont, FontLoader
 
-__all__ = ['AlphabetPatterns', 'ShapePatterns'] 
\ No newline at end of file
+__all__ = ['AlphabetPatterns', 'ShapePatterns', 'CompiledPattern', 'as_compiled', 'CompiledFont', 'FontLoader'] 
\ No newline at end of file
@@ -1,10 +1,49 @@
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+from .compiled import CompiledPattern, compile_patterns, freeze_patterns
+from .font_loader import FontLoader
+
+DEFAULT_FONT = 'standard5'  # A beépített ábécé kiegészítése (számjegyek, írásjelek, ékezetes betűk)
 
 
 class AlphabetPatterns:
     """Alfabetikus karakterek mintáit kezelő osztály."""
     
-    def get_patterns(self, compact: bool = None) -> Dict[str, List[List[int]]]:
+    height = 5  # Egységes 5 pixel magas
+    _patterns: Optional[Mapping[str, Tuple[Tuple[int, ...], ...]]] = None
+    _compiled: Optional[Mapping[str, CompiledPattern]] = None
+    
+    def get_patterns(self, compact: bool = None) -> Mapping[str, Tuple[Tuple[int, ...], ...]]:
+        """
+        Egységes 5 magas karakterek (folyamatonként egyszer felépítve, csak olvasható): a
+        beépített 5x4-es ábécé, kiegészítve a standard5 font számjegyeivel, írásjeleivel és
+        magyar ékezetes betűivel.
+        """
+        cls = type(self)
+        if cls._patterns is None:
+            patterns = dict(self._extra_patterns())
+            patterns.update(freeze_patterns(self._build_patterns()))
+            cls._patterns = MappingProxyType(patterns)
+        return cls._patterns
+    
+    @staticmethod
+    def _extra_patterns() -> Mapping[str, Tuple[Tuple[int, ...], ...]]:
+        """A standard5 font glyph-jei; ha a font nem tölthető be, csak a beépített ábécé marad."""
+        try:
+            font = FontLoader().load(DEFAULT_FONT)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  A {DEFAULT_FONT} font nem tölthető be: {e}")
+            return {}
+        return font.get_patterns()
+    
+    def get_compiled(self) -> Mapping[str, CompiledPattern]:
+        """Előre lefordított minták (bitmaszkok és világító cella offsetek)."""
+        cls = type(self)
+        if cls._compiled is None:
+            cls._compiled = compile_patterns(self.get_patterns())
+        return cls._compiled
+    
+    def _build_patterns(self) -> Dict[str, List[List[int]]]:
         """Egységes 5x4-es (5 magas, 4 széles) alfabetikus karakterek."""
         return {
             'A': [
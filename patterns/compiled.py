@@ -0,0 +1,60 @@
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+
+
+class CompiledPattern:
+    """Előre lefordított, megváltoztathatatlan minta (glyph vagy alakzat)."""
+
+    __slots__ = ('width', 'height', 'rows', 'columns', 'offsets')
+
+    def __init__(self, rows: Tuple[Tuple[int, ...], ...]):
+        self.rows = rows
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        # Oszloponkénti bitmaszk: az r. bit a minta r. sorát jelöli
+        self.columns = tuple(
+            sum(1 << row_idx for row_idx, row in enumerate(rows) if row[col_idx])
+            for col_idx in range(self.width)
+        )
+        # Világító cellák (dx, dy, érték) sorfolytonos sorrendben
+        self.offsets = tuple(
+            (col_idx, row_idx, cell)
+            for row_idx, row in enumerate(rows)
+            for col_idx, cell in enumerate(row)
+            if cell
+        )
+
+    def __iter__(self):
+        """Sorok bejárása, mint egy listás mintánál."""
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.width}x{self.height}, {len(self.offsets)} pixel)"
+
+
+def freeze_pattern(pattern: List[List[int]]) -> Tuple[Tuple[int, ...], ...]:
+    """Listás mintából tuple-ökből álló, megváltoztathatatlan minta."""
+    return tuple(tuple(row) for row in pattern)
+
+
+def freeze_patterns(patterns: Dict[str, List[List[int]]]) -> Mapping[str, Tuple[Tuple[int, ...], ...]]:
+    """Minta szótár megváltoztathatatlan változata."""
+    return MappingProxyType({name: freeze_pattern(pattern) for name, pattern in patterns.items()})
+
+
+def compile_patterns(patterns: Mapping[str, Tuple[Tuple[int, ...], ...]]) -> Mapping[str, CompiledPattern]:
+    """Minta szótár lefordítása CompiledPattern objektumokká."""
+    return MappingProxyType({name: CompiledPattern(rows) for name, rows in patterns.items()})
+
+
+def as_compiled(pattern) -> CompiledPattern:
+    """Bármilyen mintát CompiledPattern-né alakít (a lefordítottat változatlanul adja vissza)."""
+    if isinstance(pattern, CompiledPattern):
+        return pattern
+    return CompiledPattern(freeze_pattern(pattern))
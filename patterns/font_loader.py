@@ -0,0 +1,340 @@
+import os
+import json
+import mmap
+import struct
+import hashlib
+import tempfile
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+from .compiled import CompiledPattern
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')  # A beépített JSON fontok
+FONT_EXTENSIONS = ('.json', '.bdf', '.psf', '.psfu')
+MAX_FONT_HEIGHT = 16  # Oszloponként egy 16 bites maszk
+
+# Bináris cache: fejléc, codepoint szerint rendezett index, majd a glyph-ek adatai
+CACHE_MAGIC = b'PPFC'
+CACHE_VERSION = 1
+HEADER = struct.Struct('<4sHHI')  # magic, verzió, magasság, glyph-ek száma
+ENTRY = struct.Struct('<IIHH')  # codepoint, adat offset, szélesség, flag-ek
+FLAG_LEVELS = 1  # A glyph-nek 1-től eltérő intenzitás szintjei is vannak (cellánként egy bájt)
+
+PSF1_MAGIC = b'\x36\x04'
+PSF2_MAGIC = b'\x72\xb5\x4a\x86'
+
+# Egy glyph: sorok tuple-je (cellaértékek: 0 = üres, 1-4 = intenzitás szint)
+Rows = Tuple[Tuple[int, ...], ...]
+
+
+def cache_dir() -> str:
+    """A font cache könyvtára ($XDG_CACHE_HOME/push-picasso/fonts, alapból ~/.cache alatt)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'push-picasso', 'fonts')
+
+
+class CompiledFont(Mapping):
+    """
+    Lefordított font a bináris cache fölött: karakter -> CompiledPattern.
+
+    A cache fájl mmap-elve van, a glyph-ek csak az első használatkor
+    dekódolódnak (bináris keresés a codepoint indexben), így egy nagy
+    Unicode font betöltése sem függ a glyph-ek számától.
+    """
+
+    def __init__(self, buffer, name: str = ''):
+        magic, version, self.height, self._count = HEADER.unpack_from(buffer, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError("Érvénytelen font cache")
+        self.name = name
+        self._buffer = buffer
+        self._decoded: Dict[str, CompiledPattern] = {}
+
+    def _entry(self, index: int) -> Tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self._buffer, HEADER.size + index * ENTRY.size)
+
+    def _find(self, codepoint: int) -> Optional[Tuple[int, int, int, int]]:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._entry(middle)
+            if entry[0] < codepoint:
+                low = middle + 1
+            elif entry[0] > codepoint:
+                high = middle
+            else:
+                return entry
+        return None
+
+    def _decode(self, width: int, offset: int, flags: int) -> CompiledPattern:
+        masks = struct.unpack_from(f'<{width}H', self._buffer, offset)
+        if flags & FLAG_LEVELS:
+            levels = self._buffer[offset + 2 * width:offset + 2 * width + width * self.height]
+            rows = tuple(tuple(levels[row * width:(row + 1) * width]) for row in range(self.height))
+        else:
+            rows = tuple(tuple((mask >> row) & 1 for mask in masks) for row in range(self.height))
+        return CompiledPattern(rows)
+
+    def __getitem__(self, char: str) -> CompiledPattern:
+        glyph = self._decoded.get(char)
+        if glyph is None:
+            entry = self._find(ord(char)) if isinstance(char, str) and len(char) == 1 else None
+            if entry is None:
+                raise KeyError(char)
+            _, offset, width, flags = entry
+            glyph = self._decoded[char] = self._decode(width, offset, flags)
+        return glyph
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield chr(self._entry(index)[0])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"CompiledFont({self.name!r}, {self.height} sor, {self._count} glyph)"
+
+    # Az AlphabetPatterns-szel azonos felület, így a TextRenderer bármelyiket használhatja
+    def get_compiled(self) -> Mapping:
+        return self
+
+    def get_patterns(self, compact: bool = None) -> Dict[str, Rows]:
+        return {char: self[char].rows for char in self}
+
+
+class FontLoader:
+    """
+    Bitmap fontok betöltése: egyszerű JSON glyph formátum, BDF és PSF (1 és 2).
+
+    Minden font egyszer fordul le egy bináris cache fájlba (oszloponkénti
+    bitmaszkok), aminek a neve a forrásfájl tartalmának hash-e; a következő
+    indításkor a cache fájl mmap-elve töltődik be, parse-olás nélkül.
+
+    JSON formátum (a sorok karakterei: '.' vagy szóköz = üres, '#' = 1, '1'-'4' = szint):
+
+        {"name": "mini3", "height": 3, "glyphs": {"A": [".#.", "###", "#.#"], ...}}
+    """
+
+    _loaded: Dict[str, CompiledFont] = {}  # Folyamatonként egyszer: cache kulcs -> font
+
+    def __init__(self, cache_path: Optional[str] = None):
+        """
+        Args:
+            cache_path: A cache könyvtár (None esetén az XDG cache könyvtár)
+        """
+        self.cache_path = cache_path or cache_dir()
+
+    @staticmethod
+    def available() -> List[str]:
+        """A beépített fontok nevei (a patterns/fonts könyvtár JSON fájljai)."""
+        if not os.path.isdir(FONT_DIR):
+            return []
+        return sorted(os.path.splitext(name)[0] for name in os.listdir(FONT_DIR) if name.endswith('.json'))
+
+    @staticmethod
+    def resolve(font: str) -> str:
+        """Beépített font név vagy fájl útvonal feloldása."""
+        if os.path.isfile(font):
+            return font
+        builtin = os.path.join(FONT_DIR, font + '.json')
+        if os.path.isfile(builtin):
+            return builtin
+        raise ValueError(f"Ismeretlen font: {font} (beépített: {', '.join(FontLoader.available())}, "
+                         f"vagy egy {'/'.join(FONT_EXTENSIONS)} fájl útvonala)")
+
+    def load(self, font: str) -> CompiledFont:
+        """Font betöltése a cache-ből, vagy lefordítása és cache-elése."""
+        path = self.resolve(font)
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = hashlib.sha256(data).hexdigest()[:32]
+        name = os.path.splitext(os.path.basename(path))[0]
+        loaded = self._loaded.get(key)
+        if loaded is not None:
+            return loaded
+
+        cache_file = os.path.join(self.cache_path, f"{key}.v{CACHE_VERSION}.ppfc")
+        loaded = self._open_cache(cache_file, name)
+        if loaded is None:
+            height, glyphs = self.parse(path, data)
+            packed = self.pack(height, glyphs)
+            self._write_cache(cache_file, packed)
+            loaded = self._open_cache(cache_file, name) or CompiledFont(packed, name)
+        self._loaded[key] = loaded
+        return loaded
+
+    @staticmethod
+    def _open_cache(cache_file: str, name: str) -> Optional[CompiledFont]:
+        try:
+            with open(cache_file, 'rb') as f:
+                # A leképezés a fájl lezárása után is érvényes marad
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return CompiledFont(buffer, name)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @staticmethod
+    def _write_cache(cache_file: str, packed: bytes):
+        """Atomikus írás (ideiglenes fájl + átnevezés); írhatatlan cache esetén csak memóriában él."""
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(packed)
+            os.replace(temp_path, cache_file)
+        except OSError:
+            pass
+
+    # --- Fordítás --------------------------------------------------------------
+
+    @staticmethod
+    def pack(height: int, glyphs: Dict[str, Rows]) -> bytes:
+        """A glyph-ek bináris cache formátuma: oszloponkénti bitmaszkok (és ha kell, szintek)."""
+        if height > MAX_FONT_HEIGHT:
+            raise ValueError(f"A font legfeljebb {MAX_FONT_HEIGHT} sor magas lehet ({height})")
+        ordered = sorted(glyphs.items(), key=lambda item: ord(item[0]))
+        index = []
+        data = []
+        offset = HEADER.size + ENTRY.size * len(ordered)
+        for char, rows in ordered:
+            width = len(rows[0]) if rows else 0
+            masks = [sum(1 << row for row in range(height) if rows[row][column]) for column in range(width)]
+            chunk = struct.pack(f'<{width}H', *masks)
+            flags = 0
+            if any(cell > 1 for row in rows for cell in row):
+                flags |= FLAG_LEVELS
+                chunk += bytes(cell for row in rows for cell in row)
+            index.append(ENTRY.pack(ord(char), offset, width, flags))
+            data.append(chunk)
+            offset += len(chunk)
+        return HEADER.pack(CACHE_MAGIC, CACHE_VERSION, height, len(ordered)) + b''.join(index) + b''.join(data)
+
+    @classmethod
+    def parse(cls, path: str, data: bytes) -> Tuple[int, Dict[str, Rows]]:
+        """A forrásfájl feldolgozása: (magasság, karakter -> sorok)."""
+        if data.startswith(PSF1_MAGIC) or data.startswith(PSF2_MAGIC):
+            return cls._parse_psf(data)
+        if data.lstrip().startswith(b'STARTFONT'):
+            return cls._parse_bdf(data.decode('latin-1'))
+        if path.lower().endswith('.json') or data.lstrip().startswith(b'{'):
+            return cls._parse_json(data.decode('utf-8'))
+        raise ValueError(f"Ismeretlen font formátum: {path} (JSON, BDF vagy PSF)")
+
+    @staticmethod
+    def _parse_json(text: str) -> Tuple[int, Dict[str, Rows]]:
+        font = json.loads(text)
+        height = int(font['height'])
+        glyphs: Dict[str, Rows] = {}
+        for char, lines in font['glyphs'].items():
+            if len(char) != 1:
+                raise ValueError(f"A glyph kulcsa egyetlen karakter legyen: {char!r}")
+            if len(lines) != height or len({len(line) for line in lines}) > 1:
+                raise ValueError(f"A(z) {char!r} glyph nem {height} egyforma hosszú sorból áll")
+            glyphs[char] = tuple(
+                tuple(int(cell) if cell in '1234' else (1 if cell == '#' else 0) for cell in line)
+                for line in lines)
+        return height, glyphs
+
+    @staticmethod
+    def _parse_bdf(text: str) -> Tuple[int, Dict[str, Rows]]:
+        """BDF: a glyph-ek a FONTBOUNDINGBOX magasságú cellába, az alapvonalhoz igazítva kerülnek."""
+        height = ascent = 0
+        glyphs: Dict[str, Rows] = {}
+        lines = iter(text.splitlines())
+        for line in lines:
+            fields = line.split()
+            if not fields:
+                continue
+            if fields[0] == 'FONTBOUNDINGBOX':
+                height = int(fields[2])
+                ascent = height + int(fields[4])
+            elif fields[0] == 'STARTCHAR':
+                encoding, advance, box, bitmap = -1, 0, (0, 0, 0, 0), []
+                for line in lines:
+                    fields = line.split()
+                    if not fields:
+                        continue
+                    if fields[0] == 'ENCODING':
+                        encoding = int(fields[1])
+                    elif fields[0] == 'DWIDTH':
+                        advance = int(fields[1])
+                    elif fields[0] == 'BBX':
+                        box = tuple(int(value) for value in fields[1:5])
+                    elif fields[0] == 'BITMAP':
+                        for line in lines:
+                            if line.strip() == 'ENDCHAR':
+                                break
+                            bitmap.append(int(line.strip() or '0', 16))
+                        break
+                if encoding < 0 or not height:
+                    continue
+                width, rows_count, x_offset, y_offset = box
+                x_offset = max(x_offset, 0)
+                # Üres glyph (pl. szóköz): a léptetésből, a betűköz nélkül
+                cell_width = max(width + x_offset, advance - 1 if not any(bitmap) else 0, 1)
+                bits = ((width + 7) // 8) * 8
+                top = ascent - (rows_count + y_offset)
+                cells = [[0] * cell_width for _ in range(height)]
+                for row, value in enumerate(bitmap[:rows_count]):
+                    if not 0 <= top + row < height:
+                        continue
+                    for column in range(width):
+                        if value >> (bits - 1 - column) & 1:
+                            cells[top + row][x_offset + column] = 1
+                glyphs[chr(encoding)] = tuple(tuple(row) for row in cells)
+        if not height:
+            raise ValueError("Hibás BDF: hiányzik a FONTBOUNDINGBOX")
+        return height, glyphs
+
+    @staticmethod
+    def _parse_psf(data: bytes) -> Tuple[int, Dict[str, Rows]]:
+        """PSF1/PSF2 konzol font; a fix szélességű cellák üres oszlopai levágódnak."""
+        if data.startswith(PSF1_MAGIC):
+            mode, height = data[2], data[3]
+            count, width, charsize, offset = (512 if mode & 0x01 else 256), 8, height, 4
+            has_table = bool(mode & 0x06)
+        else:
+            _, _, offset, flags, count, charsize, height, width = struct.unpack_from('<4sIIIIIII', data, 0)
+            has_table = bool(flags & 0x01)
+        row_bytes = (width + 7) // 8
+        table_start = offset + count * charsize
+
+        # Glyph index -> karakterek (Unicode tábla nélkül az index maga a codepoint)
+        mapping: Dict[int, List[str]] = {index: [chr(index)] for index in range(count)} if not has_table else {}
+        if has_table:
+            position = table_start
+            for index in range(count):
+                chars: List[str] = []
+                if data.startswith(PSF1_MAGIC):
+                    in_sequence = False
+                    while position + 1 < len(data):
+                        value = struct.unpack_from('<H', data, position)[0]
+                        position += 2
+                        if value == 0xFFFF:
+                            break
+                        if value == 0xFFFE:
+                            in_sequence = True
+                        elif not in_sequence:
+                            chars.append(chr(value))
+                else:
+                    end = data.index(b'\xff', position)
+                    entry = data[position:end].split(b'\xfe')[0]
+                    position = end + 1
+                    chars.extend(entry.decode('utf-8', 'replace'))
+                mapping[index] = chars
+
+        glyphs: Dict[str, Rows] = {}
+        for index, chars in mapping.items():
+            start = offset + index * charsize
+            rows = []
+            for row in range(height):
+                value = int.from_bytes(data[start + row * row_bytes:start + (row + 1) * row_bytes], 'big')
+                rows.append([value >> (row_bytes * 8 - 1 - column) & 1 for column in range(width)])
+            lit = [column for column in range(width) if any(row[column] for row in rows)]
+            if lit:
+                rows = [row[lit[0]:lit[-1] + 1] for row in rows]
+            else:
+                rows = [row[:max(1, width // 2)] for row in rows]
+            for char in chars:
+                glyphs.setdefault(char, tuple(tuple(row) for row in rows))
+        return height, glyphs
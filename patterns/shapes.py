@@ -1,11 +1,63 @@
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+from .compiled import CompiledPattern, as_compiled, compile_patterns, freeze_patterns
 
 
 class ShapePatterns:
     """Alakzat mintákat kezelő osztály."""
     
-    def get_patterns(self, compact: bool = None) -> Dict[str, List[List[int]]]:
-        """Egységes 5x5-ös alakzat minták."""
+    _patterns: Optional[Mapping[str, Tuple[Tuple[int, ...], ...]]] = None
+    _compiled: Optional[Mapping[str, CompiledPattern]] = None
+    
+    def __init__(self):
+        # Futás közben felvett alakzatok (pl. importált kép): csak ehhez a példányhoz tartoznak
+        self._registered: Dict[str, CompiledPattern] = {}
+        self._own_patterns: Optional[Mapping[str, Tuple[Tuple[int, ...], ...]]] = None
+        self._own_compiled: Optional[Mapping[str, CompiledPattern]] = None
+    
+    def get_patterns(self, compact: bool = None) -> Mapping[str, Tuple[Tuple[int, ...], ...]]:
+        """Egységes 5x5-ös alakzat minták (folyamatonként egyszer felépítve, csak olvasható)."""
+        if self._own_patterns is not None:
+            return self._own_patterns
+        cls = type(self)
+        if cls._patterns is None:
+            cls._patterns = freeze_patterns(self._build_patterns())
+        return cls._patterns
+    
+    def get_compiled(self) -> Mapping[str, CompiledPattern]:
+        """Előre lefordított minták (bitmaszkok és világító cella offsetek)."""
+        if self._own_compiled is not None:
+            return self._own_compiled
+        cls = type(self)
+        if cls._compiled is None:
+            cls._compiled = compile_patterns(self.get_patterns())
+        return cls._compiled
+    
+    def register(self, name: str, pattern) -> CompiledPattern:
+        """
+        Új alakzat felvétele futás közben (pl. egy importált kép). Az alakzat
+        csak ehhez a példányhoz (így egy ShapeRenderer-hez, egy job-hoz) tartozik,
+        a beépített, folyamat szintű táblák változatlanok maradnak; a beépített
+        alakzat nevek nem írhatók felül.
+        """
+        if not name or '"' in name:
+            raise ValueError(f"Érvénytelen alakzat név: {name!r}")
+        self._own_patterns = self._own_compiled = None
+        if name in self.get_compiled():
+            raise ValueError(f"Foglalt alakzat név: {name} (adj meg másik nevet)")
+        compiled = as_compiled(pattern)
+        self._registered[name] = compiled
+        patterns = dict(self.get_patterns())
+        compiled_patterns = dict(self.get_compiled())
+        for registered_name, registered in self._registered.items():
+            patterns[registered_name] = registered.rows
+            compiled_patterns[registered_name] = registered
+        self._own_patterns = MappingProxyType(patterns)
+        self._own_compiled = MappingProxyType(compiled_patterns)
+        return compiled
+    
+    def _build_patterns(self) -> Dict[str, List[List[int]]]:
+        """Egységes 5x5-ös alakzat minták (cellaértékek: 0 = üres, 1-4 = intenzitás szint)."""
         return {
             'heart': [
                 [1, 1, 0, 1, 1],
@@ -34,5 +86,13 @@ class ShapePatterns:
                 [1, 1, 1, 1, 1],
                 [0, 1, 1, 1, 0],
                 [0, 0, 1, 0, 0]
+            ],
+            # Árnyalt minták: a cellaértékek intenzitás szintek (1-4)
+            'glow': [
+                [0, 1, 2, 1, 0],
+                [1, 2, 3, 2, 1],
+                [2, 3, 4, 3, 2],
+                [1, 2, 3, 2, 1],
+                [0, 1, 2, 1, 0]
             ]
         } 
\ No newline at end of file
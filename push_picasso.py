@@ -5,26 +5,40 @@ Objektumorientált, moduláris felépítés
 Egységes méretkonvenció: Szövegek 5x4, Alakzatok 5x5
 """
 
+import argparse
+import cProfile
+import pstats
 import signal
 import sys
-from core import GitHandler, TextRenderer, ShapeRenderer, LayoutManager
+from typing import Optional
+from core import GitHandler, TextRenderer, ShapeRenderer, LayoutManager, JobRunner, BatchRunner, PreviewRenderer, Instrumentation
+from core.image_importer import ImageImporter
+from core.async_pipeline import AsyncRenderPipeline, TerminalProgress
+from core.batch_committer import STORAGE_MODES
+from core.flow_layout import LAYOUT_MODES
+from core.grid import Grid
+from core.object_writer import BACKENDS
+from patterns import FontLoader
+from patterns.alphabet import DEFAULT_FONT
 
 
 class PushPicasso:
     """Fő alkalmazás osztály."""
     
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", storage_mode: str = 'files', year: Optional[int] = None,
+                 instrumentation: Optional[Instrumentation] = None, backend: str = 'fast-import',
+                 grid: Optional[Grid] = None, font: Optional[str] = None, fit: bool = False):
         # Core komponensek inicializálása
-        self.git_handler = GitHandler(repo_path)
-        self.text_renderer = TextRenderer(self.git_handler)
+        self.git_handler = GitHandler(repo_path, storage_mode, year, instrumentation, backend, grid)
+        self.text_renderer = TextRenderer(self.git_handler, font)
         self.shape_renderer = ShapeRenderer(self.git_handler)
-        self.layout_manager = LayoutManager(self.git_handler, self.text_renderer, self.shape_renderer)
+        self.layout_manager = LayoutManager(self.git_handler, self.text_renderer, self.shape_renderer, fit)
         
         # Grid információk
         self.grid_width = self.git_handler.grid_width
         self.grid_height = self.git_handler.grid_height
         self.start_date = self.git_handler.start_date
-        self.end_date = self.git_handler.grid_pos_to_date(self.grid_width - 1, self.grid_height - 1)
+        self.end_date = self.git_handler.end_date
     
     def safe_input(self, prompt: str, timeout: int = 30) -> str:
         """Biztonságos input bekérés timeout-tal."""
@@ -42,7 +56,8 @@ class PushPicasso:
         print("1. 🎨 Art létrehozása (szöveg + alakzatok)")
         print("2. 👀 Elérhető alakzatok listája")
         print("3. 🗑️  Art adatok törlése (commit history reset)")
-        print("4. 🚪 Kilépés")
+        print("4. 🔁 Art frissítése (csak a hiányzó commit-ok)")
+        print("5. 🚪 Kilépés")
     
     def show_available_shapes(self):
         """Elérhető alakzatok megjelenítése."""
@@ -62,6 +77,54 @@ class PushPicasso:
         print(f"   • Szövegek: 5 magas × 4 széles")
         print(f"   • Alakzatok: 5 magas × 5 széles")
     
+    def render(self, prompt: str, incremental: bool = False, layout: str = 'inline',
+               progress: bool = False) -> int:
+        """
+        Art létrehozása a megadott promptból, menü nélkül.
+        
+        progress esetén az aszinkron pipeline fut: haladásjelző, ETA, és a Ctrl-C
+        commit határon áll meg (folytatás --incremental módban).
+        """
+        self.git_handler.init_git_repo()
+        if progress:
+            pipeline = AsyncRenderPipeline(self.git_handler, self.layout_manager, TerminalProgress())
+            return pipeline.run(prompt, layout=layout, incremental=incremental)
+        return self.layout_manager.create_combined_art(incremental=incremental, text=prompt, layout=layout)
+    
+    def preview(self, prompt: str, color: Optional[bool] = None, show_counts: bool = False,
+                layout: str = 'inline'):
+        """
+        Dry-run: a teljes layout pipeline memóriabeli canvas-ra fut, és a
+        contribution graph a terminálon jelenik meg. Git folyamat nem indul.
+        """
+        elements = self.layout_manager.parse_text_with_shapes(prompt)
+        canvas = self.layout_manager.build_canvas(elements, layout)
+        PreviewRenderer(self.git_handler, color).show(canvas, show_counts=show_counts)
+        return canvas
+    
+    def import_image(self, path: str, name: Optional[str] = None, weeks: Optional[int] = None,
+                     dither: bool = False, invert: bool = False) -> str:
+        """
+        PNG/PGM kép alakzatként: 7 sor magasra kicsinyítve (legfeljebb a grid
+        szélességéig), 5 intenzitás szintre kvantálva.
+        
+        Returns:
+            str: Az alakzat neve, amivel a promptban hivatkozni lehet rá ("név")
+        """
+        return ImageImporter(dither=dither, invert=invert).register(path, self.shape_renderer.shape_patterns,
+                                                                     name, weeks, self.grid_width)
+    
+    def show_stats(self):
+        """Repository statisztikák megjelenítése."""
+        total_commits, commits_today = self.git_handler.get_repository_stats()
+        window = self.git_handler.get_daily_commit_counts()
+        
+        print("📊 Repository statisztikák")
+        print(f"   • Összes commit: {total_commits}")
+        print(f"   • Mai commit-ok: {commits_today}")
+        print(f"   • Aktív napok a grid-en ({self.start_date} - {self.end_date}): {len(window)}")
+        print(f"   • Commit-ok a grid-en: {sum(window.values())}")
+    
     def run(self):
         """Fő alkalmazás futtatása."""
         # Git repo inicializálása
@@ -74,15 +137,19 @@ class PushPicasso:
         while True:
             try:
                 self.show_main_menu()
-                choice = self.safe_input("\nVálassz egy opciót (1-4): ").strip()
+                choice = self.safe_input("\nVálassz egy opciót (1-5): ").strip()
                 
                 if choice == '1':
                     self.layout_manager.create_combined_art()
                 elif choice == '2':
                     self.show_available_shapes()
                 elif choice == '3':
-                    self.git_handler.clean_repository()
+                    answer = self.safe_input("🔄 Írjuk újra a history-t, hogy a régi art a graph-ról is "
+                                             "eltűnjön? (i/N) ").strip().lower()
+                    self.git_handler.clean_repository(rewrite=answer in ('i', 'igen', 'y', 'yes'))
                 elif choice == '4':
+                    self.layout_manager.create_combined_art(incremental=True)
+                elif choice == '5':
                     print("👋 Viszlát!")
                     break
                 else:
@@ -99,15 +166,192 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Parancssori argumentumok leírása (alparancsok nélkül az interaktív menü indul)."""
+    parser = argparse.ArgumentParser(
+        prog='push_picasso.py',
+        description='Push Picasso - GitHub Contribution Graph művészet generátor'
+    )
+    parser.add_argument('--timings', action='store_true',
+                        help='Fázisonkénti idő és darabszám összesítés a futás végén')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='A teljes futás cProfile alatt, a statisztika mentése FILE-ba')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    def add_repo_args(subparser, storage: bool = False):
+        subparser.add_argument('--repo', default='.', help='A cél Git repository útvonala (alapértelmezés: .)')
+        if storage:
+            subparser.add_argument('--storage', choices=STORAGE_MODES, default='files',
+                                   help='Art tárolási mód (alapértelmezés: files)')
+            subparser.add_argument('--backend', choices=BACKENDS, default='fast-import',
+                                   help='Commit író: git fast-import vagy tiszta Python objektum író '
+                                        '(alapértelmezés: fast-import)')
+    
+    def add_window_args(subparser):
+        subparser.add_argument('--year', type=int, help='A cél év contribution graph-ja (alapértelmezés: fix ablak)')
+        subparser.add_argument('--years', metavar='ELSŐ-UTOLSÓ',
+                               help='Több év egymás mellett, pl. 2023-2025 (hosszú bannerekhez)')
+        subparser.add_argument('--start', metavar='YYYY-MM-DD', help='Tetszőleges ablak kezdete')
+        subparser.add_argument('--end', metavar='YYYY-MM-DD', help='Tetszőleges ablak vége (alapértelmezés: +53 hét)')
+    
+    def add_layout_args(subparser):
+        subparser.add_argument('--layout', choices=LAYOUT_MODES, default='inline',
+                               help='Elrendezés: egy sor középen, éves ablakokon átfolyó banner, '
+                                    'vagy többsoros tördelés (alapértelmezés: inline)')
+        subparser.add_argument('--font', metavar='NÉV|FÁJL',
+                               help=f"Bitmap font: beépített ({', '.join(FontLoader.available())}) vagy "
+                                    f"BDF/PSF/JSON fájl (alapértelmezés: {DEFAULT_FONT})")
+        subparser.add_argument('--fit', action='store_true',
+                               help='Ha a szöveg nem fér el: kerning, keskenyebb szóköz, végül kisebb font')
+    
+    def add_image_args(subparser):
+        subparser.add_argument('--image', metavar='FÁJL',
+                               help='PNG/PGM kép alakzatként (a promptban "fájlnév"-ként; prompt nélkül csak a kép)')
+        subparser.add_argument('--image-name', metavar='NÉV', help='A kép alakzat neve (alapértelmezés: a fájlnév)')
+        subparser.add_argument('--image-weeks', type=int, metavar='N',
+                               help='A kép szélessége hetekben (alapértelmezés: képarány szerint, max. a grid)')
+        subparser.add_argument('--dither', action='store_true', help='Floyd–Steinberg dithering a kép szintjeihez')
+        subparser.add_argument('--invert', action='store_true', help='Világos rajz sötét háttéren')
+    
+    def add_preview_args(subparser):
+        subparser.add_argument('--color', choices=['auto', 'always', 'never'], default='auto',
+                               help='ANSI színek az előnézetben (alapértelmezés: auto)')
+        subparser.add_argument('--counts', action='store_true',
+                               help='Napi commit számok megjelenítése a cellákban')
+    
+    render_parser = subparsers.add_parser('render', help='Art létrehozása promptból vagy job fájlból')
+    render_parser.add_argument('prompt', nargs='?', help='A kiírandó szöveg, pl. \'Hello "heart" World\'')
+    render_parser.add_argument('--job-file', help='JSON/YAML job fájl több art-tal és repository-val')
+    render_parser.add_argument('--workers', type=int, default=1,
+                               help='Párhuzamos worker folyamatok száma job fájlhoz (0 = CPU magok száma)')
+    render_parser.add_argument('--incremental', action='store_true',
+                               help='Csak a meglévő history-ból hiányzó commit-ok létrehozása')
+    render_parser.add_argument('--progress', action='store_true',
+                               help='Aszinkron pipeline haladásjelzővel; Ctrl-C-re commit határon áll meg')
+    render_parser.add_argument('--dry-run', action='store_true',
+                               help='Csak előnézet: a git repository-hoz nem nyúl')
+    add_repo_args(render_parser, storage=True)
+    add_window_args(render_parser)
+    add_layout_args(render_parser)
+    add_image_args(render_parser)
+    add_preview_args(render_parser)
+    
+    preview_parser = subparsers.add_parser('preview', help='Előnézet a contribution graph-ról git nélkül')
+    preview_parser.add_argument('prompt', nargs='?', help='A kiírandó szöveg')
+    add_repo_args(preview_parser)
+    add_window_args(preview_parser)
+    add_layout_args(preview_parser)
+    add_image_args(preview_parser)
+    add_preview_args(preview_parser)
+    
+    clean_parser = subparsers.add_parser('clean', help='Art adatok törlése')
+    add_repo_args(clean_parser)
+    clean_parser.add_argument('--rewrite', action='store_true',
+                              help='A branch history újraírása az art commit-ok nélkül (törlő commit helyett); '
+                                   'utána force push kell')
+    
+    stats_parser = subparsers.add_parser('stats', help='Repository statisztikák')
+    add_repo_args(stats_parser)
+    add_window_args(stats_parser)
+    
+    return parser
+
+
+def color_choice(value: str) -> Optional[bool]:
+    """A --color kapcsoló értéke PreviewRenderer paraméterként."""
+    return {'always': True, 'never': False}.get(value)
+
+
+def window_grid(args) -> Optional[Grid]:
+    """A --year/--years/--start/--end kapcsolókból épített grid (None = alapértelmezett ablak)."""
+    return Grid.from_options(args.year, args.years, args.start, args.end)
+
+
+def image_prompt(app: PushPicasso, args) -> str:
+    """A --image kép regisztrálása; prompt nélkül a prompt maga a kép alakzat."""
+    if not args.image:
+        return args.prompt
+    name = app.import_image(args.image, args.image_name, args.image_weeks, args.dither, args.invert)
+    return args.prompt or f'"{name}"'
+
+
+def run_command(args, instrumentation: Optional[Instrumentation] = None) -> int:
+    """Egy alparancs végrehajtása, visszatérési érték: kilépési kód."""
+    if args.command == 'render':
+        if args.job_file:
+            jobs = JobRunner.load_job_file(args.job_file)
+            if args.workers != 1:
+                summary = BatchRunner(args.workers or None).run(jobs)
+                return 1 if summary['failed'] else 0
+            results = JobRunner(instrumentation).run_all(jobs)
+            failed = [result for result in results if result['error']]
+            print(f"\n📦 {len(results)} job, {sum(r['commits'] for r in results)} commit, {len(failed)} hiba")
+            return 1 if failed else 0
+        if not args.prompt and not args.image:
+            print("❌ Adj meg egy promptot, egy --image vagy egy --job-file kapcsolót!")
+            return 2
+        if args.dry_run:
+            app = PushPicasso(args.repo, args.storage, instrumentation=instrumentation, grid=window_grid(args),
+                              font=args.font, fit=args.fit)
+            app.preview(image_prompt(app, args), color=color_choice(args.color), show_counts=args.counts,
+                        layout=args.layout)
+            return 0
+        app = PushPicasso(args.repo, args.storage, instrumentation=instrumentation, backend=args.backend,
+                          grid=window_grid(args), font=args.font, fit=args.fit)
+        app.render(image_prompt(app, args), incremental=args.incremental, layout=args.layout,
+                   progress=args.progress)
+    elif args.command == 'preview':
+        if not args.prompt and not args.image:
+            print("❌ Adj meg egy promptot vagy egy --image kapcsolót!")
+            return 2
+        app = PushPicasso(args.repo, instrumentation=instrumentation, grid=window_grid(args), font=args.font,
+                          fit=args.fit)
+        app.preview(image_prompt(app, args), color=color_choice(args.color), show_counts=args.counts,
+                    layout=args.layout)
+    elif args.command == 'clean':
+        app = PushPicasso(args.repo, instrumentation=instrumentation)
+        return 0 if app.git_handler.clean_repository(rewrite=args.rewrite) else 1
+    elif args.command == 'stats':
+        PushPicasso(args.repo, instrumentation=instrumentation, grid=window_grid(args)).show_stats()
+    return 0
+
+
+def run_instrumented(func, instrumentation: Optional[Instrumentation], profile_path: Optional[str]):
+    """Futtat egy függvényt opcionális cProfile alatt, és a végén kiírja a mérési összesítést."""
+    profiler = cProfile.Profile() if profile_path else None
+    try:
+        if profiler:
+            profiler.enable()
+        return func()
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            print(f"\n🔬 cProfile statisztika mentve: {profile_path} (top 15 kumulatív idő szerint)")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+        if instrumentation:
+            instrumentation.print_summary()
+
+
+def main(argv=None):
     """Fő függvény."""
     # Signal handler beállítása
     signal.signal(signal.SIGINT, signal_handler)
     
+    args = build_parser().parse_args(argv)
+    instrumentation = Instrumentation() if args.timings else None
+    
+    if args.command:
+        try:
+            sys.exit(run_instrumented(lambda: run_command(args, instrumentation), instrumentation, args.profile))
+        except Exception as e:
+            print(f"❌ Váratlan hiba: {e}")
+            sys.exit(1)
+    
     try:
         # Alkalmazás indítása
-        app = PushPicasso()
-        app.run()
+        app = PushPicasso(instrumentation=instrumentation)
+        run_instrumented(app.run, instrumentation, args.profile)
         
         print("\n✅ Program befejezve!")
         print("💡 Ne felejtsd el a változtatásokat feltölteni GitHub-ra:")
@@ -0,0 +1,113 @@
+"""
+A `clean --rewrite` (az egyetlen history-t újraíró, branch-et elmozdító
+művelet) ellenőrzése valódi, eldobható git repository-ban: az art commit-ok
+eltűnnek, a többi commit (a vegyes commit-ok nem art része és a merge-ök is)
+megmarad, az eredeti csúcs a backup ref-ben van, és a repository ép.
+
+Futtatás:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from core import GitHandler  # noqa: E402
+from core.history_rewriter import BACKUP_REF_PREFIX  # noqa: E402
+from patterns import AlphabetPatterns  # noqa: E402
+
+
+def git(repo_path: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(['git'] + list(args), cwd=repo_path, capture_output=True, text=True)
+
+
+@unittest.skipUnless(shutil.which('git'), 'a teszthez git bináris kell')
+class HistoryRewriteTest(unittest.TestCase):
+    """Art, vegyes commit és mellékág merge, majd `clean --rewrite` a parancssorból."""
+
+    def setUp(self):
+        self._temp = tempfile.TemporaryDirectory(prefix='push-picasso-test-')
+        self.repo_path = self._temp.name
+        for args in (['init', '-q'], ['config', 'user.name', 'test'], ['config', 'user.email', 'test@localhost']):
+            self.git(*args)
+        self.commit_file('README.md', 'readme\n', 'init')
+        self.branch = self.git('rev-parse', '--abbrev-ref', 'HEAD')
+
+    def tearDown(self):
+        self._temp.cleanup()
+
+    def git(self, *args: str) -> str:
+        result = git(self.repo_path, *args)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        return result.stdout.strip()
+
+    def commit_file(self, path: str, content: str, message: str, *extra: str) -> str:
+        """Fájl(ok) írása és commit-olása a git-tel; visszaadja a commit sha-ját."""
+        for name, text in ((path, content),) + tuple(zip(extra[::2], extra[1::2])):
+            full_path = os.path.join(self.repo_path, name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.git('add', name)
+        self.git('commit', '-q', '-m', message)
+        return self.git('rev-parse', 'HEAD')
+
+    def render(self, text: str, week: int) -> int:
+        """Egy szöveg commit-olása a fast-import backend-del."""
+        with redirect_stdout(io.StringIO()), GitHandler(self.repo_path) as git_handler:
+            canvas = git_handler.new_canvas()
+            glyphs = AlphabetPatterns().get_compiled()
+            for offset, char in enumerate(text):
+                canvas.blit(glyphs[char], week + offset * 5, 1)
+            return git_handler.commit_canvas(canvas)
+
+    def test_rewrite(self):
+        art_commits = self.render('HI', 2)
+        # Vegyes commit: egy art fájl és egy valódi fájl együtt
+        mixed = self.commit_file('src/main.py', 'print("hi")\n', 'mixed', 'art_data/extra.txt', 'art\n')
+        self.git('checkout', '-q', '-b', 'side')
+        self.commit_file('side.txt', 'side\n', 'side work')
+        self.git('checkout', '-q', self.branch)
+        art_commits += self.render('OK', 20)
+        self.git('merge', '-q', '--no-ff', '-m', 'merge side', 'side')
+        old_head = self.git('rev-parse', 'HEAD')
+        self.assertGreater(art_commits, 0)
+
+        result = subprocess.run([sys.executable, os.path.join(ROOT_DIR, 'push_picasso.py'), 'clean',
+                                 '--repo', self.repo_path, '--rewrite'], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+        # A tiszta art commit-ok eltűntek, a többi (a merge is) megmaradt
+        subjects = self.git('log', '--format=%s', self.branch).splitlines()
+        self.assertEqual(sorted(subjects), sorted(['merge side', 'side work', 'mixed', 'init']))
+        self.assertEqual(len(self.git('rev-list', '--merges', self.branch).splitlines()), 1)
+        self.assertEqual(self.git('log', '--format=%H', self.branch, '--', 'art_data'), '')
+
+        # A vegyes commit csak a nem art útvonalát tartja meg, a szerzője és a dátuma változatlan
+        rewritten = self.git('log', '--format=%H', '--grep=^mixed$', self.branch)
+        self.assertEqual(self.git('show', '--name-only', '--format=', rewritten), 'src/main.py')
+        self.assertEqual(self.git('show', '-s', '--format=%an %ad', rewritten),
+                         self.git('show', '-s', '--format=%an %ad', mixed))
+        self.assertEqual(sorted(self.git('ls-tree', '-r', '--name-only', 'HEAD').splitlines()),
+                         ['README.md', 'side.txt', 'src/main.py'])
+
+        # Az eredeti csúcs a backup ref-ben, a repository ép, a working tree tiszta
+        self.assertEqual(self.git('rev-parse', f"{BACKUP_REF_PREFIX}{self.branch}"), old_head)
+        self.assertEqual(self.git('rev-list', '--count', f"{BACKUP_REF_PREFIX}{self.branch}"),
+                         str(art_commits + 4))
+        self.git('fsck', '--strict', '--no-dangling')
+        self.assertEqual(self.git('status', '--porcelain'), '')
+        self.assertFalse(os.path.exists(os.path.join(self.repo_path, 'art_data')))
+
+
+if __name__ == '__main__':
+    unittest.main()
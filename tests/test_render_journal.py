@@ -0,0 +1,109 @@
+"""
+A render napló (folytatható render) ellenőrzése valódi, eldobható git
+repository-ban: egy az első köteg után megszakadt futás újraindítva csak a
+hátralévő commit-okat hozza létre, egy elavult napló (a branch már nem
+tartalmazza a tartós pontot) pedig eldobódik.
+
+Futtatás:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import datetime
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from core import GitHandler  # noqa: E402
+from core.render_journal import JOURNAL_FILE, RenderJournal  # noqa: E402
+
+BATCH_COMMITS = 10
+# 12 nap, naponta 3 commit: 4 napos (12 commit-os) kötegek
+DATE_COUNTS = {datetime.date(2024, 7, 1) + datetime.timedelta(days=day): 3 for day in range(12)}
+
+
+def git(repo_path: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(['git'] + list(args), cwd=repo_path, capture_output=True, text=True)
+
+
+@unittest.skipUnless(shutil.which('git'), 'a teszthez git bináris kell')
+class RenderJournalTest(unittest.TestCase):
+    """Megszakított render (csak az első köteg kész), majd újrafuttatás ugyanazzal a tervvel."""
+
+    def setUp(self):
+        self._temp = tempfile.TemporaryDirectory(prefix='push-picasso-test-')
+        self.repo_path = self._temp.name
+        for args in (['init', '-q'], ['config', 'user.name', 'test'], ['config', 'user.email', 'test@localhost'],
+                     ['commit', '-q', '--allow-empty', '-m', 'init']):
+            self.git(*args)
+        self.base = self.git('rev-parse', 'HEAD')
+
+    def tearDown(self):
+        self._temp.cleanup()
+
+    def git(self, *args: str) -> str:
+        result = git(self.repo_path, *args)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        return result.stdout.strip()
+
+    def interrupted_run(self) -> int:
+        """Az első köteg tartósan kész, utána a futás "meghal" (a napló nem zárul le)."""
+        with redirect_stdout(io.StringIO()), GitHandler(self.repo_path) as git_handler:
+            remaining = git_handler.start_journal(DATE_COUNTS)
+            first = next(RenderJournal.batches(remaining, BATCH_COMMITS))
+            created = git_handler.commit_journal_batch(first)
+            journal_path = git_handler.journal.path
+        self.assertTrue(os.path.exists(journal_path))
+        self.assertLess(created, sum(DATE_COUNTS.values()))
+        return created
+
+    def rerun(self):
+        """Újrafuttatás ugyanazzal a tervvel; visszaadja a létrehozott commit-okat és a kimenetet."""
+        output = io.StringIO()
+        with redirect_stdout(output), GitHandler(self.repo_path) as git_handler:
+            created = git_handler.commit_journaled(DATE_COUNTS, BATCH_COMMITS)
+            self.assertEqual(git_handler.get_daily_commit_counts(), DATE_COUNTS)
+            self.assertFalse(os.path.exists(git_handler.journal.path))
+        self.git('fsck', '--strict', '--no-dangling')
+        self.assertEqual(self.git('status', '--porcelain'), '')
+        return created, output.getvalue()
+
+    def test_resume_after_batch(self):
+        done = self.interrupted_run()
+        created, output = self.rerun()
+        self.assertEqual(created, sum(DATE_COUNTS.values()) - done)
+        self.assertIn('📒 Render napló', output)
+        self.assertEqual(self.git('rev-list', '--count', 'HEAD'), str(1 + sum(DATE_COUNTS.values())))
+
+    def test_resume_before_done_record(self):
+        # A branch már frissült, de a "done" bejegyzés előtt szakadt meg: a HEAD dönt
+        done = self.interrupted_run()
+        journal_path = os.path.join(self.git('rev-parse', '--absolute-git-dir'), JOURNAL_FILE)
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        self.assertIn('"done"', lines[-1])
+        with open(journal_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines[:-1])
+        created, _ = self.rerun()
+        self.assertEqual(created, sum(DATE_COUNTS.values()) - done)
+
+    def test_stale_journal_discarded(self):
+        # A branch azóta máshova került: a tartós pont nincs a HEAD-ben, a napló elavult
+        self.interrupted_run()
+        self.git('reset', '-q', '--hard', self.base)
+        created, output = self.rerun()
+        self.assertEqual(created, sum(DATE_COUNTS.values()))
+        self.assertNotIn('📒 Render napló', output)
+        self.assertEqual(self.git('rev-list', '--count', 'HEAD'), str(1 + sum(DATE_COUNTS.values())))
+
+
+if __name__ == '__main__':
+    unittest.main()